@@ -6,12 +6,17 @@ SELETOR DE SEGMENTOS HEURÍSTICO (FALLBACK)
 
 O QUE FAZ:
   Seleção por regras fixas (sem LLM):
-  - Agrupa palavras em janelas de 3 palavras
+  - engine="words" (padrão): janelas de 3 palavras (método antigo)
+  - engine="timeline": linha do tempo de features por segundo
+    (CandidateScorer) e TODAS as janelas de 10-90s pontuadas de uma vez
+    (soma acima da média da live: a duração sai do conteúdo); durações
+    15-45s têm prioridade, as demais só completam a lista
   - Pontua por densidade de palavras, keywords fortes, pontuação (!?)
   - Duração ideal 15-45s
 
 USO:
-  Chamado por SegmentSelectorLLM quando LLM falha ou OPENAI_API_KEY ausente.
+  Chamado por SegmentSelectorLLM quando LLM falha ou OPENAI_API_KEY ausente
+  (engine="timeline", faixa de duração do seletor).
 
 POR QUE EXISTE:
   Garantir que o pipeline funcione mesmo sem API da OpenAI.
@@ -27,6 +32,14 @@ O QUE AINDA PODE SER FEITO:
 
 import re
 
+from Components.KeywordIndex import KeywordIndex
+from Components.TranscriptIndex import TranscriptIndex
+from Components.CandidateScorer import FeatureTimeline, CandidateScorer
+
+# Faixa de duração ideal (mesma do método antigo)
+IDEAL_MIN_DURATION = 15
+IDEAL_MAX_DURATION = 45
+
 KEYWORDS_STRONG = [
     "mano", "cara", "olha", "tipo", "basicamente",
     "não faz sentido", "presta atenção", "o problema é",
@@ -35,11 +48,24 @@ KEYWORDS_STRONG = [
 ]
 
 
-def select_best_segments(transcriptions, mode="RELAXED"):
+def select_best_segments(transcriptions, mode="RELAXED", engine="words", feature_store=None, duration_step=5,
+                         visual_index=None, min_duration=None, max_duration=None, max_clips=None):
     """
     Retorna lista de segmentos com start, end, score, reason.
     mode RELAXED: critérios mais permissivos.
+
+    engine "timeline": janelas de todas as durações (passo duration_step)
+    pontuadas de forma vetorizada; feature_store (AudioFeatureStore)
+    adiciona energia/flux e visual_index (VisualFeatureIndex) movimento.
+    min_duration/max_duration/max_clips substituem os limites do modo.
+    engine "words": método antigo.
     """
+    if engine == "timeline":
+        return _select_by_timeline(
+            transcriptions, mode, feature_store, duration_step,
+            visual_index, min_duration, max_duration, max_clips
+        )
+
     segments = []
 
     MIN_DURATION = 10 if mode == "RELAXED" else 15
@@ -47,6 +73,9 @@ def select_best_segments(transcriptions, mode="RELAXED"):
     MIN_SCORE = 18 if mode == "RELAXED" else 28
     WINDOW_SIZE = 3 if mode == "RELAXED" else 2
 
+    # Keywords consultadas no índice (uma busca por janela)
+    keyword_index = KeywordIndex.ensure(transcriptions)
+
     for i in range(len(transcriptions) - WINDOW_SIZE):
         texts = []
         start = transcriptions[i][1]
@@ -70,10 +99,8 @@ def select_best_segments(transcriptions, mode="RELAXED"):
         if word_density > 2.0:
             score += 10
 
-        for kw in KEYWORDS_STRONG:
-            if kw in full_text.lower():
-                score += 8
-                break
+        if keyword_index.count_any(KEYWORDS_STRONG, start, transcriptions[i + WINDOW_SIZE][1]) > 0:
+            score += 8
 
         score += full_text.count("!") * 2
         score += full_text.count("?") * 2
@@ -111,3 +138,50 @@ def select_best_segments(transcriptions, mode="RELAXED"):
     max_clips = 8 if mode == "RELAXED" else 5
 
     return good[:max_clips]
+
+
+def _select_by_timeline(transcriptions, mode, feature_store=None, duration_step=5,
+                        visual_index=None, min_duration=None, max_duration=None, max_clips=None):
+    """Seleção pelo CandidateScorer (todas as durações de uma vez)."""
+    MIN_DURATION = min_duration or (10 if mode == "RELAXED" else 15)
+    MAX_DURATION = max_duration or (90 if mode == "RELAXED" else 60)
+    max_clips = max_clips or (8 if mode == "RELAXED" else 5)
+
+    index = TranscriptIndex.ensure(transcriptions)
+    if len(index) == 0:
+        return []
+
+    duration = feature_store.duration if feature_store is not None else float(index.ends.max())
+    timeline = FeatureTimeline.build(
+        duration,
+        transcript=index,
+        keywords=KEYWORDS_STRONG,
+        feature_store=feature_store,
+        visual_index=visual_index
+    )
+    scorer = CandidateScorer(timeline)
+
+    # Primeiro a faixa ideal (15-45s), onde a duração sai do conteúdo; as
+    # outras durações só completam a lista quando faltam candidatos
+    durations = list(range(int(MIN_DURATION), int(MAX_DURATION) + 1, duration_step))
+    ideal = [d for d in durations if IDEAL_MIN_DURATION <= d <= IDEAL_MAX_DURATION] or durations
+    others = [d for d in durations if d not in ideal]
+
+    candidates = scorer.best_candidates(ideal, top_n=max_clips)
+    if len(candidates) < max_clips and others:
+        candidates += scorer.best_candidates(
+            others,
+            top_n=max_clips - len(candidates),
+            taken=[(c["start"], c["end"]) for c in candidates]
+        )
+
+    return [
+        {
+            "start": c["start"],
+            "end": c["end"],
+            "score": round(c["mean"] * 100, 1),
+            "reason": index.text_between(c["start"], c["end"])[:200] or c["reason"],
+            "features": c["reason"]
+        }
+        for c in candidates
+    ]
@@ -0,0 +1,260 @@
+# Components/ASRBackends.py
+"""
+=============================================================================
+BACKENDS DE TRANSCRIÇÃO (ASR)
+=============================================================================
+
+✨ FEATURES:
+- Interface única atrás do transcribe_audio
+- whisper: openai-whisper, PyTorch fp32 (padrão, referência)
+- faster_whisper: CTranslate2 com int8 em CPU (opcional)
+- Todos devolvem o MESMO formato de segmento/palavra
+- Escolha pelo perfil:
+      "asr": {"backend": "faster_whisper", "model": "base", "compute_type": "int8"}
+
+📋 FORMATO:
+    {'id', 'start', 'end', 'text', 'avg_logprob', 'no_speech_prob',
+     'words': [{'word', 'start', 'end', 'probability'}]}
+
+⚙️ COMPARAR BACKENDS:
+    python benchmark_asr.py fixtures/amostra.wav
+
+=============================================================================
+"""
+
+import warnings
+
+try:
+    import whisper
+except ImportError:
+    whisper = None
+
+try:
+    from faster_whisper import WhisperModel
+except ImportError:
+    WhisperModel = None
+
+
+# RAM aproximada de uma instância em CPU, por tamanho de modelo
+MODEL_MEM_MB = {
+    'tiny': 500,
+    'base': 800,
+    'small': 1800,
+    'medium': 4000,
+    'large': 8000
+}
+
+
+class ASRBackend:
+    """Base: carrega um modelo e transcreve áudio 16 kHz."""
+
+    name = None
+    mem_factor = 1.0    # RAM relativa ao whisper fp32
+
+    def __init__(self, model='base', language='pt', threads=None, **options):
+        """
+        Args:
+            model: Tamanho do modelo (tiny, base, small, medium, large)
+            language: Idioma
+            threads: Threads de CPU (None = padrão da biblioteca)
+            options: Opções específicas do backend
+        """
+        self.model_name = model
+        self.language = language
+        self.threads = threads
+        self.options = options
+        self.model = None
+
+    @classmethod
+    def is_available(cls):
+        """True se a biblioteca do backend está instalada."""
+        return False
+
+    def params(self):
+        """Parâmetros que mudam o resultado (chave do StageCache)."""
+        return {'backend': self.name, 'model': self.model_name, 'language': self.language, **self.options}
+
+    def config(self):
+        """Argumentos para recriar o backend em outro processo."""
+        return {'model': self.model_name, 'language': self.language, **self.options}
+
+    def memory_mb(self):
+        """RAM estimada de uma instância carregada."""
+        return int(MODEL_MEM_MB.get(self.model_name.split('-')[0].split('.')[0], 2000) * self.mem_factor)
+
+    def load(self):
+        """Carrega o modelo (uma vez)."""
+        raise NotImplementedError
+
+    def transcribe(self, audio):
+        """
+        Transcreve áudio.
+
+        Args:
+            audio: Caminho de arquivo ou array float32 mono 16 kHz
+
+        Returns:
+            Lista de segmentos no formato comum (tempos relativos ao áudio)
+        """
+        raise NotImplementedError
+
+
+class WhisperBackend(ASRBackend):
+    """openai-whisper (PyTorch fp32 em CPU)."""
+
+    name = 'whisper'
+
+    @classmethod
+    def is_available(cls):
+        return whisper is not None
+
+    def load(self):
+        if self.model is None:
+            if self.threads:
+                import torch
+                torch.set_num_threads(self.threads)
+            warnings.filterwarnings("ignore")
+            self.model = whisper.load_model(self.model_name)
+        return self
+
+    def transcribe(self, audio):
+        self.load()
+
+        result = self.model.transcribe(
+            audio,
+            language=self.language,
+            task="transcribe",
+            word_timestamps=True,
+            condition_on_previous_text=True
+        )
+
+        return [
+            _segment(
+                i,
+                segment['start'],
+                segment['end'],
+                segment['text'],
+                [
+                    (w['word'], w['start'], w['end'], w.get('probability', 1.0))
+                    for w in segment.get('words', [])
+                ],
+                segment.get('avg_logprob', 0.0),
+                segment.get('no_speech_prob', 0.0)
+            )
+            for i, segment in enumerate(result.get('segments', []))
+        ]
+
+
+class FasterWhisperBackend(ASRBackend):
+    """faster-whisper (CTranslate2, int8 em CPU)."""
+
+    name = 'faster_whisper'
+    mem_factor = 0.4
+
+    def __init__(self, model='base', language='pt', threads=None, compute_type='int8', beam_size=5, **options):
+        super().__init__(model, language, threads, compute_type=compute_type, beam_size=beam_size, **options)
+
+    @classmethod
+    def is_available(cls):
+        return WhisperModel is not None
+
+    def load(self):
+        if self.model is None:
+            self.model = WhisperModel(
+                self.model_name,
+                device='cpu',
+                compute_type=self.options['compute_type'],
+                cpu_threads=self.threads or 0
+            )
+        return self
+
+    def transcribe(self, audio):
+        self.load()
+
+        segments, _ = self.model.transcribe(
+            audio,
+            language=self.language,
+            task="transcribe",
+            beam_size=self.options['beam_size'],
+            word_timestamps=True,
+            condition_on_previous_text=True
+        )
+
+        # Gerador: decodifica enquanto itera
+        return [
+            _segment(
+                i,
+                segment.start,
+                segment.end,
+                segment.text,
+                [(w.word, w.start, w.end, w.probability) for w in segment.words or []],
+                segment.avg_logprob,
+                segment.no_speech_prob
+            )
+            for i, segment in enumerate(segments)
+        ]
+
+
+BACKENDS = {
+    WhisperBackend.name: WhisperBackend,
+    FasterWhisperBackend.name: FasterWhisperBackend
+}
+
+
+def available_backends():
+    """Nomes dos backends instalados."""
+    return [name for name, cls in BACKENDS.items() if cls.is_available()]
+
+
+def get_backend(name='whisper', **options):
+    """
+    Cria backend pelo nome.
+
+    Args:
+        name: 'whisper' ou 'faster_whisper'
+        options: model, language, threads, compute_type...
+
+    Returns:
+        Instância de ASRBackend (modelo ainda não carregado)
+    """
+    if name not in BACKENDS:
+        raise ValueError(f"Backend ASR desconhecido: {name} (disponíveis: {', '.join(BACKENDS)})")
+
+    cls = BACKENDS[name]
+    if not cls.is_available():
+        raise ImportError(f"Backend ASR '{name}' não instalado")
+
+    return cls(**options)
+
+
+def backend_from_profile(profile, language='pt'):
+    """
+    Backend configurado na seção 'asr' do perfil.
+
+    Perfis antigos (sem 'asr') usam whisper base.
+    """
+    config = dict((profile or {}).get('asr') or {})
+    name = config.pop('backend', 'whisper')
+    config.setdefault('language', language)
+    return get_backend(name, **config)
+
+
+def _segment(index, start, end, text, words, avg_logprob, no_speech_prob):
+    """Segmento no formato comum a todos os backends."""
+    return {
+        'id': index,
+        'start': float(start),
+        'end': float(end),
+        'text': text,
+        'avg_logprob': float(avg_logprob),
+        'no_speech_prob': float(no_speech_prob),
+        'words': [
+            {
+                'word': word,
+                'start': float(w_start),
+                'end': float(w_end),
+                'probability': float(probability)
+            }
+            for word, w_start, w_end, probability in words
+        ]
+    }
@@ -14,7 +14,8 @@ POR QUE:
   Curva com picos = mais dinâmico = melhor retenção.
 
 ALTERAÇÕES:
-  - Nenhuma alteração estrutural
+  - feature_store: lê o RMS já calculado (AudioFeatureStore) em vez de
+    decodificar o áudio do short de novo
 
 O QUE AINDA PODE SER FEITO:
   - Detectar frequência de risada (200-800Hz) especificamente
@@ -29,16 +30,24 @@ import librosa
 def build_attention_curve(
     audio_path: str,
     duration: float,
-    fps: int = 10
+    fps: int = 10,
+    feature_store=None,
+    source_offset: float = 0.0
 ):
     """
     Retorna lista de valores 0-1 representando a "atenção" ao longo do tempo.
     Interpola para ter expected_len = duration * fps pontos.
+
+    Com feature_store, usa o RMS de [source_offset, source_offset + duration]
+    da live original (audio_path é ignorado).
     """
-    y, sr = librosa.load(audio_path, sr=None)
-    hop_length = int(sr / fps)
+    if feature_store is not None:
+        rms = np.asarray(feature_store.slice(source_offset, source_offset + duration)['rms'])
+    else:
+        y, sr = librosa.load(audio_path, sr=None)
+        hop_length = int(sr / fps)
 
-    rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
+        rms = librosa.feature.rms(y=y, hop_length=hop_length)[0]
 
     if len(rms) == 0:
         return [0.0]
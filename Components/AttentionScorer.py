@@ -1,4 +1,13 @@
+# Pontos nos primeiros segundos pesam mais (hook)
+EARLY_WINDOW = 5
+EARLY_WEIGHT = 1.2
+
+
 def calculate_attention_score(curve: list) -> float:
+    """
+    Média ponderada da atenção. Pontos podem ter "weight" (ex: um trecho
+    de câmera RLE conta como os frames que representa).
+    """
     if not curve:
         return 0.0
 
@@ -7,7 +16,7 @@ def calculate_attention_score(curve: list) -> float:
 
     for point in curve:
         att = point["attention"]
-        weight = 1.2 if point["time"] < 5 else 1.0
+        weight = (EARLY_WEIGHT if point["time"] < EARLY_WINDOW else 1.0) * point.get("weight", 1.0)
         weighted_sum += att * weight
         total_weight += weight
 
@@ -15,6 +15,9 @@ ANALISADOR DE ÁUDIO PROFISSIONAL - DETECÇÃO INTELIGENTE
 - Detecta momentos engraçados SEM ver memes
 - Funciona em qualquer jogo
 - Rápido (30 min vídeo = 5 min análise)
+- Memória constante: RMS e spectral flux calculados em blocos sobre o
+  WAV mapeado em memória (lives de 4-5h cabem em workers de 8 GB)
+- Com AudioFeatureStore, o spectral flux vem pronto do arquivo de features
 
 =============================================================================
 """
@@ -24,31 +27,74 @@ import librosa
 import json
 from pathlib import Path
 
+from Components.AudioStream import WavReader, ArrayAudio, stream_rms, stream_spectral_flux
+from Components.KeywordIndex import KeywordIndex
+
 
 class AudioAnalyzer:
     """
     Analisador profissional de áudio para detecção de momentos.
     """
     
-    def __init__(self, audio_path, transcription_data=None):
+    # Parâmetros da análise (também usados como chave do StageCache)
+    SAMPLE_RATE = 16000
+    ENERGY_THRESHOLD = 1.5      # desvios padrão do RMS
+    FLUX_THRESHOLD = 2.0        # desvios padrão do spectral flux
+    N_FFT = 2048
+    HOP_LENGTH = 512
+    GROUP_WINDOW = 30           # segundos para agrupar momentos
+    LAUGH_VERSION = 2           # 2: risadas por palavra via KeywordIndex
+    
+    @classmethod
+    def params(cls):
+        """Parâmetros que definem o resultado da análise."""
+        return {
+            'sample_rate': cls.SAMPLE_RATE,
+            'energy_threshold': cls.ENERGY_THRESHOLD,
+            'flux_threshold': cls.FLUX_THRESHOLD,
+            'n_fft': cls.N_FFT,
+            'hop_length': cls.HOP_LENGTH,
+            'group_window': cls.GROUP_WINDOW,
+            'laugh_version': cls.LAUGH_VERSION
+        }
+    
+    def __init__(self, audio_path, transcription_data=None, feature_store=None):
         """
         Inicializa analisador.
         
         Args:
             audio_path: Caminho do arquivo de áudio
             transcription_data: Dados da transcrição (opcional)
+            feature_store: AudioFeatureStore do mesmo áudio (opcional)
         """
         self.audio_path = audio_path
         self.transcription_data = transcription_data
+        self.feature_store = feature_store
         self.moments = []
         
         print(f"🎵 Carregando áudio: {audio_path}")
-        self.y, self.sr = librosa.load(audio_path, sr=16000, mono=True)
-        self.duration = len(self.y) / self.sr
+        self.reader = self._open_audio(audio_path)
+        self.sr = self.reader.sample_rate
+        self.duration = self.reader.duration
         
         print(f"   Duração: {self.duration/60:.1f} minutos")
         print(f"   Sample rate: {self.sr} Hz")
     
+    def _open_audio(self, audio_path):
+        """
+        WAV 16-bit na taxa da análise: lido sob demanda (memmap).
+        Outros formatos: carregados inteiros com librosa (como antes).
+        """
+        try:
+            reader = WavReader(audio_path)
+            if reader.sample_rate == self.SAMPLE_RATE:
+                return reader
+        except (ValueError, OSError):
+            pass
+        
+        y, sr = librosa.load(audio_path, sr=self.SAMPLE_RATE, mono=True)
+        return ArrayAudio(y, sr)
+    
     def analyze(self):
         """
         Análise completa do áudio.
@@ -119,23 +165,16 @@ class AudioAnalyzer:
                     })
                     break
         
-        # Se for lista de segmentos
+        # Se for lista de segmentos: risadas vêm do índice de keywords
         elif isinstance(self.transcription_data, list):
-            for segment in self.transcription_data:
-                if isinstance(segment, dict):
-                    text = str(segment.get('text', '')).lower()
-                    timestamp = segment.get('start', 0)
-                    
-                    # Verificar se tem riso
-                    has_laugh = any(pattern.lower() in text for pattern in laugh_patterns)
-                    
-                    if has_laugh:
-                        laughs.append({
-                            'timestamp': timestamp,
-                            'type': 'laugh',
-                            'score': 1.5,
-                            'reason': 'Risada detectada'
-                        })
+            keyword_index = KeywordIndex.ensure(self.transcription_data)
+            for timestamp in np.unique(keyword_index.laugh_times()):
+                laughs.append({
+                    'timestamp': float(timestamp),
+                    'type': 'laugh',
+                    'score': 1.5,
+                    'reason': 'Risada detectada'
+                })
         
         # Buscar na string completa também
         transcription_str = str(self.transcription_data).lower()
@@ -173,17 +212,18 @@ class AudioAnalyzer:
         frame_length = self.sr  # 1 segundo
         hop_length = self.sr // 2  # 0.5 segundos
         
-        rms = librosa.feature.rms(
-            y=self.y, 
+        # Em blocos (mesmo resultado de librosa.feature.rms, sem o sinal inteiro)
+        rms = stream_rms(
+            self.reader,
             frame_length=frame_length,
             hop_length=hop_length
-        )[0]
+        )
         
         # Normalizar
         rms_normalized = (rms - np.mean(rms)) / (np.std(rms) + 1e-10)
         
         # Detectar picos (> 1.5 desvios padrão)
-        threshold = 1.5
+        threshold = self.ENERGY_THRESHOLD
         peak_indices = np.where(rms_normalized > threshold)[0]
         
         # Agrupar picos próximos (< 5 segundos)
@@ -231,18 +271,22 @@ class AudioAnalyzer:
         intense = []
         
         # Calcular espectrograma
-        hop_length = 512
-        n_fft = 2048
-        
-        stft = librosa.stft(self.y, n_fft=n_fft, hop_length=hop_length)
-        magnitude = np.abs(stft)
+        hop_length = self.HOP_LENGTH
+        n_fft = self.N_FFT
         
         # Detectar mudanças bruscas no espectro (momentos intensos)
-        spectral_flux = np.sum(np.diff(magnitude, axis=1)**2, axis=0)
+        store = self.feature_store
+        if (store is not None and store.sample_rate == self.sr
+                and store.meta['n_fft'] == n_fft and store.hop_length == hop_length):
+            # flux[0] do store é o frame sem anterior
+            spectral_flux = np.asarray(store.data['flux'][1:])
+        else:
+            # STFT em blocos: nunca monta a matriz 1025 x frames inteira
+            spectral_flux = stream_spectral_flux(self.reader, n_fft=n_fft, hop_length=hop_length)
         spectral_flux_normalized = (spectral_flux - np.mean(spectral_flux)) / (np.std(spectral_flux) + 1e-10)
         
         # Picos de mudança espectral
-        threshold = 2.0  # Muito rigoroso
+        threshold = self.FLUX_THRESHOLD  # Muito rigoroso
         peak_indices = np.where(spectral_flux_normalized > threshold)[0]
         
         # Converter para timestamps
@@ -269,7 +313,7 @@ class AudioAnalyzer:
         """
         all_moments = laughs + energy_peaks + intense_moments
         
-        # Agrupar momentos próximos (< 30 segundos)
+        # Agrupar momentos próximos (< GROUP_WINDOW segundos)
         if not all_moments:
             return []
         
@@ -281,7 +325,7 @@ class AudioAnalyzer:
         current_group = [all_moments[0]]
         
         for moment in all_moments[1:]:
-            if moment['timestamp'] - current_group[0]['timestamp'] < 30:
+            if moment['timestamp'] - current_group[0]['timestamp'] < self.GROUP_WINDOW:
                 current_group.append(moment)
             else:
                 # Finalizar grupo anterior
@@ -1,7 +1,24 @@
 import numpy as np
 from moviepy.editor import AudioFileClip
 
-def detect_audio_peak(video_path: str, threshold: float = 0.6):
+def detect_audio_peak(video_path: str, threshold: float = 0.6,
+                      feature_store=None, source_offset: float = 0.0, duration: float = None):
+    """
+    Tempo (segundos) do maior pico de volume, ou None se fraco demais.
+
+    Com feature_store, usa o pico já calculado do trecho
+    [source_offset, source_offset + duration] da live (sem decodificar).
+    O limiar vale para a norma de uma amostra estéreo (≈ √2 × amostra com
+    canais iguais); o store guarda o pico do áudio mono, então compara
+    com threshold / √2.
+    """
+    if feature_store is not None:
+        end = source_offset + duration if duration is not None else None
+        peak_time, peak_value = feature_store.peak_time(source_offset, end)
+        if peak_time is None or peak_value < threshold / np.sqrt(2):
+            return None
+        return peak_time
+
     try:
         audio = AudioFileClip(video_path)
         samples = audio.to_soundarray(fps=22050)
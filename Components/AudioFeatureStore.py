@@ -0,0 +1,256 @@
+# Components/AudioFeatureStore.py
+"""
+=============================================================================
+FEATURES DE ÁUDIO (UMA PASSADA POR VÍDEO)
+=============================================================================
+
+✨ FEATURES:
+- Uma única leitura do audio.wav calcula, por frame (hop 512 @ 16 kHz = 32 ms):
+    rms, flux (spectral flux), low/voice/high (energia por banda),
+    peak (amplitude máxima) e silent (máscara de silêncio)
+- Salvo como array estruturado .npy + metadados .json
+- Aberto com mmap: cada módulo lê só o trecho que precisa por timestamp
+- Substitui os re-decodes de AudioAnalyzer, AttentionCurve, AudioEvents,
+  EtapaJ_RemoveSilence/SilenceCutter e o silencedetect do VideoOptimizer
+
+📁 ARQUIVOS:
+    features/audio_features.npy
+    features/audio_features.json
+
+⚙️ USO:
+    store = AudioFeatureStore.build('audio.wav', 'output/features')
+    store = AudioFeatureStore.open('output/features')
+
+    rms = store.slice(120.0, 165.0)['rms']
+    silences = store.silences(120.0, 165.0, threshold_db=-35, min_duration=1.0)
+
+=============================================================================
+"""
+
+import json
+from pathlib import Path
+
+import numpy as np
+
+from Components.AudioStream import WavReader, frame_blocks, num_frames
+
+
+FEATURE_DTYPE = np.dtype([
+    ('rms', '<f4'),
+    ('flux', '<f4'),
+    ('low', '<f4'),
+    ('voice', '<f4'),
+    ('high', '<f4'),
+    ('peak', '<f4'),
+    ('silent', 'u1')
+])
+
+
+class AudioFeatureStore:
+    """Features por frame de um áudio, mapeadas em memória."""
+
+    DATA_FILE = 'audio_features.npy'
+    META_FILE = 'audio_features.json'
+
+    N_FFT = 2048
+    HOP_LENGTH = 512
+    BANDS = {'low': (0, 300), 'voice': (300, 3400), 'high': (3400, None)}
+    SILENCE_DB = -35            # Mesmo padrão do VideoOptimizer
+    BLOCK_FRAMES = 1024
+
+    def __init__(self, data, meta):
+        """Use build() ou open()."""
+        self.data = data
+        self.meta = meta
+        self.sample_rate = meta['sample_rate']
+        self.hop_length = meta['hop_length']
+        self.frame_duration = self.hop_length / self.sample_rate
+        self.duration = meta['duration']
+
+    @classmethod
+    def params(cls):
+        """Parâmetros que definem o arquivo (chave do StageCache)."""
+        return {
+            'n_fft': cls.N_FFT,
+            'hop_length': cls.HOP_LENGTH,
+            'bands': cls.BANDS,
+            'silence_db': cls.SILENCE_DB,
+            'dtype': FEATURE_DTYPE.descr
+        }
+
+    # -------------------------------------------------------------------------
+    # CRIAÇÃO / ABERTURA
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, audio_path, output_dir):
+        """
+        Calcula todas as features em uma passada (memória constante).
+
+        Args:
+            audio_path: WAV PCM 16-bit (ex: audio.wav do pipeline)
+            output_dir: Diretório de saída
+
+        Returns:
+            AudioFeatureStore aberto
+        """
+        print("📈 Calculando features de áudio (passada única)...")
+
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        reader = WavReader(audio_path)
+        n_fft, hop = cls.N_FFT, cls.HOP_LENGTH
+        total = num_frames(len(reader), hop)
+
+        data_path = output_dir / cls.DATA_FILE
+        data = np.lib.format.open_memmap(data_path, mode='w+', dtype=FEATURE_DTYPE, shape=(total,))
+
+        window = np.hanning(n_fft + 1)[:-1].astype(np.float32)  # hann periódica
+        freqs = np.fft.rfftfreq(n_fft, 1.0 / reader.sample_rate)
+        band_masks = {
+            name: (freqs >= low) & (freqs < (high if high is not None else np.inf))
+            for name, (low, high) in cls.BANDS.items()
+        }
+        silence_rms = 10 ** (cls.SILENCE_DB / 20)
+
+        previous = None
+        for first, frames in frame_blocks(reader, n_fft, hop, cls.BLOCK_FRAMES):
+            block = data[first:first + len(frames)]
+
+            magnitude = np.abs(np.fft.rfft(frames * window, axis=1))
+            power = magnitude ** 2
+
+            rms = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+            block['rms'] = rms
+            block['peak'] = np.abs(frames).max(axis=1)
+            block['silent'] = rms < silence_rms
+
+            for name, mask in band_masks.items():
+                block[name] = power[:, mask].mean(axis=1)
+
+            # flux[t] = mudança entre os frames t-1 e t (flux[0] = 0)
+            stacked = magnitude if previous is None else np.vstack([previous, magnitude])
+            flux = np.sum(np.diff(stacked, axis=0) ** 2, axis=1)
+            if previous is None:
+                flux = np.concatenate([[0.0], flux])
+            block['flux'] = flux
+
+            previous = magnitude[-1:]
+
+        data.flush()
+        del data
+
+        meta = {
+            'source': str(audio_path),
+            'sample_rate': reader.sample_rate,
+            'n_fft': n_fft,
+            'hop_length': hop,
+            'n_frames': total,
+            'duration': reader.duration,
+            'params': cls.params()
+        }
+        with open(output_dir / cls.META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        print(f"   ✅ {total} frames ({data_path.stat().st_size / 1024 / 1024:.1f} MB)")
+
+        return cls.open(output_dir)
+
+    @classmethod
+    def open(cls, output_dir):
+        """Abre features salvas (mmap, nada é carregado de imediato)."""
+        output_dir = Path(output_dir)
+        with open(output_dir / cls.META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        data = np.load(output_dir / cls.DATA_FILE, mmap_mode='r')
+        return cls(data, meta)
+
+    @classmethod
+    def open_or_build(cls, audio_path, output_dir):
+        """Abre se já existe para o mesmo áudio, senão calcula."""
+        meta_path = Path(output_dir) / cls.META_FILE
+        if meta_path.exists() and (Path(output_dir) / cls.DATA_FILE).exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('source') == str(audio_path) and meta.get('params') == json.loads(json.dumps(cls.params())):
+                return cls.open(output_dir)
+        return cls.build(audio_path, output_dir)
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS POR TEMPO
+    # -------------------------------------------------------------------------
+
+    def frame_index(self, t):
+        """Frame centrado mais próximo de `t` (segundos)."""
+        return int(np.clip(round(t / self.frame_duration), 0, len(self.data) - 1))
+
+    def frame_times(self, start=0.0, end=None):
+        """Tempos (centro) dos frames de slice(start, end)."""
+        first = self.frame_index(start)
+        last = self.frame_index(self.duration if end is None else end)
+        return np.arange(first, last + 1) * self.frame_duration
+
+    def slice(self, start=0.0, end=None):
+        """Frames entre `start` e `end` (view do mmap, sem cópia)."""
+        first = self.frame_index(start)
+        last = self.frame_index(self.duration if end is None else end)
+        return self.data[first:last + 1]
+
+    def sample(self, field, times):
+        """Valor de `field` nos tempos dados (frame mais próximo)."""
+        times = np.asarray(times, dtype=np.float64)
+        idx = np.clip(np.round(times / self.frame_duration).astype(np.int64), 0, len(self.data) - 1)
+        return np.asarray(self.data[field][idx])
+
+    def peak_time(self, start=0.0, end=None):
+        """
+        Tempo (relativo a `start`) e valor do maior pico de amplitude.
+
+        Returns:
+            (tempo, pico) ou (None, 0.0) se o trecho é vazio
+        """
+        frames = self.slice(start, end)
+        if len(frames) == 0:
+            return None, 0.0
+        index = int(np.argmax(frames['peak']))
+        first = self.frame_index(start)
+        return (first + index) * self.frame_duration - start, float(frames['peak'][index])
+
+    def silences(self, start=0.0, end=None, threshold_db=None, min_duration=0.0):
+        """
+        Trechos silenciosos dentro de [start, end], relativos a `start`.
+
+        Mesmo formato do _parse_silence_output do VideoOptimizer.
+
+        Args:
+            threshold_db: Limite em dBFS (None = máscara salva, SILENCE_DB)
+            min_duration: Duração mínima do silêncio
+
+        Returns:
+            Lista de {'start', 'end', 'duration'}
+        """
+        end = self.duration if end is None else end
+        frames = self.slice(start, end)
+        if len(frames) == 0:
+            return []
+
+        if threshold_db is None:
+            silent = frames['silent'].astype(bool)
+        else:
+            silent = frames['rms'] < 10 ** (threshold_db / 20)
+
+        # Bordas das sequências de frames silenciosos
+        padded = np.concatenate([[False], silent, [False]])
+        changes = np.flatnonzero(np.diff(padded.astype(np.int8)))
+        runs = changes.reshape(-1, 2)
+
+        offset = self.frame_index(start) * self.frame_duration - start
+        silences = []
+        for first, last in runs:
+            s = max(0.0, offset + first * self.frame_duration)
+            e = min(end - start, offset + last * self.frame_duration)
+            if e - s >= min_duration and e > s:
+                silences.append({'start': s, 'end': e, 'duration': e - s})
+
+        return silences
@@ -0,0 +1,257 @@
+# Components/AudioStream.py
+"""
+=============================================================================
+LEITURA DE ÁUDIO SEM CARREGAR O ARQUIVO INTEIRO
+=============================================================================
+
+✨ FEATURES:
+- Abre WAV PCM 16-bit como np.memmap (memória constante, lives de 5h)
+- Leitura de trechos por tempo ou por amostra, já em float32 [-1, 1]
+- Mesma escala do librosa.load (int16 / 32768)
+- Bytes PCM 16-bit mono para o webrtcvad
+- RMS e spectral flux em blocos (mesmo enquadramento do librosa com
+  center=True), memória constante independente da duração
+
+⚙️ USO:
+    wav = WavReader('audio.wav')
+    y = wav.read(start_sec=60, end_sec=90)
+
+    rms = stream_rms(wav, frame_length=16000, hop_length=8000)
+    flux = stream_spectral_flux(wav, n_fft=2048, hop_length=512)
+
+=============================================================================
+"""
+
+import struct
+import numpy as np
+
+
+class WavReader:
+    """WAV PCM 16-bit mapeado em memória."""
+
+    def __init__(self, path):
+        """
+        Abre o arquivo.
+
+        Args:
+            path: Caminho do .wav (PCM 16-bit, ex: gerado por extract_audio)
+        """
+        self.path = str(path)
+        self.sample_rate, self.channels, offset, n_bytes = _parse_wav_header(self.path)
+
+        n_frames = n_bytes // (2 * self.channels)
+        self._data = np.memmap(
+            self.path,
+            dtype='<i2',
+            mode='r',
+            offset=offset,
+            shape=(n_frames, self.channels)
+        )
+
+    def __len__(self):
+        return self._data.shape[0]
+
+    @property
+    def duration(self):
+        """Duração em segundos."""
+        return len(self) / self.sample_rate
+
+    def read_samples(self, start, end):
+        """
+        Lê amostras [start, end) em float32 mono.
+
+        Índices fora do arquivo são cortados.
+        """
+        start = max(0, int(start))
+        end = min(len(self), int(end))
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+
+        block = self._data[start:end].astype(np.float32)
+        if self.channels > 1:
+            block = block.mean(axis=1)
+        else:
+            block = block[:, 0]
+
+        return block / 32768.0
+
+    def read_pcm16(self, start, end):
+        """
+        Lê amostras [start, end) como bytes PCM 16-bit mono
+        (formato exigido pelo webrtcvad).
+        """
+        start = max(0, int(start))
+        end = min(len(self), int(end))
+        if end <= start:
+            return b''
+
+        block = self._data[start:end]
+        if self.channels > 1:
+            block = block.mean(axis=1).astype('<i2')
+        else:
+            block = block[:, 0]
+
+        return np.ascontiguousarray(block).tobytes()
+
+    def read(self, start_sec=0.0, end_sec=None):
+        """Lê trecho por tempo (segundos) em float32 mono."""
+        end = len(self) if end_sec is None else int(round(end_sec * self.sample_rate))
+        return self.read_samples(int(round(start_sec * self.sample_rate)), end)
+
+
+class ArrayAudio:
+    """Sinal já carregado na memória, com a interface do WavReader."""
+
+    def __init__(self, y, sample_rate):
+        self.y = np.asarray(y, dtype=np.float32)
+        self.sample_rate = sample_rate
+
+    def __len__(self):
+        return len(self.y)
+
+    @property
+    def duration(self):
+        return len(self) / self.sample_rate
+
+    def read_samples(self, start, end):
+        start = max(0, int(start))
+        end = min(len(self), int(end))
+        if end <= start:
+            return np.zeros(0, dtype=np.float32)
+        return self.y[start:end]
+
+    def read(self, start_sec=0.0, end_sec=None):
+        end = len(self) if end_sec is None else int(round(end_sec * self.sample_rate))
+        return self.read_samples(int(round(start_sec * self.sample_rate)), end)
+
+
+# =============================================================================
+# FEATURES EM BLOCOS
+# =============================================================================
+
+def num_frames(n_samples, hop_length):
+    """Número de frames com center=True (igual ao librosa)."""
+    return 1 + n_samples // hop_length
+
+
+def read_padded(reader, start, end):
+    """Lê amostras [start, end) completando com zeros fora do arquivo."""
+    block = np.zeros(end - start, dtype=np.float32)
+    data = reader.read_samples(start, end)
+    offset = max(0, -start)
+    block[offset:offset + len(data)] = data
+    return block
+
+
+def frame_blocks(reader, frame_length, hop_length, block_frames):
+    """
+    Gera frames centrados em blocos.
+
+    Frame t cobre as amostras [t*hop - frame_length//2, t*hop + frame_length//2),
+    com zeros fora do sinal (center=True, pad_mode='constant' do librosa).
+    Blocos vizinhos relêem só a sobreposição de um frame.
+
+    Yields:
+        (índice do primeiro frame, array (n, frame_length))
+    """
+    total = num_frames(len(reader), hop_length)
+    pad = frame_length // 2
+
+    for first in range(0, total, block_frames):
+        last = min(total, first + block_frames)
+        start = first * hop_length - pad
+        end = (last - 1) * hop_length - pad + frame_length
+
+        samples = read_padded(reader, start, end)
+        frames = np.lib.stride_tricks.sliding_window_view(samples, frame_length)[::hop_length]
+
+        yield first, frames
+
+
+def stream_rms(reader, frame_length, hop_length, block_frames=256):
+    """
+    RMS por frame (equivalente a librosa.feature.rms com center=True).
+
+    Returns:
+        Array float32 com um valor por frame
+    """
+    rms = np.empty(num_frames(len(reader), hop_length), dtype=np.float32)
+
+    for first, frames in frame_blocks(reader, frame_length, hop_length, block_frames):
+        rms[first:first + len(frames)] = np.sqrt(np.mean(frames.astype(np.float64) ** 2, axis=1))
+
+    return rms
+
+
+def stream_spectral_flux(reader, n_fft, hop_length, block_frames=1024):
+    """
+    Spectral flux: soma de diff(|STFT|)² entre frames consecutivos.
+
+    Equivalente a np.sum(np.diff(np.abs(librosa.stft(y)), axis=1)**2, axis=0)
+    (janela hann, center=True), mas sem montar a matriz inteira: a última
+    coluna de cada bloco é guardada para o diff com o bloco seguinte.
+
+    Returns:
+        Array float32 com (frames - 1) valores
+    """
+    total = num_frames(len(reader), hop_length)
+    flux = np.empty(max(0, total - 1), dtype=np.float32)
+    window = np.hanning(n_fft + 1)[:-1].astype(np.float32)  # hann periódica
+
+    previous = None
+    for first, frames in frame_blocks(reader, n_fft, hop_length, block_frames):
+        magnitude = np.abs(np.fft.rfft(frames * window, axis=1))
+
+        if previous is not None:
+            magnitude = np.vstack([previous, magnitude])
+            offset = first - 1
+        else:
+            offset = first
+
+        if len(magnitude) > 1:
+            flux[offset:offset + len(magnitude) - 1] = np.sum(np.diff(magnitude, axis=0) ** 2, axis=1)
+
+        previous = magnitude[-1:]
+
+    return flux
+
+
+def _parse_wav_header(path):
+    """
+    Percorre os chunks RIFF até achar 'fmt ' e 'data'.
+
+    Returns:
+        (sample_rate, channels, data_offset, data_bytes)
+    """
+    with open(path, 'rb') as f:
+        riff, _, wave_id = struct.unpack('<4sI4s', f.read(12))
+        if riff != b'RIFF' or wave_id != b'WAVE':
+            raise ValueError(f"Não é um WAV RIFF: {path}")
+
+        sample_rate = channels = None
+
+        while True:
+            header = f.read(8)
+            if len(header) < 8:
+                raise ValueError(f"Chunk 'data' não encontrado: {path}")
+
+            chunk_id, size = struct.unpack('<4sI', header)
+
+            if chunk_id == b'fmt ':
+                fmt = f.read(size)
+                audio_format, channels, sample_rate = struct.unpack('<HHI', fmt[:8])
+                bits = struct.unpack('<H', fmt[14:16])[0]
+                if audio_format not in (1, 0xFFFE) or bits != 16:
+                    raise ValueError(f"Só PCM 16-bit é suportado: {path}")
+            elif chunk_id == b'data':
+                if sample_rate is None:
+                    raise ValueError(f"Chunk 'fmt ' ausente: {path}")
+                offset = f.tell()
+                # ffmpeg em pipe pode deixar o tamanho zerado/inválido
+                f.seek(0, 2)
+                available = f.tell() - offset
+                if size == 0 or size > available:
+                    size = available
+                return sample_rate, channels, offset, size
+            else:
+                f.seek(size + (size & 1), 1)
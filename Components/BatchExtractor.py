@@ -0,0 +1,161 @@
+# Components/BatchExtractor.py
+"""
+=============================================================================
+EXTRAÇÃO EM LOTE (UMA LEITURA DA LIVE PARA TODOS OS SEGMENTOS)
+=============================================================================
+
+✨ FEATURES:
+- Um único ffmpeg lê a live em ordem e distribui os frames para todos os
+  segment_XXX.mp4 (split + trim / asplit + atrim no filter_complex)
+- Leitura sequencial: sem N seeks aleatórios (importa em disco de rede
+  ou HD mecânico)
+- Segmentos sobrepostos funcionam (cada saída tem seu ramo do split)
+- Seek no input até o primeiro segmento do lote: não decodifica o começo
+  da live à toa
+- Lotes de no máximo max_outputs saídas (cada saída é um encoder x264
+  aberto ao mesmo tempo), processados em ordem de tempo
+- Segmentos distantes (intervalo > max_gap) vão para lotes separados:
+  decodificar horas de live entre dois clips custa mais que um seek
+
+⚙️ USO:
+    extract_segments(
+        'input/live.mp4',
+        [(120.0, 45.0), (3600.0, 60.0)],
+        ['output/segment_001.mp4', 'output/segment_002.mp4']
+    )
+
+=============================================================================
+"""
+
+import subprocess
+from pathlib import Path
+
+
+# Encoders simultâneos por ffmpeg (memória ~ saídas × lookahead do x264)
+MAX_OUTPUTS = 8
+
+# Intervalo máximo (segundos) entre segmentos do mesmo lote: todo o vídeo
+# entre eles é decodificado; acima disso um seek novo sai mais barato
+MAX_GAP_SEC = 30.0
+
+
+def plan_batches(segments, max_outputs=MAX_OUTPUTS, max_gap=MAX_GAP_SEC):
+    """
+    Agrupa os segmentos em lotes por ordem de início.
+
+    Args:
+        segments: Lista de (start, duration)
+        max_outputs: Saídas por ffmpeg
+        max_gap: Novo lote quando o segmento começa mais de max_gap
+                 segundos depois do fim do lote atual
+
+    Returns:
+        Lista de lotes, cada um com os índices dos segmentos
+    """
+    order = sorted(range(len(segments)), key=lambda i: segments[i][0])
+    size = max(1, int(max_outputs))
+
+    batches = []
+    batch_end = None
+    for i in order:
+        start, duration = segments[i]
+        if not batches or len(batches[-1]) >= size or start - batch_end > max_gap:
+            batches.append([])
+            batch_end = start
+        batches[-1].append(i)
+        batch_end = max(batch_end, start + duration)
+
+    return batches
+
+
+def build_command(video_path, segments, output_paths, has_audio=True):
+    """
+    Comando ffmpeg de um lote.
+
+    Args:
+        video_path: Vídeo de entrada
+        segments: Lista de (start, duration) do lote
+        output_paths: Um arquivo por segmento
+        has_audio: A fonte tem áudio?
+
+    Returns:
+        Lista de argumentos do ffmpeg
+    """
+    offset = min(start for start, _ in segments)
+    span = max(start + duration for start, duration in segments) - offset
+    n = len(segments)
+
+    graph = [f"[0:v]split={n}" + ''.join(f"[v{k}]" for k in range(n))]
+    if has_audio:
+        graph.append(f"[0:a]asplit={n}" + ''.join(f"[a{k}]" for k in range(n)))
+
+    for k, (start, duration) in enumerate(segments):
+        # Tempos relativos ao seek do lote
+        begin = start - offset
+        end = begin + duration
+        graph.append(f"[v{k}]trim=start={begin:.6f}:end={end:.6f},setpts=PTS-STARTPTS[vo{k}]")
+        if has_audio:
+            graph.append(f"[a{k}]atrim=start={begin:.6f}:end={end:.6f},asetpts=PTS-STARTPTS[ao{k}]")
+
+    cmd = [
+        'ffmpeg',
+        '-y',
+        '-ss', f'{offset:.6f}',
+        '-t', f'{span:.6f}',
+        '-i', str(video_path),
+        '-filter_complex', ';'.join(graph)
+    ]
+
+    for k, output_path in enumerate(output_paths):
+        cmd += ['-map', f'[vo{k}]']
+        if has_audio:
+            cmd += ['-map', f'[ao{k}]', '-c:a', 'aac']
+        cmd += ['-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18', str(output_path)]
+
+    return cmd
+
+
+def extract_segments(video_path, segments, output_paths, max_outputs=MAX_OUTPUTS, has_audio=True,
+                     max_gap=MAX_GAP_SEC):
+    """
+    Extrai todos os segmentos lendo a live uma vez (por lote).
+
+    Args:
+        video_path: Vídeo de entrada
+        segments: Lista de (start, duration) em segundos
+        output_paths: Arquivo de saída de cada segmento
+        max_outputs: Saídas por ffmpeg
+        has_audio: A fonte tem áudio?
+        max_gap: Intervalo máximo entre segmentos de um lote (segundos)
+
+    Returns:
+        Lista de caminhos extraídos (None onde o lote falhou)
+    """
+    segments = [(float(start), float(duration)) for start, duration in segments]
+    results = [None] * len(segments)
+    batches = plan_batches(segments, max_outputs, max_gap)
+
+    print(f"📦 Extraindo {len(segments)} segmentos em {len(batches)} leitura(s) da live...")
+
+    for number, batch in enumerate(batches, 1):
+        cmd = build_command(
+            video_path,
+            [segments[i] for i in batch],
+            [output_paths[i] for i in batch],
+            has_audio=has_audio
+        )
+        result = subprocess.run(cmd, capture_output=True)
+
+        if result.returncode != 0:
+            # Arquivos parciais: o clip volta para a extração individual
+            print(f"   ⚠️  Lote {number}/{len(batches)} falhou")
+            for i in batch:
+                Path(output_paths[i]).unlink(missing_ok=True)
+            continue
+
+        for i in batch:
+            results[i] = output_paths[i]
+
+    print(f"   ✅ {sum(r is not None for r in results)}/{len(segments)} segmentos extraídos")
+
+    return results
@@ -6,17 +6,39 @@ from Components.AudioEvents import detect_audio_peak
 def collect_camera_events(
     video_path,
     vw,
-    target_w
+    target_w,
+    feature_store=None,
+    source_offset=0.0,
+    duration=None,
+    visual_index=None
 ):
     """
     Junta eventos de áudio + vídeo
     e decide para onde a câmera deve ir.
+
+    feature_store (AudioFeatureStore da live) + source_offset (início do
+    clip na live): pico de áudio sem decodificar o clip.
+    visual_index (VisualFeatureIndex da live): movimento consultado no
+    trecho [source_offset, source_offset + duration], sem reler pixels.
     """
 
     events = []
 
-    visual_events = detect_visual_activity(video_path)
-    audio_peak = detect_audio_peak(video_path)
+    if visual_index is not None:
+        visual_events = detect_visual_activity(
+            video_path,
+            index=visual_index,
+            start=source_offset,
+            end=source_offset + duration if duration is not None else None
+        )
+    else:
+        visual_events = detect_visual_activity(video_path)
+    audio_peak = detect_audio_peak(
+        video_path,
+        feature_store=feature_store,
+        source_offset=source_offset,
+        duration=duration
+    )
 
     # 🔊 Evento de áudio forte (risada / grito)
     if audio_peak:
@@ -1,5 +1,9 @@
 # Components/CameraLimits.py
 
+MAX_TRAVEL_RATIO = 0.35   # no máx 35% da largura total
+MIN_HOLD_TIME = 0.6       # pelo menos 600ms parado
+
+
 def apply_camera_limits(
     video_width: int,
     crop_width: int,
@@ -13,9 +17,6 @@ def apply_camera_limits(
     - Nunca exagerar
     """
 
-    MAX_TRAVEL_RATIO = 0.35   # no máx 35% da largura total
-    MIN_HOLD_TIME = 0.6       # pelo menos 600ms parado
-
     max_travel = int(video_width * MAX_TRAVEL_RATIO)
     center = (video_width - crop_width) // 2
 
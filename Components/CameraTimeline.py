@@ -1,18 +1,116 @@
 # Components/CameraTimeline.py
+"""
+=============================================================================
+LINHA DO TEMPO DA CÂMERA (INTERVALOS ORDENADOS + BUSCA BINÁRIA)
+=============================================================================
+
+✨ FEATURES:
+- Eventos (start, end, target_x) com prioridade; empate → o adicionado
+  primeiro vence (mesmo comportamento da varredura linear antiga)
+- Compilados uma vez em trechos ordenados e sem sobreposição
+  (varredura com heap: O(n log n)); recompila só após add_event
+- get_x em O(log n) com bisect (antes: O(eventos) por frame)
+- Bordas fechadas como antes: em t == end o evento ainda vale
+- segments(): timeline inteira em trechos RLE (start, end, x), para log
+  de câmera e curva de retenção sem um dict por frame
+
+=============================================================================
+"""
+
+import heapq
+from bisect import bisect_right
+
 
 class CameraTimeline:
     def __init__(self):
         self.events = []
+        self._compiled = None
 
-    def add_event(self, start, end, target_x):
+    def add_event(self, start, end, target_x, priority=0):
         self.events.append({
             "start": start,
             "end": end,
-            "target_x": target_x
+            "target_x": target_x,
+            "priority": priority
         })
+        self._compiled = None
+
+    def _compile(self):
+        """
+        Trechos sem sobreposição.
+
+        Returns:
+            (bounds, point_values, span_values): valor exatamente em
+            bounds[k] e no intervalo aberto (bounds[k], bounds[k+1]);
+            None = sem evento (usa o padrão)
+        """
+        if self._compiled is not None:
+            return self._compiled
+
+        # Rank: maior prioridade, depois ordem de inserção
+        ranked = sorted(
+            range(len(self.events)),
+            key=lambda i: (-self.events[i].get("priority", 0), i)
+        )
+        rank = {index: r for r, index in enumerate(ranked)}
+
+        bounds = sorted({e["start"] for e in self.events} | {e["end"] for e in self.events})
+        by_start = sorted(range(len(self.events)), key=lambda i: self.events[i]["start"])
+
+        point_values = []
+        span_values = []
+        active = []
+        next_event = 0
+
+        for b in bounds:
+            while next_event < len(by_start) and self.events[by_start[next_event]]["start"] <= b:
+                i = by_start[next_event]
+                heapq.heappush(active, (rank[i], i))
+                next_event += 1
+
+            # Ponto b: eventos com end >= b (intervalo fechado)
+            while active and self.events[active[0][1]]["end"] < b:
+                heapq.heappop(active)
+            point_values.append(self.events[active[0][1]]["target_x"] if active else None)
+
+            # Depois de b: só eventos com end > b
+            while active and self.events[active[0][1]]["end"] <= b:
+                heapq.heappop(active)
+            span_values.append(self.events[active[0][1]]["target_x"] if active else None)
+
+        self._compiled = (bounds, point_values, span_values)
+        return self._compiled
 
     def get_x(self, t, default_x):
-        for e in self.events:
-            if e["start"] <= t <= e["end"]:
-                return e["target_x"]
-        return default_x
+        bounds, point_values, span_values = self._compile()
+
+        i = bisect_right(bounds, t) - 1
+        if i < 0:
+            return default_x
+
+        value = point_values[i] if bounds[i] == t else span_values[i]
+        return default_x if value is None else value
+
+    def segments(self, duration, default_x):
+        """
+        Timeline em trechos RLE cobrindo [0, duration].
+
+        Returns:
+            Lista de (start, end, x) sem vizinhos iguais
+        """
+        bounds, _, span_values = self._compile()
+
+        cuts = [0.0] + [b for b in bounds if 0 < b < duration] + [float(duration)]
+        result = []
+
+        for start, end in zip(cuts[:-1], cuts[1:]):
+            i = bisect_right(bounds, start) - 1
+            value = span_values[i] if i >= 0 else None
+            x = default_x if value is None else value
+
+            if result and result[-1][2] == x:
+                result[-1] = (result[-1][0], end, x)
+            else:
+                result.append((start, end, x))
+
+        return result
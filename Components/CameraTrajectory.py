@@ -0,0 +1,211 @@
+# Components/CameraTrajectory.py
+"""
+=============================================================================
+SOLVER VETORIZADO DA TRAJETÓRIA DE CÂMERA
+=============================================================================
+
+✨ FEATURES:
+- Entrada: intervalos de eventos (start, end, alvo x, prioridade)
+- Saída: x de TODOS os frames em um array int16 (acesso direto por frame)
+- Uma passada NumPy, sem máquina de estados por frame:
+    1. Intervalos sobrepostos → trechos elementares (maior prioridade vence)
+    2. Trechos mais curtos que MIN_HOLD_TIME são descartados (CameraLimits)
+    3. Frame → trecho com searchsorted
+    4. Suavização exponencial como filtro linear: com alvo constante no
+       trecho, y[n] = alvo + (y0 - alvo)·(1-α)^k tem forma fechada,
+       então só o valor inicial de cada trecho é calculado em sequência
+       (O(trechos)), e os frames em bloco
+    5. Ou easing (CameraEasing.ease_in_out) de duração fixa entre alvos
+    6. Limite de deslocamento MAX_TRAVEL_RATIO a partir do centro
+- 1 hora a 60 FPS (216k frames) em poucos milissegundos
+
+⚙️ USO:
+    trajectory = solve_trajectory(
+        n_frames=3600, fps=30, default=960,
+        starts=[5.0], ends=[9.0], targets=[1380], priorities=[0.9],
+        center=960, max_travel=672
+    )
+    x = trajectory[120]              # x do frame 120
+    xs = trajectory.x                # np.int16, um por frame
+
+=============================================================================
+"""
+
+import numpy as np
+
+from Components.CameraEasing import ease_in_out
+from Components.CameraLimits import MIN_HOLD_TIME
+
+
+class CameraTrajectory:
+    """x por frame (int16) + quais frames estão em um evento."""
+
+    def __init__(self, x, fps, active=None, targets=None):
+        """
+        Args:
+            x: Posição por frame
+            fps: Frames por segundo
+            active: Frame dentro de um evento? (bool por frame)
+            targets: Alvo de cada frame (para estados)
+        """
+        self.x = np.asarray(x).astype(np.int16)
+        self.fps = float(fps)
+        self.active = np.zeros(len(self.x), dtype=bool) if active is None else np.asarray(active, dtype=bool)
+        self.targets = self.x if targets is None else np.asarray(targets).astype(np.int16)
+
+    def __len__(self):
+        return len(self.x)
+
+    def __getitem__(self, frame):
+        return self.x[frame]
+
+    @property
+    def times(self):
+        return np.arange(len(self.x)) / self.fps
+
+    def x_at(self, t):
+        """x no frame do tempo t (segundos)."""
+        frame = np.clip((np.asarray(t) * self.fps).astype(np.int64), 0, len(self.x) - 1)
+        return self.x[frame]
+
+    def states(self, tolerance=10):
+        """
+        Estado de cada frame, como o CameraControllerV2:
+        center, transition_to_meme, focusing_meme, transition_to_center.
+        """
+        near = np.abs(self.x.astype(np.int32) - self.targets) < tolerance
+        labels = np.array(['transition_to_center', 'center', 'transition_to_meme', 'focusing_meme'])
+        return labels[self.active * 2 + near]
+
+    def to_camera_path(self, offset=0, tolerance=1.0):
+        """
+        CameraPath (ffmpeg) da trajetória.
+
+        Args:
+            offset: Somado ao x (ex: -largura/2 para virar borda do crop)
+            tolerance: Erro máximo (pixels) da simplificação
+        """
+        from Render.CameraPathFFmpeg import CameraPath
+        return CameraPath.from_positions(self.times, self.x.astype(np.float64) + offset, tolerance)
+
+
+def resolve_intervals(starts, ends, targets, priorities=None, default=0.0):
+    """
+    Intervalos (possivelmente sobrepostos) → trechos constantes.
+
+    Returns:
+        (inícios, alvos, ativo) dos trechos, ordenados; o primeiro
+        começa em 0 com o alvo padrão
+    """
+    starts = np.asarray(starts, dtype=np.float64)
+    ends = np.asarray(ends, dtype=np.float64)
+    targets = np.asarray(targets, dtype=np.float64)
+    priorities = np.zeros(len(starts)) if priorities is None else np.asarray(priorities, dtype=np.float64)
+
+    bounds = np.unique(np.concatenate([[0.0], starts, ends]))
+    segment_targets = np.full(len(bounds), float(default))
+    segment_active = np.zeros(len(bounds), dtype=bool)
+
+    # Menor prioridade primeiro: a maior sobrescreve; no empate o evento
+    # anterior é escrito por último e vence (como o _get_active_meme)
+    for i in np.lexsort((-np.arange(len(starts)), priorities)):
+        first = np.searchsorted(bounds, starts[i])
+        last = np.searchsorted(bounds, ends[i])
+        segment_targets[first:last] = targets[i]
+        segment_active[first:last] = True
+
+    # Junta trechos vizinhos iguais
+    changed = np.ones(len(bounds), dtype=bool)
+    changed[1:] = (segment_targets[1:] != segment_targets[:-1]) | (segment_active[1:] != segment_active[:-1])
+    return bounds[changed], segment_targets[changed], segment_active[changed]
+
+
+def drop_short_holds(starts, targets, active, min_hold=MIN_HOLD_TIME):
+    """Trechos mais curtos que min_hold herdam o alvo anterior (câmera não treme)."""
+    if len(starts) < 2 or min_hold <= 0:
+        return starts, targets, active
+
+    lengths = np.diff(np.append(starts, np.inf))
+    keep = lengths >= min_hold
+    keep[0] = True
+
+    starts, targets, active = starts[keep], targets[keep], active[keep]
+
+    changed = np.ones(len(starts), dtype=bool)
+    changed[1:] = (targets[1:] != targets[:-1]) | (active[1:] != active[:-1])
+    return starts[changed], targets[changed], active[changed]
+
+
+def solve_trajectory(n_frames, fps, default, starts=(), ends=(), targets=(), priorities=None,
+                     smoothing=0.8, return_speed=0.8, easing='ema', transition=1.0,
+                     center=None, max_travel=None, min_hold=MIN_HOLD_TIME, initial=None):
+    """
+    Trajetória completa da câmera.
+
+    Args:
+        n_frames: Quantidade de frames
+        fps: Frames por segundo
+        default: Posição sem evento (ex: centro)
+        starts, ends, targets: Intervalos dos eventos e posição alvo
+        priorities: Prioridade de cada evento (sobreposição)
+        smoothing: 'ema': fração mantida por frame (0.8 = suave)
+        return_speed: Volta ao padrão mais lenta (fração da velocidade)
+        easing: 'ema' (exponencial) ou 'ease' (ease_in_out de `transition` s)
+        transition: Duração do movimento no modo 'ease'
+        center: Centro para o limite de deslocamento (padrão = default)
+        max_travel: Deslocamento máximo a partir do centro (None = livre)
+        min_hold: Trechos mais curtos são ignorados (segundos)
+        initial: Posição no frame -1 (padrão = default)
+
+    Returns:
+        CameraTrajectory
+    """
+    n_frames = int(n_frames)
+    run_starts, run_targets, run_active = drop_short_holds(
+        *resolve_intervals(starts, ends, targets, priorities, default), min_hold=min_hold
+    )
+
+    # Primeiro frame de cada trecho e trecho de cada frame
+    run_frames = np.ceil(run_starts * fps - 1e-9).astype(np.int64)
+    run_frames[0] = 0
+    frames = np.arange(n_frames)
+    run_of_frame = np.searchsorted(run_frames, frames, side='right') - 1
+    run_lengths = np.diff(np.append(np.minimum(run_frames, n_frames), n_frames)).clip(0)
+
+    # Valor de entrada de cada trecho: recorrência só sobre os trechos
+    y_start = np.empty(len(run_frames))
+    y = float(default if initial is None else initial)
+
+    if easing == 'ease':
+        for r in range(len(run_frames)):
+            y_start[r] = y
+            if run_lengths[r]:
+                u = min(1.0, run_lengths[r] / max(1.0, transition * fps))
+                y = y + (run_targets[r] - y) * ease_in_out(u)
+
+        steps = max(1.0, transition * fps)
+        u = np.clip((frames - run_frames[run_of_frame] + 1) / steps, 0.0, 1.0)
+        start_values = y_start[run_of_frame]
+        x = start_values + (run_targets[run_of_frame] - start_values) * ease_in_out(u)
+    else:
+        alpha = 1.0 - smoothing
+        run_alpha = np.where(run_active, alpha, alpha * return_speed)
+        keep = 1.0 - run_alpha
+        for r in range(len(run_frames)):
+            y_start[r] = y
+            y = run_targets[r] + (y - run_targets[r]) * keep[r] ** run_lengths[r]
+
+        k = frames - run_frames[run_of_frame] + 1
+        target = run_targets[run_of_frame]
+        x = target + (y_start[run_of_frame] - target) * keep[run_of_frame] ** k
+
+    if max_travel is not None:
+        middle = default if center is None else center
+        x = np.clip(x, middle - max_travel, middle + max_travel)
+
+    return CameraTrajectory(
+        np.rint(x),
+        fps,
+        active=run_active[run_of_frame],
+        targets=np.rint(run_targets[run_of_frame])
+    )
@@ -0,0 +1,312 @@
+# Components/CandidateScorer.py
+"""
+=============================================================================
+PONTUAÇÃO VETORIZADA DE CANDIDATOS (JANELAS DESLIZANTES)
+=============================================================================
+
+✨ FEATURES:
+- Linha do tempo de features por passo (1s padrão, ou 0.1s):
+    words     palavras por passo (TranscriptIndex)
+    keywords  keywords fortes ditas (KeywordIndex)
+    laughs    marcadores de riso (KeywordIndex)
+    excite    "!" e "?" na fala
+    rms       energia (AudioFeatureStore)
+    flux      spectral flux (AudioFeatureStore)
+    motion    movimento visual (opcional)
+    memes     memes do canal ditos na fala (MemeIndex.scan da transcrição,
+              em janelas de MEME_WINDOW_SEC)
+- Cada coluna normalizada para 0-1 (percentil 95)
+- Colunas sem dado (ex: sem índice visual) não ficam com peso parado:
+  o peso delas é redistribuído entre as presentes
+- TODAS as janelas de TODAS as durações pontuadas com somas acumuladas:
+  O(T · durações) em NumPy, sem loop por palavra
+- Score da janela = soma do que cada passo passa da linha de base (média
+  da live): a média pura sempre favorece a janela mais curta; com a soma
+  acima da base, alongar só compensa se os segundos extras forem bons
+- Seleção dos melhores sem sobreposição
+
+⚙️ USO:
+    timeline = FeatureTimeline.build(
+        duration, transcript=segments, feature_store=store,
+        keywords=KEYWORDS_STRONG
+    )
+    scorer = CandidateScorer(timeline)
+    candidates = scorer.best_candidates(range(15, 91, 5), top_n=10)
+    # [{'start', 'end', 'score', 'mean', 'reason'}]
+
+=============================================================================
+"""
+
+import numpy as np
+
+from Components.TranscriptIndex import TranscriptIndex
+from Components.KeywordIndex import KeywordIndex
+
+
+FEATURES = ('words', 'keywords', 'laughs', 'excite', 'rms', 'flux', 'motion', 'memes')
+
+# Peso de cada feature no score (somam 1)
+DEFAULT_WEIGHTS = {
+    'words': 0.20,
+    'keywords': 0.15,
+    'laughs': 0.20,
+    'excite': 0.10,
+    'rms': 0.10,
+    'flux': 0.05,
+    'motion': 0.05,
+    'memes': 0.15
+}
+
+# Janela do MemeIndex.scan: junta palavras/segmentos curtos para a
+# sobreposição parcial enxergar a frase inteira do meme
+MEME_WINDOW_SEC = 5.0
+
+
+class FeatureTimeline:
+    """Matriz (passos × features) de uma live."""
+
+    def __init__(self, duration, step=1.0):
+        """
+        Args:
+            duration: Duração total (segundos)
+            step: Tamanho do passo (segundos)
+        """
+        self.duration = float(duration)
+        self.step = float(step)
+        self.n_steps = max(1, int(np.ceil(self.duration / self.step)))
+        self.matrix = np.zeros((self.n_steps, len(FEATURES)), dtype=np.float64)
+
+    @classmethod
+    def build(cls, duration, step=1.0, transcript=None, keywords=(), feature_store=None,
+              motion=None, meme_hits=None, visual_index=None):
+        """
+        Monta a linha do tempo a partir das fontes disponíveis.
+
+        Args:
+            duration: Duração total (segundos)
+            step: Passo (segundos)
+            transcript: Segmentos/palavras da transcrição (ou TranscriptIndex)
+            keywords: Frases que contam como keyword forte
+            feature_store: AudioFeatureStore (rms, flux)
+            motion: (tempos, valores) de movimento visual
+            visual_index: VisualFeatureIndex da live (movimento por amostra,
+                          quando motion não é passado)
+            meme_hits: Saída de MemeIndex.scan ({'timestamp', 'overlap'});
+                       None = varre a transcrição com get_meme_index(),
+                       [] = sem memes
+
+        Returns:
+            FeatureTimeline com colunas normalizadas
+        """
+        timeline = cls(duration, step)
+
+        if transcript is not None:
+            index = TranscriptIndex.ensure(transcript)
+            if len(index):
+                words = index.word_counts()
+                excite = [text.count('!') + text.count('?') for text in index.texts]
+                timeline.add_events('words', index.starts, words)
+                timeline.add_events('excite', index.starts, excite)
+
+                keyword_index = KeywordIndex.ensure(index)
+                if keywords:
+                    timeline.add_events('keywords', keyword_index.times_any(list(keywords)))
+                timeline.add_events('laughs', keyword_index.laugh_times())
+
+                if meme_hits is None:
+                    from Components.MemeIndex import get_meme_index
+                    meme_hits = get_meme_index().scan(
+                        [{'start': start, 'text': text} for start, text in zip(index.starts, index.texts)],
+                        window_sec=MEME_WINDOW_SEC
+                    )
+
+        if feature_store is not None:
+            times = np.arange(len(feature_store.data)) * feature_store.frame_duration
+            timeline.set_series('rms', times, feature_store.data['rms'])
+            timeline.set_series('flux', times, feature_store.data['flux'])
+
+        if motion is None and visual_index is not None and len(visual_index):
+            motion = (np.arange(len(visual_index)) / visual_index.fps, visual_index.data['motion'])
+
+        if motion is not None:
+            timeline.set_series('motion', *motion)
+
+        if meme_hits:
+            timeline.add_events(
+                'memes',
+                [h['timestamp'] for h in meme_hits],
+                [h.get('overlap', 1.0) for h in meme_hits]
+            )
+
+        timeline.normalize()
+        return timeline
+
+    def _bins(self, times):
+        times = np.asarray(times, dtype=np.float64)
+        return np.clip((times / self.step).astype(np.int64), 0, self.n_steps - 1)
+
+    def add_events(self, name, times, weights=None):
+        """Soma eventos pontuais (palavras, risadas...) no passo de cada um."""
+        if len(times) == 0:
+            return
+        column = FEATURES.index(name)
+        weights = np.ones(len(times)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.matrix[:, column] += np.bincount(self._bins(times), weights=weights, minlength=self.n_steps)
+
+    def set_series(self, name, times, values):
+        """Série contínua (energia, movimento): média por passo."""
+        if len(times) == 0:
+            return
+        column = FEATURES.index(name)
+        bins = self._bins(times)
+        values = np.asarray(values, dtype=np.float64)
+        sums = np.bincount(bins, weights=values, minlength=self.n_steps)
+        counts = np.bincount(bins, minlength=self.n_steps)
+        self.matrix[:, column] = np.divide(sums, counts, out=np.zeros(self.n_steps), where=counts > 0)
+
+    def normalize(self):
+        """Cada coluna para 0-1 (divide pelo percentil 95 dos passos ativos)."""
+        for column in range(len(FEATURES)):
+            values = self.matrix[:, column]
+            active = values[values > 0]
+            if len(active):
+                scale = np.percentile(active, 95)
+                if scale > 0:
+                    self.matrix[:, column] = np.minimum(values / scale, 1.0)
+
+
+class CandidateScorer:
+    """Pontua janelas da linha do tempo com somas acumuladas."""
+
+    def __init__(self, timeline, weights=None, baseline=None):
+        """
+        Args:
+            timeline: FeatureTimeline
+            weights: Pesos por feature (padrão DEFAULT_WEIGHTS)
+            baseline: Score por passo que não conta a favor da janela
+                      (padrão: média dos passos da live)
+        """
+        self.timeline = timeline
+        weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        present = timeline.matrix.any(axis=0)
+        self.weights = np.array(
+            [weights[f] if present[i] else 0.0 for i, f in enumerate(FEATURES)],
+            dtype=np.float64
+        )
+        if self.weights.sum() > 0:
+            self.weights /= self.weights.sum()
+
+        # Score de cada passo e soma acumulada (janela = diferença)
+        self.step_scores = timeline.matrix @ self.weights
+        self.baseline = float(self.step_scores.mean()) if baseline is None else float(baseline)
+        self._cumsum = np.concatenate([[0.0], np.cumsum(self.step_scores)])
+        self._excess_cumsum = np.concatenate([[0.0], np.cumsum(self.step_scores - self.baseline)])
+        self._feature_cumsum = np.vstack([np.zeros(len(FEATURES)), np.cumsum(timeline.matrix, axis=0)])
+
+    def score_duration(self, duration):
+        """
+        Score de todas as janelas com a duração dada: soma, em segundos,
+        do que cada passo passa da linha de base.
+
+        Returns:
+            Array com o score da janela que começa em cada passo
+        """
+        steps = max(1, int(round(duration / self.timeline.step)))
+        if steps > self.timeline.n_steps:
+            return np.zeros(0)
+        return (self._excess_cumsum[steps:] - self._excess_cumsum[:-steps]) * self.timeline.step
+
+    def _window_steps(self, starts, ends):
+        """(primeiro, último) passo de cada janela [start, end)."""
+        step = self.timeline.step
+        first = np.clip((np.asarray(starts, dtype=np.float64) / step).astype(np.int64), 0, self.timeline.n_steps)
+        last = np.clip(np.ceil(np.asarray(ends, dtype=np.float64) / step).astype(np.int64), 0, self.timeline.n_steps)
+        last = np.maximum(last, first + 1)
+        last = np.minimum(last, self.timeline.n_steps)
+        first = np.minimum(first, last - 1)
+        return first, last
+
+    def score_windows(self, starts, ends):
+        """Score médio (0-1) de janelas arbitrárias [start, end) (vetorizado)."""
+        first, last = self._window_steps(starts, ends)
+        return (self._cumsum[last] - self._cumsum[first]) / (last - first)
+
+    def coverage(self, name, starts, ends):
+        """Fração dos passos de cada janela em que a feature aparece (> 0)."""
+        first, last = self._window_steps(starts, ends)
+        active = np.concatenate([[0], np.cumsum(self.timeline.matrix[:, FEATURES.index(name)] > 0)])
+        return (active[last] - active[first]) / (last - first)
+
+    def score_matrix(self, durations):
+        """
+        Scores de todas as durações (linhas) × inícios (colunas).
+
+        Janelas que passam do fim da live ficam com -inf.
+        """
+        durations = list(durations)
+        scores = np.full((len(durations), self.timeline.n_steps), -np.inf)
+        for row, duration in enumerate(durations):
+            values = self.score_duration(duration)
+            scores[row, :len(values)] = values
+        return scores
+
+    def best_candidates(self, durations, top_n=10, min_score=0.0, taken=()):
+        """
+        Melhores janelas sem sobreposição entre todas as durações.
+
+        Args:
+            durations: Durações permitidas (segundos)
+            top_n: Quantidade máxima
+            min_score: Score mínimo (soma acima da linha de base; 0 = nada
+                       abaixo da média da live)
+            taken: Janelas (start, end) já escolhidas, que não podem ser
+                   sobrepostas
+
+        Returns:
+            Lista de {'start', 'end', 'score', 'mean', 'reason'} (maior
+            score primeiro; mean = score médio 0-1 da janela)
+        """
+        durations = list(durations)
+        scores = self.score_matrix(durations)
+        step = self.timeline.step
+
+        # Ordem global de (duração, início) por score, só as viáveis
+        flat = scores.ravel()
+        order = np.argsort(-flat, kind='stable')
+        order = order[np.isfinite(flat[order]) & (flat[order] >= min_score)]
+
+        occupied = np.zeros(self.timeline.n_steps, dtype=bool)
+        for start, end in taken:
+            occupied[int(start / step):int(np.ceil(end / step))] = True
+
+        selected = []
+        for position in order:
+            row, first = divmod(int(position), self.timeline.n_steps)
+            steps = max(1, int(round(durations[row] / step)))
+            if occupied[first:first + steps].any():
+                continue
+
+            occupied[first:first + steps] = True
+            start = first * step
+            end = min(self.timeline.duration, (first + steps) * step)
+            selected.append({
+                'start': round(start, 2),
+                'end': round(end, 2),
+                'score': float(flat[position]),
+                'mean': float((self._cumsum[first + steps] - self._cumsum[first]) / steps),
+                'reason': self.explain(start, end)
+            })
+            if len(selected) >= top_n:
+                break
+
+        return selected
+
+    def explain(self, start, end):
+        """Features que mais contribuíram para a janela."""
+        step = self.timeline.step
+        first = int(start / step)
+        last = max(first + 1, int(np.ceil(end / step)))
+        means = (self._feature_cumsum[last] - self._feature_cumsum[first]) / (last - first)
+        contributions = means * self.weights
+        top = np.argsort(-contributions)[:3]
+        return ', '.join(f"{FEATURES[i]} {means[i]:.2f}" for i in top if contributions[i] > 0) or 'sem destaque'
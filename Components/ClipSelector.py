@@ -5,15 +5,32 @@ Seletor de clips - SEMPRE retorna TOP N clips independente do score
 
 import numpy as np
 
+from Components.IntervalScheduling import select_intervals
+
+
+# Bônus por keyword do perfil dita no clip (máximo KEYWORD_MAX_HITS)
+KEYWORD_BONUS = 0.25
+KEYWORD_MAX_HITS = 3
+
 
 class ClipSelector:
     """Seleciona os melhores clips."""
     
-    def __init__(self, profile):
+    def __init__(self, profile, selection='greedy'):
+        """
+        Args:
+            profile: Perfil do canal
+            selection: 'greedy' (por score, descarta sobreposições) ou
+                       'optimal' (conjunto sem sobreposição de maior score
+                       total, com distância mínima thresholds.min_gap)
+        """
         self.profile = profile
         self.thresholds = profile.get('thresholds', {})
+        self.keywords = profile.get('keywords_to_highlight', [])
+        self.selection = selection
     
-    def select_clips(self, audio_features, context_analysis, meme_events, num_clips=10):
+    def select_clips(self, audio_features, context_analysis, meme_events, num_clips=10, keyword_index=None,
+                     fallback_segments=None):
         """
         Seleciona os TOP N melhores clips.
         SEMPRE retorna num_clips (ou menos se não houver candidatos).
@@ -23,6 +40,11 @@ class ClipSelector:
             context_analysis: Análise de contexto
             meme_events: Eventos de memes
             num_clips: Número de clips desejado
+            keyword_index: KeywordIndex da transcrição (bônus para
+                           keywords_to_highlight do perfil)
+            fallback_segments: Função sem argumentos que retorna trechos
+                               {'start', 'end', 'score'} (Clipper), usada
+                               quando não há nenhum candidato
         
         Returns:
             Lista dos TOP N clips ordenados por score
@@ -69,14 +91,25 @@ class ClipSelector:
         print(f"   📊 {len(all_candidates)} candidatos encontrados")
         
         if not all_candidates:
+            if fallback_segments is not None:
+                clips = self._clips_from_segments(fallback_segments(), num_clips)
+                if clips:
+                    print(f"   ⚠️  NENHUM candidato! Usando {len(clips)} trechos com fala...")
+                    return clips
             print(f"   ⚠️  NENHUM candidato! Gerando clips espaçados...")
             return self._generate_fallback_clips(num_clips)
         
+        if keyword_index is not None and self.keywords:
+            self._apply_keyword_bonus(all_candidates, keyword_index)
+        
         # Ordenar por score (maior primeiro)
         all_candidates.sort(key=lambda x: x.get('score', 0), reverse=True)
         
         # Remover overlaps
-        no_overlap = self._remove_overlaps(all_candidates)
+        if self.selection == 'optimal':
+            no_overlap = self._select_optimal(all_candidates, num_clips)
+        else:
+            no_overlap = self._remove_overlaps(all_candidates)
         
         # Pegar TOP N
         if len(no_overlap) < num_clips:
@@ -93,6 +126,36 @@ class ClipSelector:
         
         return final
     
+    def _apply_keyword_bonus(self, clips, keyword_index):
+        """Soma bônus por keyword do perfil dita dentro de cada clip."""
+        boosted = 0
+        for clip in clips:
+            start = clip['start_time']
+            found = keyword_index.matches_between(self.keywords, start, start + clip['duration'])
+            if found:
+                clip['score'] = clip.get('score', 0) + KEYWORD_BONUS * min(len(found), KEYWORD_MAX_HITS)
+                clip['keywords'] = found
+                boosted += 1
+        
+        if boosted:
+            print(f"   🔑 {boosted} candidatos com keywords do perfil")
+    
+    def _select_optimal(self, clips, num_clips):
+        """Até num_clips sem sobreposição com maior score total."""
+        chosen = select_intervals(
+            clips,
+            start=lambda c: c['start_time'],
+            end=lambda c: c['start_time'] + c['duration'],
+            weight=lambda c: c.get('score', 0),
+            min_gap=self.thresholds.get('min_gap', 0),
+            max_count=num_clips
+        )
+        
+        total = sum(c.get('score', 0) for c in chosen)
+        print(f"   🧮 Seleção ótima: {len(chosen)} clips, score total {total:.2f}")
+        
+        return chosen
+    
     def _remove_overlaps(self, clips):
         """Remove clips que se sobrepõem."""
         if not clips:
@@ -122,6 +185,20 @@ class ClipSelector:
         
         return result
     
+    def _clips_from_segments(self, segments, num_clips):
+        """Trechos do Clipper (score 0-100) no formato de clip."""
+        return [
+            {
+                'start_time': seg['start'],
+                'duration': min(60, seg['end'] - seg['start']),
+                'score': seg.get('score', 0) / 100,
+                'type': 'speech',
+                'reason': 'speech_segment',
+                'transcription': []
+            }
+            for seg in segments[:num_clips]
+        ]
+    
     def _generate_fallback_clips(self, num_clips, total_duration=15000):
         """Gera clips espaçados como fallback."""
         clips = []
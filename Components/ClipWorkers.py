@@ -0,0 +1,250 @@
+# Components/ClipWorkers.py
+"""
+=============================================================================
+PROCESSAMENTO PARALELO DE CLIPS
+=============================================================================
+
+✨ FEATURES:
+- Pool de processos para processar vários clips ao mesmo tempo
+- Limite de encodes ffmpeg simultâneos (semáforo compartilhado)
+- Limite de workers pela memória disponível
+- Log de cada clip capturado e impresso em ordem (saída determinística)
+- Tempo de parede por clip e por etapa (timings.json)
+
+⚙️ USO:
+    reports = run_clips(process_clip, jobs, workers=4, max_encodes=2)
+    write_timing_summary(reports, output_dir / 'timings.json')
+
+=============================================================================
+"""
+
+import io
+import os
+import json
+import time
+import traceback
+import contextlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+
+# Estimativa de memória por worker (frames 1080p no OpenCV + ffmpeg libx264)
+DEFAULT_MEM_PER_WORKER_MB = 1500
+
+# Semáforo de encodes do processo atual (definido pelo initializer do pool)
+_encode_semaphore = None
+
+
+def _init_worker(semaphore):
+    """Initializer do pool: guarda o semáforo de encodes no worker."""
+    global _encode_semaphore
+    _encode_semaphore = semaphore
+
+
+@contextlib.contextmanager
+def encode_slot():
+    """
+    Reserva um slot de encode ffmpeg.
+
+    Fora do pool (modo sequencial) não limita nada.
+    """
+    if _encode_semaphore is None:
+        yield
+        return
+
+    _encode_semaphore.acquire()
+    try:
+        yield
+    finally:
+        _encode_semaphore.release()
+
+
+class StageTimer:
+    """Acumula tempo de parede por etapa."""
+
+    def __init__(self):
+        self.stages = {}
+
+    @contextlib.contextmanager
+    def stage(self, name):
+        """Mede o tempo do bloco e soma na etapa `name`."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.stages[name] = self.stages.get(name, 0.0) + elapsed
+
+    def total(self):
+        """Soma de todas as etapas."""
+        return sum(self.stages.values())
+
+
+def available_memory_mb():
+    """
+    Memória disponível em MB (None se não for possível descobrir).
+    """
+    try:
+        with open('/proc/meminfo', 'r') as f:
+            for line in f:
+                if line.startswith('MemAvailable:'):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+
+    try:
+        pages = os.sysconf('SC_AVPHYS_PAGES')
+        page_size = os.sysconf('SC_PAGE_SIZE')
+        return pages * page_size / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):
+        return None
+
+
+def resolve_workers(requested, mem_per_worker_mb=DEFAULT_MEM_PER_WORKER_MB, max_memory_mb=None):
+    """
+    Calcula quantos workers usar.
+
+    Args:
+        requested: Workers pedidos (0 = automático, um por core)
+        mem_per_worker_mb: Memória estimada por worker
+        max_memory_mb: Orçamento de memória (None = memória disponível)
+
+    Returns:
+        Número de workers (>= 1)
+    """
+    workers = requested if requested and requested > 0 else (os.cpu_count() or 1)
+
+    budget = max_memory_mb if max_memory_mb else available_memory_mb()
+    if budget:
+        workers = min(workers, max(1, int(budget // mem_per_worker_mb)))
+
+    return max(1, workers)
+
+
+def _run_job(fn, index, args, capture):
+    """
+    Executa um clip e devolve relatório (log, tempos, erro).
+
+    Roda dentro do worker no modo paralelo.
+    """
+    timer = StageTimer()
+    buffer = io.StringIO()
+    redirect = contextlib.redirect_stdout(buffer) if capture else contextlib.nullcontext()
+
+    result = None
+    error = None
+    start = time.perf_counter()
+
+    with redirect:
+        try:
+            result = fn(*args, timer=timer)
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+            print(f"   ❌ Erro no clip {index}: {error}")
+            traceback.print_exc(file=buffer if capture else None)
+
+    return {
+        'index': index,
+        'result': result,
+        'error': error,
+        'log': buffer.getvalue(),
+        'stages': timer.stages,
+        'wall_time': time.perf_counter() - start
+    }
+
+
+def run_clips(fn, jobs, workers=1, max_encodes=None):
+    """
+    Processa clips sequencialmente ou em pool de processos.
+
+    Args:
+        fn: Função de nível de módulo fn(*args, timer=StageTimer)
+        jobs: Lista de (index, args)
+        workers: Número de processos (1 = sequencial)
+        max_encodes: Máximo de encodes ffmpeg simultâneos (None = workers)
+
+    Returns:
+        Lista de relatórios na ordem dos jobs
+    """
+    reports = []
+
+    if workers <= 1:
+        for index, args in jobs:
+            reports.append(_run_job(fn, index, args, capture=False))
+        return reports
+
+    ctx = multiprocessing.get_context()
+    semaphore = ctx.BoundedSemaphore(max_encodes or workers)
+
+    print(f"\n⚙️  {workers} workers, até {max_encodes or workers} encodes simultâneos")
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=ctx,
+        initializer=_init_worker,
+        initargs=(semaphore,)
+    ) as pool:
+        futures = [
+            pool.submit(_run_job, fn, index, args, True)
+            for index, args in jobs
+        ]
+
+        # Imprime na ordem dos clips (não na ordem de término)
+        for future in futures:
+            report = future.result()
+            print(report['log'], end='')
+            reports.append(report)
+
+    return reports
+
+
+def write_timing_summary(reports, output_file, pipeline_stages=None, extra=None):
+    """
+    Salva e imprime resumo de tempos por clip e por etapa.
+
+    Args:
+        reports: Relatórios de run_clips
+        output_file: Caminho do timings.json
+        pipeline_stages: Tempos das etapas globais (transcrição, análise...)
+        extra: Dados extras para o JSON (opcional)
+
+    Returns:
+        Dicionário salvo
+    """
+    stage_totals = {}
+    for report in reports:
+        for name, seconds in report['stages'].items():
+            stage_totals[name] = stage_totals.get(name, 0.0) + seconds
+
+    summary = {
+        'pipeline_stages': {k: round(v, 3) for k, v in (pipeline_stages or {}).items()},
+        'clip_stage_totals': {k: round(v, 3) for k, v in stage_totals.items()},
+        'clips': [
+            {
+                'index': r['index'],
+                'wall_time': round(r['wall_time'], 3),
+                'stages': {k: round(v, 3) for k, v in r['stages'].items()},
+                'error': r['error']
+            }
+            for r in reports
+        ]
+    }
+
+    if extra:
+        summary.update(extra)
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, indent=2, ensure_ascii=False)
+
+    print("\n⏱️  TEMPOS:")
+    for name, seconds in summary['pipeline_stages'].items():
+        print(f"   {name:<16} {seconds:8.1f}s")
+    for clip in summary['clips']:
+        stages = ', '.join(f"{k} {v:.1f}s" for k, v in clip['stages'].items())
+        status = ' ❌' if clip['error'] else ''
+        print(f"   clip {clip['index']:03d}       {clip['wall_time']:8.1f}s  ({stages}){status}")
+    for name, seconds in summary['clip_stage_totals'].items():
+        print(f"   Σ {name:<14} {seconds:8.1f}s")
+    print(f"   💾 {output_file}")
+
+    return summary
@@ -1,7 +1,8 @@
 # Components/Clipper.py
 
-from Components.RetentionScore import calculate_retention_score
-from Components.ViralScore import calculate_viral_score
+from Components.AudioFeatureStore import AudioFeatureStore
+from Components.CandidateScorer import FeatureTimeline, CandidateScorer
+from Components.AISegmentSelector import KEYWORDS_STRONG
 from Components.SilenceCutter import get_non_silent_segments
 from Components.PipelineConfig import get_pipeline_config
 
@@ -9,7 +10,10 @@ from Components.PipelineConfig import get_pipeline_config
 def select_best_segments(
     transcript,
     audio_path,
-    mode="LIVE"
+    mode="LIVE",
+    feature_store=None,
+    features_dir=None,
+    visual_index=None
 ):
     """
     FUNÇÃO CENTRAL DO PROJETO
@@ -19,6 +23,26 @@ def select_best_segments(
       {"start": float, "end": float, "score": int},
       ...
     ]
+
+    Todos os trechos sem silêncio são pontuados de uma vez pelo
+    CandidateScorer (fala, keywords, risadas, energia, movimento).
+
+    Limiares do modo (PipelineConfig), na escala do CandidateScorer:
+      MIN_RETENTION  fração dos segundos do trecho com fala (0.5 = metade)
+      MIN_VIRAL      score relativo ao melhor trecho (0.4 = 40% dele)
+    (a versão antiga chamava calculate_retention_score, que não existe,
+    e calculate_viral_score com outra assinatura)
+
+    Usado pelo run_pipeline quando a seleção não encontra candidatos.
+
+    Args:
+        transcript: Palavras/segmentos (ou TranscriptIndex)
+        audio_path: Áudio da live
+        mode: "TEST" | "LIVE" | "INSANO"
+        feature_store: AudioFeatureStore da live
+        features_dir: Onde criar/abrir o AudioFeatureStore quando
+                      feature_store não é passado (obrigatório nesse caso)
+        visual_index: VisualFeatureIndex da live (opcional)
     """
 
     print("✂️ Clipper.select_best_segments iniciado")
@@ -29,36 +53,49 @@ def select_best_segments(
     MIN_RETENTION = config["MIN_RETENTION"]
     MIN_VIRAL = config["MIN_VIRAL"]
 
+    if feature_store is None:
+        if features_dir is None:
+            raise ValueError("❌ Passe feature_store ou features_dir")
+        feature_store = AudioFeatureStore.open_or_build(audio_path, features_dir)
+
     # --------------------------------------------------
     # 1️⃣ Detecta segmentos SEM silêncio
     # --------------------------------------------------
-    segments = get_non_silent_segments(audio_path)
+    segments = get_non_silent_segments(audio_path, feature_store=feature_store)
 
     if not segments:
         print("⚠️ Nenhum segmento válido encontrado")
         return []
 
-    final_segments = []
-
     # --------------------------------------------------
-    # 2️⃣ Score por segmento
+    # 2️⃣ Score de todos os segmentos (vetorizado)
     # --------------------------------------------------
-    for seg in segments:
-        start = seg["start"]
-        end = seg["end"]
+    timeline = FeatureTimeline.build(
+        feature_store.duration,
+        transcript=transcript,
+        keywords=KEYWORDS_STRONG,
+        feature_store=feature_store,
+        visual_index=visual_index
+    )
+    scorer = CandidateScorer(timeline)
+    starts = [seg["start"] for seg in segments]
+    ends = [seg["end"] for seg in segments]
+    scores = scorer.score_windows(starts, ends)
+    retention = scorer.coverage('words', starts, ends)
+
+    best = float(scores.max()) if len(scores) else 0.0
 
-        retention = calculate_retention_score(transcript, start, end)
-        viral = calculate_viral_score(transcript, start, end)
-
-        if retention < MIN_RETENTION or viral < MIN_VIRAL:
+    final_segments = []
+    for seg, score, speech in zip(segments, scores, retention):
+        if speech < MIN_RETENTION:
+            continue
+        if best > 0 and score < MIN_VIRAL * best:
             continue
-
-        score = int((retention * 0.6) + (viral * 0.4))
 
         final_segments.append({
-            "start": round(start, 2),
-            "end": round(end, 2),
-            "score": score
+            "start": round(seg["start"], 2),
+            "end": round(seg["end"], 2),
+            "score": int(score * 100)
         })
 
     # --------------------------------------------------
@@ -23,6 +23,9 @@ O QUE AINDA PODE SER FEITO:
 =============================================================================
 """
 
+from Components.TranscriptIndex import TranscriptIndex
+
+
 def merge_coherent_segments(
     transcriptions,
     highlights,
@@ -35,7 +38,10 @@ def merge_coherent_segments(
     Para cada highlight, encontra as falas relacionadas na transcrição e
     expande o bloco para incluir frases completas. Respeita gap_tolerance
     (se gap entre falas <= 1.6s, considera mesma frase).
+
+    transcriptions: lista (texto, start, end) ou TranscriptIndex
     """
+    index = TranscriptIndex.ensure(transcriptions)
     refined = []
 
     for h in highlights:
@@ -44,11 +50,7 @@ def merge_coherent_segments(
         raw_start = max(0, raw_start)
 
         # Palavras/falas que cruzam o intervalo do highlight
-        related = [
-            (text, start, end)
-            for text, start, end in transcriptions
-            if end >= raw_start and start <= raw_end
-        ]
+        related = index.entries_between(raw_start, raw_end, overlapping=True)
 
         if not related:
             continue
@@ -68,11 +70,10 @@ def merge_coherent_segments(
 
         # Se ainda curto, tenta expandir mais (5s antes/depois)
         if duration < min_duration:
-            for text, start, end in transcriptions:
-                if start < block_start and (block_start - start) <= 5:
-                    block_start = start
-                if end > block_end and (end - block_end) <= 5:
-                    block_end = end
+            earlier = index.first_start_at_or_after(block_start - 5)
+            if earlier is not None and earlier < block_start:
+                block_start = earlier
+            block_end = index.chain_end(block_end, 5)
             duration = block_end - block_start
 
         if duration < min_duration:
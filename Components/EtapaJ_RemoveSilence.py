@@ -19,7 +19,7 @@ POR QUE É IMPORTANTE:
   mantém o ritmo e reduz duração sem perder conteúdo.
 
 ALTERAÇÕES:
-  - Nenhuma alteração estrutural
+  - Volume pode vir do AudioFeatureStore (sem decodificar o clip de novo)
 
 O QUE AINDA PODE SER FEITO:
   - Usar VAD (Voice Activity Detection) mais sofisticado
@@ -31,6 +31,8 @@ O QUE AINDA PODE SER FEITO:
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 import numpy as np
 
+from Components.SilenceCutter import silent_mask
+
 
 def remove_silence(
     video_in,
@@ -38,11 +40,18 @@ def remove_silence(
     silence_threshold=0.02,
     min_silence=0.8,
     padding=0.15,
-    analysis_fps=20
+    analysis_fps=20,
+    feature_store=None,
+    source_offset=0.0
 ):
     """
     Remove silêncios >= min_silence segundos. Concatena os trechos sonoros.
     Se vídeo não tem áudio, apenas copia.
+
+    Com feature_store (AudioFeatureStore da live), o volume vem do RMS já
+    calculado a partir de source_offset (início do clip na live), sem
+    amostrar clip.audio.get_frame em loop; o limiar é convertido para RMS
+    (SilenceCutter.silent_mask).
     """
     clip = VideoFileClip(video_in)
 
@@ -62,16 +71,7 @@ def remove_silence(
 
     # Amostra volumes ao longo do vídeo
     times = np.arange(0, duration, step)
-    volumes = []
-    for t in times:
-        try:
-            frame = clip.audio.get_frame(t)
-            volume = np.linalg.norm(frame) if frame is not None else 0.0
-        except Exception:
-            volume = 0.0
-        volumes.append(volume)
-
-    silent = np.array(volumes) < silence_threshold
+    silent = silent_mask(clip, times, silence_threshold, feature_store, source_offset)
 
     # Encontra segmentos sonoros (entre silêncios longos)
     segments = []
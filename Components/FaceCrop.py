@@ -1,5 +1,4 @@
-from moviepy.editor import VideoFileClip, CompositeVideoClip
-from moviepy.video.VideoClip import TextClip
+import cv2
 
 from Components.CameraLimits import apply_camera_limits
 from Components.CameraLogic import decide_camera_path, get_crop_x
@@ -8,11 +7,18 @@ from Components.CameraMemory import get_last_camera_state, set_last_camera_state
 
 from Components.RetentionCurve import build_retention_curve
 from Components.AttentionScorer import calculate_attention_score
+from Components.AttentionCurve import build_attention_curve
+from Components.RetentionScore import calculate_retention_metrics
 
 from Components.CameraTimeline import CameraTimeline
 from Components.CameraDirector import decide_camera_events
 
+from Render.FFmpegPipeWriter import FFmpegPipeWriter
+from Render.FramePipeline import FramePipeline, capture_reader
+from Render.CameraPathFFmpeg import CameraPath, render_camera_path
+
 import json
+import math
 
 
 def movement_intensity_from_score(score: int) -> float:
@@ -35,22 +41,39 @@ def crop_to_vertical_with_audio(
     transcript_text: str = "",
     viral_score: int = 0,
     debug: bool = False,
-    debug_overlay: bool = False
+    debug_overlay: bool = False,
+    workers: int = 2,
+    engine: str = "pipeline",
+    feature_store=None,
+    source_offset: float = 0.0,
+    visual_index=None
 ):
     print("🎥 Criando vídeo vertical (câmera inteligente + diretor cinematográfico)...")
 
-    clip = VideoFileClip(input_video)
+    cap = cv2.VideoCapture(input_video)
+    if not cap.isOpened():
+        raise ValueError(f"❌ Não foi possível abrir vídeo: {input_video}")
+
+    vw = int(cap.get(cv2.CAP_PROP_FRAME_WIDTH))
+    vh = int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT))
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    duration = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) / fps
 
-    vw, vh = clip.size
-    duration = clip.duration
-    target_w = int(vh * 9 / 16)
+    # Largura par (yuv420p do libx264)
+    target_w = int(vh * 9 / 16) // 2 * 2
 
     if target_w > vw:
         raise ValueError("❌ Vídeo muito estreito para 9:16")
 
     movement_intensity = movement_intensity_from_score(viral_score)
 
-    peak_time = detect_audio_peak(input_video)
+    # Com o AudioFeatureStore da live (+ início do clip nela): sem decodificar áudio
+    peak_time = detect_audio_peak(
+        input_video,
+        feature_store=feature_store,
+        source_offset=source_offset,
+        duration=duration
+    )
     last_state = get_last_camera_state()
 
     camera_path = decide_camera_path(
@@ -96,7 +119,11 @@ def crop_to_vertical_with_audio(
     auto_events = collect_camera_events(
         input_video,
         vw,
-        target_w
+        target_w,
+        feature_store=feature_store,
+        source_offset=source_offset,
+        duration=duration,
+        visual_index=visual_index
     )
 
     for e in auto_events:
@@ -115,41 +142,64 @@ def crop_to_vertical_with_audio(
             target_x=e["target_x"]
         )
 
-    camera_events_log = []
-
-    def crop_frame(get_frame, t):
-        frame = get_frame(t)
-        x = timeline.get_x(t, positions[0])
-        x = max(0, min(x, vw - target_w))
+    def crop_x(t):
+        x = int(timeline.get_x(t, positions[0]))
+        return max(0, min(x, vw - target_w))
 
-        cam_state = "CENTER"
+    def camera_state(x):
         if x < vw * 0.25:
-            cam_state = "LEFT"
+            return "LEFT"
         elif x > vw * 0.55:
-            cam_state = "RIGHT"
-
-        set_last_camera_state(cam_state)
-
-        camera_events_log.append({
-            "time": round(t, 3),
-            "camera": cam_state
-        })
-
-        return frame[0:vh, x:x + target_w]
-
-    vertical = clip.fl(crop_frame)
-
-    # 🔊 ÁUDIO DEFENSIVO
-    if clip.audio:
-        vertical = vertical.set_audio(clip.audio)
-
-    vertical.write_videofile(
-        output_video,
-        codec="libx264",
-        audio_codec="aac",
-        preset="medium",
-        threads=4
-    )
+            return "RIGHT"
+        return "CENTER"
+
+    def crop_frame(index, frame, out):
+        x = crop_x(index / fps)
+        out[:] = frame[0:vh, x:x + target_w]
+        return out
+
+    if engine == "ffmpeg":
+        # Caminho da câmera compilado para o crop do ffmpeg (sem Python por frame)
+        path = CameraPath.from_timeline(timeline, positions[0], duration, 0, vw - target_w)
+        render_camera_path(
+            input_video, output_video, path,
+            crop_w=target_w, crop_h=vh,
+            target_width=target_w, target_height=vh,
+            preset="medium"
+        )
+    else:
+        # 🔊 ÁUDIO DEFENSIVO ('1:a:0?': vídeo sem áudio também funciona)
+        with FFmpegPipeWriter(output_video, target_w, vh, fps, audio_source=input_video) as writer:
+            FramePipeline(crop_frame, workers=workers, name='facecrop').run(
+                capture_reader(cap),
+                writer.write,
+                frame_shape=(vh, vw, 3),
+                output_shape=(vh, target_w, 3)
+            )
+
+    cap.release()
+
+    # Log da câmera em trechos (um por mudança de estado, não por frame)
+    camera_events_log = []
+    for start, end, x in timeline.segments(duration, positions[0]):
+        state = camera_state(max(0, min(int(x), vw - target_w)))
+        first_frame = math.ceil(start * fps - 1e-9)
+        frames = math.ceil(end * fps - 1e-9) - first_frame
+        if camera_events_log and camera_events_log[-1]["camera"] == state:
+            camera_events_log[-1]["end"] = round(end, 3)
+            camera_events_log[-1]["frames"] += frames
+        elif frames > 0:
+            camera_events_log.append({
+                "time": round(start, 3),
+                "end": round(end, 3),
+                "camera": state,
+                "frame": first_frame,
+                "fps": fps,
+                "frames": frames
+            })
+
+    if camera_events_log:
+        set_last_camera_state(camera_events_log[-1]["camera"])
 
     retention_curve = build_retention_curve(
         duration=duration,
@@ -160,14 +210,24 @@ def crop_to_vertical_with_audio(
 
     attention_score = calculate_attention_score(retention_curve)
 
-    with open(output_video.replace(".mp4", "_retention.json"), "w", encoding="utf-8") as f:
-        json.dump({
-            "attention_score": attention_score,
-            "curve": retention_curve
-        }, f, indent=2)
+    retention = {
+        "attention_score": attention_score,
+        "curve": retention_curve
+    }
+
+    # Curva de energia do áudio: fatia do store, sem decodificar o clip
+    if feature_store is not None:
+        retention["audio_retention"] = calculate_retention_metrics(
+            build_attention_curve(
+                input_video,
+                duration,
+                feature_store=feature_store,
+                source_offset=source_offset
+            )
+        )
 
-    clip.close()
-    vertical.close()
+    with open(output_video.replace(".mp4", "_retention.json"), "w", encoding="utf-8") as f:
+        json.dump(retention, f, indent=2)
 
     print(f"📈 Retention Score: {attention_score}")
     print("✅ Vídeo finalizado com câmera cinematográfica inteligente")
@@ -1,27 +1,32 @@
 # Components/HookDetector.py
 
+from Components.TranscriptIndex import TranscriptIndex
+from Components.KeywordIndex import KeywordIndex
+
+HOOK_WORDS = ["olha", "mano", "presta", "atenção", "cara"]
+
+
 def detect_hook_strength(transcriptions, clip_start, clip_end):
     """
     Analisa os primeiros segundos do corte
     para detectar força de hook inicial
+
+    transcriptions: lista (texto, start, end) ou TranscriptIndex
     """
 
-    hook_text = []
     hook_duration = 3.0
 
-    for text, start, end in transcriptions:
-        if start >= clip_start and start <= clip_start + hook_duration:
-            hook_text.append(text.lower())
-
-    full = " ".join(hook_text)
+    index = TranscriptIndex.ensure(transcriptions)
+    full = index.text_between(clip_start, clip_start + hook_duration).lower()
 
     score = 0
 
-    if any(w in full for w in ["olha", "mano", "presta", "atenção", "cara"]):
+    keywords = KeywordIndex.ensure(index)
+    if keywords.count_any(HOOK_WORDS, clip_start, clip_start + hook_duration) > 0:
         score += 30
     if "!" in full or "?" in full:
         score += 20
-    if len(full.split()) >= 6:
+    if index.word_count(clip_start, clip_start + hook_duration) >= 6:
         score += 20
 
     if score > 60:
@@ -2,7 +2,24 @@ import os
 import json
 from openai import OpenAI
 
-client = OpenAI(api_key=os.getenv("OPENAI_API_KEY"))
+from Components.LLMCache import get_llm_cache
+
+JUDGE_MODEL = "gpt-4.1-mini"
+JUDGE_TEMPERATURE = 0.2
+JUDGE_PROMPT_VERSION = "iajudge-v1"  # mudar ao editar o prompt
+
+_client = None
+
+
+def _get_client():
+    """Cliente OpenAI criado só no primeiro cache miss."""
+    global _client
+    if _client is None:
+        _client = OpenAI(
+            api_key=os.getenv("OPENAI_API_KEY"),
+            base_url=os.getenv("OPENAI_BASE_URL") or None
+        )
+    return _client
 
 
 def judge_retention_with_ai(summary: dict):
@@ -20,10 +37,19 @@ Responda APENAS em JSON:
 }}
 """
 
-    response = client.chat.completions.create(
-        model="gpt-4.1-mini",
+    cache = get_llm_cache()
+    content = cache.get(JUDGE_MODEL, JUDGE_TEMPERATURE, JUDGE_PROMPT_VERSION, prompt)
+    if content is not None:
+        return json.loads(content)
+
+    response = _get_client().chat.completions.create(
+        model=JUDGE_MODEL,
         messages=[{"role": "user", "content": prompt}],
-        temperature=0.2
+        temperature=JUDGE_TEMPERATURE
     )
 
-    return json.loads(response.choices[0].message.content)
+    content = response.choices[0].message.content
+    result = json.loads(content)
+    cache.put(JUDGE_MODEL, JUDGE_TEMPERATURE, JUDGE_PROMPT_VERSION, prompt, content)
+
+    return result
@@ -0,0 +1,128 @@
+# Components/IntervalScheduling.py
+"""
+=============================================================================
+SELEÇÃO ÓTIMA DE CLIPS SEM SOBREPOSIÇÃO (WEIGHTED INTERVAL SCHEDULING)
+=============================================================================
+
+✨ FEATURES:
+- Escolhe o conjunto de clips sem sobreposição com MAIOR score total
+  (o guloso por score troca dois clips bons vizinhos por um só)
+- Distância mínima entre clips embutida (min_gap)
+- Limite de quantidade (top-N): programação dinâmica por camadas,
+  cada camada vetorizada (O(n · N)); sem limite, DP clássica O(n)
+- Predecessores por busca binária nos fins ordenados: O(n log n)
+
+⚙️ USO:
+    chosen = select_intervals(
+        candidates,
+        start=lambda c: c['start_time'],
+        end=lambda c: c['start_time'] + c['duration'],
+        weight=lambda c: c['score'],
+        min_gap=10,
+        max_count=35
+    )
+
+=============================================================================
+"""
+
+import numpy as np
+
+
+# Peso mínimo: candidatos com score 0 ainda contam (maximiza quantidade)
+_MIN_WEIGHT = 1e-9
+
+
+def select_intervals(items, start, end, weight, min_gap=0.0, max_count=None):
+    """
+    Subconjunto compatível de peso máximo.
+
+    Dois itens são compatíveis se um termina pelo menos `min_gap`
+    segundos antes do outro começar.
+
+    Args:
+        items: Candidatos (qualquer objeto)
+        start: Função item -> início
+        end: Função item -> fim
+        weight: Função item -> score
+        min_gap: Distância mínima entre o fim de um e o início do próximo
+        max_count: Máximo de itens (None = sem limite)
+
+    Returns:
+        Itens escolhidos, do maior para o menor score
+    """
+    items = list(items)
+    if not items:
+        return []
+
+    starts = np.array([start(item) for item in items], dtype=np.float64)
+    ends = np.array([end(item) for item in items], dtype=np.float64)
+    weights = np.maximum(np.array([weight(item) for item in items], dtype=np.float64), _MIN_WEIGHT)
+
+    # Ordena por fim; p[i] = quantos terminam a tempo de caber antes do i
+    order = np.argsort(ends, kind='stable')
+    starts, ends, weights = starts[order], ends[order], weights[order]
+    predecessors = np.searchsorted(ends, starts - min_gap, side='right')
+    predecessors = np.minimum(predecessors, np.arange(len(items)))  # clips de duração 0
+
+    n = len(items)
+    if max_count is not None and int(max_count) < n:
+        chosen = _layered(weights, predecessors, max(0, int(max_count)))
+    else:
+        chosen = _unlimited(weights, predecessors)
+
+    chosen = [int(order[i]) for i in chosen]
+    result = [items[index] for index in chosen]
+    result.sort(key=lambda item: weight(item), reverse=True)
+    return result
+
+
+def _unlimited(weights, predecessors):
+    """DP clássica (sem limite de quantidade). Returns: posições escolhidas."""
+    n = len(weights)
+    best = [0.0] * (n + 1)
+    for i in range(1, n + 1):
+        take = weights[i - 1] + best[predecessors[i - 1]]
+        best[i] = take if take > best[i - 1] else best[i - 1]
+
+    chosen = []
+    i = n
+    while i > 0:
+        if best[i] == best[i - 1]:
+            i -= 1
+        else:
+            chosen.append(i - 1)
+            i = int(predecessors[i - 1])
+    return chosen
+
+
+def _layered(weights, predecessors, max_count):
+    """DP por camadas (até max_count itens), cada camada vetorizada."""
+    n = len(weights)
+    if max_count == 0:
+        return []
+
+    # best[k][i] = melhor total com até k itens entre os i primeiros
+    best = [np.zeros(n + 1)]
+    for _ in range(max_count):
+        previous = best[-1]
+        take = weights + previous[predecessors]
+        current = np.maximum.accumulate(np.concatenate([[0.0], take]))
+        best.append(current)
+
+        # Camada igual à anterior: as seguintes também serão iguais. (Só o
+        # total não basta: ele não cresce de forma côncava com k, ex.
+        # 1 item de 10 > 2 itens de 4, mas 3 itens de 4 = 12)
+        if np.array_equal(current, previous):
+            break
+
+    chosen = []
+    k = len(best) - 1
+    i = n
+    while k > 0 and i > 0:
+        if best[k][i] == best[k][i - 1]:
+            i -= 1
+        else:
+            chosen.append(i - 1)
+            i = int(predecessors[i - 1])
+            k -= 1
+    return chosen
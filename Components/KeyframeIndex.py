@@ -0,0 +1,392 @@
+# Components/KeyframeIndex.py
+"""
+=============================================================================
+ÍNDICE DE KEYFRAMES E CORTE INTELIGENTE (SMART CUT)
+=============================================================================
+
+✨ FEATURES:
+- Índice de keyframes da live inteira, montado UMA vez com ffprobe
+  (só lê os pacotes, sem decodificar) e salvo no StageCache
+- Corte com seek no INPUT (-ss antes do -i): o ffmpeg pula direto para o
+  keyframe anterior, então o clip 40 de uma live de 5h extrai tão
+  rápido quanto o clip 1
+- Bordas exatas no frame: só os GOPs parciais do começo e do fim são
+  re-encodados; o meio (keyframe a keyframe) é copiado sem encode
+- Partes em MPEG-TS/Annex-B (SPS/PPS dentro do stream) e bordas com o
+  mesmo profile/level/refs da fonte: o MP4 final decodifica limpo mesmo
+  com parâmetros do x264 diferentes dos do trecho copiado
+- Áudio re-encodado no trecho exato (barato) e mixado no final
+- Fallback para re-encode preciso quando o codec não tem encoder
+  compatível, o clip é menor que um GOP, alguma etapa do ffmpeg falha
+  ou o clip montado sai mais curto que o pedido
+
+⚙️ USO:
+    index = KeyframeIndex.build('input/live.mp4')
+    cache.cached_json('keyframes', source_hash, KeyframeIndex.params(),
+                      lambda: index.to_dict())
+
+    smart_cut('input/live.mp4', 3600.0, 45.0, 'segment.mp4', index)
+
+=============================================================================
+"""
+
+import json
+import shutil
+import tempfile
+import subprocess
+from bisect import bisect_left, bisect_right
+from pathlib import Path
+
+
+INDEX_VERSION = 3
+
+# Clip do smart cut mais curto que o pedido além disso = truncado
+CUT_TOLERANCE_SEC = 0.1
+
+# Encoder usado nas bordas (mesmo codec da fonte, para o concat funcionar)
+ENCODERS = {
+    'h264': 'libx264',
+    'hevc': 'libx265'
+}
+
+# Trecho copiado menor que isso não compensa 3 ffmpegs: re-encode direto
+MIN_COPY_SEC = 2.0
+
+
+class KeyframeIndex:
+    """Tempos dos keyframes do stream de vídeo + parâmetros do stream."""
+
+    def __init__(self, times, stream=None, duration=None):
+        """
+        Args:
+            times: Tempos (segundos) dos keyframes, ordenados
+            stream: Parâmetros do vídeo (codec, pix_fmt, tamanho, time_base)
+            duration: Duração total (segundos)
+        """
+        self.times = sorted(float(t) for t in times)
+        self.stream = stream or {}
+        self.duration = duration if duration is not None else (self.times[-1] if self.times else 0.0)
+
+    @classmethod
+    def params(cls):
+        """Parâmetros que definem o índice (chave do StageCache)."""
+        return {'version': INDEX_VERSION}
+
+    @classmethod
+    def build(cls, video_path):
+        """
+        Lê os pacotes do vídeo com ffprobe e guarda os keyframes.
+
+        Args:
+            video_path: Vídeo de entrada
+
+        Returns:
+            KeyframeIndex
+        """
+        print("🔑 Indexando keyframes...")
+
+        stream = _probe_stream(video_path)
+
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-select_streams', 'v:0',
+            '-show_entries', 'packet=pts_time,flags',
+            '-of', 'csv=p=0',
+            str(video_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        # pts_time inclui o start_time do stream; o -ss do ffmpeg e o
+        # CAP_PROP_POS_FRAMES do OpenCV contam a partir do início
+        try:
+            offset = float(stream.get('start_time', 0) or 0)
+        except (TypeError, ValueError):
+            offset = 0.0
+
+        times = []
+        for line in result.stdout.splitlines():
+            pts, _, flags = line.partition(',')
+            if 'K' in flags and pts not in ('', 'N/A'):
+                times.append(max(0.0, float(pts) - offset))
+
+        index = cls(times, stream, stream.get('duration'))
+
+        if len(index.times) > 1:
+            gop = (index.times[-1] - index.times[0]) / (len(index.times) - 1)
+            print(f"   ✅ {len(index.times)} keyframes (GOP médio {gop:.2f}s)")
+        else:
+            print(f"   ⚠️  {len(index.times)} keyframes encontrados")
+
+        return index
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS
+    # -------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.times)
+
+    def at_or_before(self, t):
+        """Último keyframe <= t (None se não houver)."""
+        i = bisect_right(self.times, t + 1e-6)
+        return self.times[i - 1] if i else None
+
+    def at_or_after(self, t):
+        """Primeiro keyframe >= t (None se não houver)."""
+        i = bisect_left(self.times, t - 1e-6)
+        return self.times[i] if i < len(self.times) else None
+
+    def plan(self, start, end):
+        """
+        Divide [start, end) em partes re-encodadas e copiadas.
+
+        Returns:
+            Lista de (start, end, 'encode' | 'copy'); só 'encode' se o
+            trecho entre keyframes for curto demais
+        """
+        first = self.at_or_after(start)
+        last = self.at_or_before(end)
+
+        if first is None or last is None or last - first < MIN_COPY_SEC:
+            return [(start, end, 'encode')]
+
+        parts = []
+        if first > start:
+            parts.append((start, first, 'encode'))
+        parts.append((first, last, 'copy'))
+        if end > last:
+            parts.append((last, end, 'encode'))
+        return parts
+
+    def can_smart_cut(self):
+        """Há encoder do mesmo codec para as bordas?"""
+        return bool(self.times) and self.stream.get('codec_name') in ENCODERS
+
+    # -------------------------------------------------------------------------
+    # PERSISTÊNCIA
+    # -------------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'params': self.params(),
+            'duration': self.duration,
+            'stream': self.stream,
+            'times': self.times
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['times'], data.get('stream'), data.get('duration'))
+
+    def save(self, path):
+        """Salva o índice em JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Carrega índice salvo por save()."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+def _probe_stream(video_path):
+    """Parâmetros do primeiro stream de vídeo (para encodar bordas iguais)."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=codec_name,profile,level,refs,pix_fmt,width,height,time_base,start_time:format=duration',
+        '-of', 'json',
+        str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+
+    try:
+        data = json.loads(result.stdout)
+    except json.JSONDecodeError:
+        return {}
+
+    stream = (data.get('streams') or [{}])[0]
+    try:
+        stream['duration'] = float(data['format']['duration'])
+    except (KeyError, TypeError, ValueError):
+        pass
+    return stream
+
+
+def _timescale(stream):
+    """Denominador do time_base (ex: '1/15360' → 15360)."""
+    try:
+        return int(str(stream.get('time_base', '')).split('/')[1])
+    except (IndexError, ValueError):
+        return None
+
+
+def _h264_profile(profile):
+    """Nome do ffprobe ('High', 'Constrained Baseline'...) → -profile:v do libx264."""
+    name = str(profile or '').lower()
+    if 'baseline' in name:
+        return 'baseline'
+    return {
+        'main': 'main',
+        'high': 'high',
+        'high 10': 'high10',
+        'high 4:2:2': 'high422',
+        'high 4:4:4 predictive': 'high444'
+    }.get(name)
+
+
+def _encode_args(stream):
+    """
+    Argumentos de vídeo das bordas re-encodadas: mesmo codec, pix_fmt,
+    profile, level e refs da fonte, e parâmetros (SPS/PPS) repetidos em
+    cada keyframe, dentro do stream.
+    """
+    codec = stream.get('codec_name')
+    args = ['-c:v', ENCODERS.get(codec, 'libx264'), '-preset', 'veryfast', '-crf', '18']
+    if stream.get('pix_fmt'):
+        args += ['-pix_fmt', stream['pix_fmt']]
+
+    if codec == 'hevc':
+        args += ['-x265-params', 'repeat-headers=1']
+        return args
+
+    profile = _h264_profile(stream.get('profile'))
+    if profile:
+        args += ['-profile:v', profile]
+    if isinstance(stream.get('level'), int) and stream['level'] >= 10:
+        args += ['-level:v', f"{stream['level'] / 10:.1f}"]
+    if isinstance(stream.get('refs'), int) and stream['refs'] > 0:
+        args += ['-refs', str(stream['refs'])]
+    args += ['-x264-params', 'repeat-headers=1']
+    return args
+
+
+def _annexb_filter(stream):
+    """Bitstream filter que põe SPS/PPS (VPS) dentro do stream copiado."""
+    return 'hevc_mp4toannexb' if stream.get('codec_name') == 'hevc' else 'h264_mp4toannexb'
+
+
+def accurate_cut(video_path, start, duration, output_path):
+    """
+    Re-encode do trecho com seek no input (rápido e exato no frame).
+
+    Returns:
+        output_path
+
+    Raises:
+        RuntimeError: se o ffmpeg falhar
+    """
+    cmd = [
+        'ffmpeg',
+        '-ss', f'{start:.3f}',
+        '-i', str(video_path),
+        '-t', f'{duration:.3f}',
+        '-c:v', 'libx264', '-preset', 'veryfast', '-crf', '18',
+        '-c:a', 'aac',
+        '-y',
+        str(output_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    if result.returncode != 0:
+        error = (result.stderr or '').strip().splitlines()[-1:] or ['sem saída']
+        raise RuntimeError(f"ffmpeg falhou ao cortar {video_path} ({start:.3f}s): {error[0]}")
+    return output_path
+
+
+def smart_cut(video_path, start, duration, output_path, index):
+    """
+    Extrai [start, start + duration) re-encodando só os GOPs das bordas.
+
+    Args:
+        video_path: Vídeo de entrada
+        start: Início (segundos)
+        duration: Duração (segundos)
+        output_path: Arquivo de saída
+        index: KeyframeIndex do vídeo
+
+    Returns:
+        output_path
+    """
+    end = start + duration
+    parts = index.plan(start, end) if index.can_smart_cut() else [(start, end, 'encode')]
+
+    if len(parts) == 1 and parts[0][2] == 'encode':
+        return accurate_cut(video_path, start, duration, output_path)
+
+    # Partes em MPEG-TS (Annex-B): SPS/PPS vão dentro do stream em cada
+    # keyframe. Em MP4 ficam fora (avcC) e o concat guardaria só os da
+    # primeira parte: o meio copiado, com parâmetros diferentes dos do
+    # x264, poderia decodificar corrompido
+    work_dir = Path(tempfile.mkdtemp(prefix='smartcut_', dir=Path(output_path).parent))
+    try:
+        part_files = []
+        for n, (part_start, part_end, mode) in enumerate(parts):
+            part_path = work_dir / f'part_{n}.ts'
+            if mode == 'copy':
+                # Seek 1 ms depois do keyframe (arredondamento do pts não
+                # volta para o GOP anterior) e para 1 ms antes do próximo
+                seek, length = part_start + 0.001, part_end - part_start - 0.002
+                codec_args = [
+                    '-c:v', 'copy',
+                    '-bsf:v', _annexb_filter(index.stream),
+                    '-avoid_negative_ts', 'make_zero'
+                ]
+            else:
+                seek, length = part_start, part_end - part_start
+                codec_args = _encode_args(index.stream)
+
+            cmd = [
+                'ffmpeg',
+                '-ss', f'{seek:.6f}',
+                '-i', str(video_path),
+                '-t', f'{length:.6f}',
+                '-an',
+                *codec_args,
+                '-f', 'mpegts',
+                '-y',
+                str(part_path)
+            ]
+            result = subprocess.run(cmd, capture_output=True)
+            if result.returncode != 0:
+                print(f"   ⚠️  Smart cut falhou ({mode}), re-encodando o clip inteiro")
+                return accurate_cut(video_path, start, duration, output_path)
+            part_files.append(part_path)
+
+        list_path = work_dir / 'parts.txt'
+        list_path.write_text(''.join(f"file '{p.resolve()}'\n" for p in part_files), encoding='utf-8')
+
+        # Vídeo concatenado sem encode + áudio exato do trecho
+        timescale = _timescale(index.stream)
+        cmd = [
+            'ffmpeg',
+            '-f', 'concat', '-safe', '0', '-i', str(list_path),
+            '-ss', f'{start:.6f}',
+            '-t', f'{duration:.6f}',
+            '-i', str(video_path),
+            '-map', '0:v:0', '-map', '1:a:0?',
+            '-c:v', 'copy',
+            '-c:a', 'aac',
+            *(['-video_track_timescale', str(timescale)] if timescale else []),
+            '-shortest',
+            '-y',
+            str(output_path)
+        ]
+        result = subprocess.run(cmd, capture_output=True)
+        if result.returncode != 0:
+            print("   ⚠️  Concat falhou, re-encodando o clip inteiro")
+            return accurate_cut(video_path, start, duration, output_path)
+
+        # Parte copiada que o concat não conseguiu ler termina o clip antes
+        # da hora (o -shortest corta o áudio junto) sem código de erro
+        cut_duration = _probe_stream(output_path).get('duration')
+        if cut_duration is None or cut_duration < duration - CUT_TOLERANCE_SEC:
+            print(f"   ⚠️  Smart cut saiu truncado ({cut_duration}s de {duration:.2f}s), re-encodando o clip inteiro")
+            return accurate_cut(video_path, start, duration, output_path)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return output_path
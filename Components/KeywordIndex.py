@@ -0,0 +1,157 @@
+# Components/KeywordIndex.py
+"""
+=============================================================================
+ÍNDICE INVERTIDO DE PALAVRAS-CHAVE DA TRANSCRIÇÃO
+=============================================================================
+
+✨ FEATURES:
+- Token normalizado (sem acento) -> timestamps ordenados
+- Frases ("presta atenção") = interseção das posições dos tokens
+- Risadas ([RISO], kkkk, hahaha, rsrs...) viram um único token <riso>
+- Construído UMA vez por transcrição (em cima do TranscriptIndex)
+- Consulta por janela de tempo com busca binária; resultado de cada
+  frase fica em cache (keyword nova no perfil = uma busca, não uma
+  varredura de horas de texto)
+
+Usado por AISegmentSelector (KEYWORDS_STRONG), SegmentScorer
+(POWER_WORDS), ContextAnalyzer (frases do streamer), AudioAnalyzer
+(risadas), HookDetector (palavras de gancho) e ClipSelector
+(keywords_to_highlight do perfil).
+
+⚙️ USO:
+    index = KeywordIndex.ensure(transcription)   # segmentos ou palavras
+
+    index.times('presta atenção')                # array de timestamps
+    index.count_any(['mano', 'olha isso'], 120, 150)
+    index.matches_between(profile['keywords_to_highlight'], 120, 150)
+    index.times(LAUGH_TOKEN)
+
+Matching por token inteiro: "cara" não casa com "caramba".
+
+=============================================================================
+"""
+
+import re
+
+import numpy as np
+
+from Components.MemeIndex import tokenize
+from Components.TranscriptIndex import TranscriptIndex
+
+
+LAUGH_TOKEN = '<riso>'
+
+# Tokens (já normalizados) que contam como risada
+_LAUGH_RE = re.compile(
+    r'^(k{3,}|(?:ha){3,}h?|(?:rs){2,}|riso|risos|risada|rindo|gargalhada|laughing|laughter)$'
+)
+
+
+class KeywordIndex:
+    """Posições de cada token da transcrição, por tempo."""
+
+    def __init__(self, transcript_index):
+        """
+        Args:
+            transcript_index: TranscriptIndex (palavras ou segmentos)
+        """
+        tindex = transcript_index
+        counts = np.diff(tindex.token_ptr)
+
+        # Tempo de cada token = início da palavra/segmento dele
+        self.token_times = np.repeat(tindex.starts, counts)
+        self.tokens = tindex.token_ids
+        self.vocab = tindex.vocab
+
+        # Postings: posições de cada token id (ordenadas)
+        order = np.argsort(self.tokens, kind='stable')
+        sorted_ids = self.tokens[order]
+        bounds = np.flatnonzero(np.diff(sorted_ids)) + 1
+        self._postings = {}
+        for chunk in np.split(order, bounds):
+            if len(chunk):
+                self._postings[int(self.tokens[chunk[0]])] = chunk
+
+        laugh_ids = [i for t, i in self.vocab.items() if _LAUGH_RE.match(t)]
+        laugh_positions = [self._postings[i] for i in laugh_ids if i in self._postings]
+        self._laugh_positions = np.sort(np.concatenate(laugh_positions)) if laugh_positions else np.zeros(0, dtype=np.int64)
+
+        self._cache = {}
+
+    @classmethod
+    def ensure(cls, transcriptions):
+        """
+        Aceita KeywordIndex, TranscriptIndex ou lista (segmentos/palavras).
+
+        O índice da última transcrição é reaproveitado entre chamadas.
+        """
+        if isinstance(transcriptions, cls):
+            return transcriptions
+
+        tindex = TranscriptIndex.ensure(transcriptions)
+        if _last_built[0] is not tindex:
+            _last_built[:] = [tindex, cls(tindex)]
+        return _last_built[1]
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS
+    # -------------------------------------------------------------------------
+
+    def positions(self, phrase):
+        """Posições (no fluxo de tokens) onde a frase começa."""
+        if phrase == LAUGH_TOKEN:
+            return self._laugh_positions
+
+        tokens = tokenize(phrase)
+        ids = [self.vocab.get(t) for t in tokens]
+        if not ids or None in ids:
+            return np.zeros(0, dtype=np.int64)
+
+        result = self._postings.get(ids[0], np.zeros(0, dtype=np.int64))
+        for offset, token_id in enumerate(ids[1:], start=1):
+            following = self._postings.get(token_id)
+            if following is None:
+                return np.zeros(0, dtype=np.int64)
+            result = np.intersect1d(result, following - offset, assume_unique=True)
+            if len(result) == 0:
+                break
+        return np.sort(result)
+
+    def times(self, phrase):
+        """Timestamps ordenados das ocorrências da frase (em cache)."""
+        if phrase not in self._cache:
+            self._cache[phrase] = np.sort(self.token_times[self.positions(phrase)])
+        return self._cache[phrase]
+
+    def times_any(self, phrases):
+        """Timestamps ordenados de qualquer uma das frases (em cache)."""
+        key = tuple(phrases)
+        if key not in self._cache:
+            arrays = [self.times(p) for p in phrases]
+            self._cache[key] = np.sort(np.concatenate(arrays)) if arrays else np.zeros(0)
+        return self._cache[key]
+
+    def count(self, phrase, t0, t1):
+        """Ocorrências da frase com t0 <= tempo <= t1."""
+        return _count_between(self.times(phrase), t0, t1)
+
+    def count_any(self, phrases, t0, t1):
+        """Ocorrências de qualquer uma das frases na janela."""
+        return _count_between(self.times_any(phrases), t0, t1)
+
+    def matches_between(self, phrases, t0, t1):
+        """Frases (da lista) ditas na janela, na ordem da lista."""
+        return [p for p in phrases if self.count(p, t0, t1) > 0]
+
+    def laugh_times(self):
+        """Timestamps de risadas."""
+        return self.times(LAUGH_TOKEN)
+
+
+# Último índice construído por ensure(): [TranscriptIndex, KeywordIndex]
+_last_built = [None, None]
+
+
+def _count_between(times, t0, t1):
+    """Quantos valores de `times` (ordenado) estão em [t0, t1]."""
+    return int(np.searchsorted(times, t1, side='right') - np.searchsorted(times, t0, side='left'))
@@ -0,0 +1,194 @@
+# Components/LLMCache.py
+"""
+=============================================================================
+CACHE DE RESPOSTAS DO LLM (SQLITE)
+=============================================================================
+
+✨ FEATURES:
+- Chave = modelo + temperatura + versão do template + hash do prompt final
+- Re-rodar uma live (depois de crash ou ajuste de parâmetro) não paga
+  latência nem custo de novo
+- Expira entradas antigas (TTL) e remove as menos usadas acima do limite
+  de tamanho
+- Contadores de hit/miss (vão para o timings.json)
+- Seguro entre threads (GetHighlights faz requisições em paralelo)
+
+⚙️ USO:
+    cache = get_llm_cache()
+    text = cache.completion(
+        model, temperature, 'meu-template-v1', prompt,
+        lambda: chamar_api(prompt)
+    )
+
+=============================================================================
+"""
+
+import time
+import json
+import hashlib
+import sqlite3
+import threading
+from pathlib import Path
+
+
+class LLMCache:
+    """Respostas do LLM guardadas em SQLite."""
+
+    def __init__(self, path='cache/llm_cache.sqlite', ttl_days=30, max_size_mb=200, enabled=True):
+        """
+        Inicializa cache.
+
+        Args:
+            path: Arquivo SQLite
+            ttl_days: Dias até uma resposta expirar (None = nunca)
+            max_size_mb: Tamanho máximo das respostas guardadas
+            enabled: False = sempre chama a API (--no-cache)
+        """
+        self.path = Path(path)
+        self.ttl_seconds = ttl_days * 86400 if ttl_days else None
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = None
+
+        if self.enabled:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.path), timeout=30, check_same_thread=False)
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT,
+                    temperature REAL,
+                    template_version TEXT,
+                    prompt_hash TEXT,
+                    response TEXT,
+                    size INTEGER,
+                    created REAL,
+                    last_used REAL
+                )
+            """)
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_last_used ON responses(last_used)")
+            self._conn.commit()
+
+    @staticmethod
+    def key(model, temperature, template_version, prompt):
+        """Chave: hash de (modelo, temperatura, template, hash do prompt)."""
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        payload = json.dumps([model, float(temperature), template_version, prompt_hash])
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest(), prompt_hash
+
+    def get(self, model, temperature, template_version, prompt):
+        """
+        Resposta guardada.
+
+        Returns:
+            Texto da resposta ou None (miss, expirada ou cache desligado)
+        """
+        if not self.enabled:
+            return None
+
+        key, _ = self.key(model, temperature, template_version, prompt)
+        now = time.time()
+
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT response, created FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row is None:
+                self.misses += 1
+                return None
+
+            response, created = row
+            if self.ttl_seconds and now - created > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+
+            self._conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+            self._conn.commit()
+            self.hits += 1
+
+        return response
+
+    def put(self, model, temperature, template_version, prompt, response):
+        """Guarda resposta e aplica limite de tamanho."""
+        if not self.enabled or response is None:
+            return
+
+        key, prompt_hash = self.key(model, temperature, template_version, prompt)
+        now = time.time()
+
+        with self._lock:
+            self._conn.execute(
+                """
+                INSERT OR REPLACE INTO responses
+                (key, model, temperature, template_version, prompt_hash, response, size, created, last_used)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """,
+                (key, model, float(temperature), template_version, prompt_hash,
+                 response, len(response.encode('utf-8')), now, now)
+            )
+            self._evict(now)
+            self._conn.commit()
+
+    def completion(self, model, temperature, template_version, prompt, call):
+        """
+        Atalho: resposta do cache ou da API.
+
+        Args:
+            call: Função sem argumentos que chama a API e devolve o texto
+
+        Returns:
+            Texto da resposta
+        """
+        response = self.get(model, temperature, template_version, prompt)
+        if response is not None:
+            return response
+
+        response = call()
+        self.put(model, temperature, template_version, prompt, response)
+        return response
+
+    def stats(self):
+        """Contadores de hit/miss."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    def _evict(self, now):
+        """Remove expiradas e, acima do limite, as menos usadas."""
+        if self.ttl_seconds:
+            self._conn.execute("DELETE FROM responses WHERE created < ?", (now - self.ttl_seconds,))
+
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_size_bytes:
+            return
+
+        rows = self._conn.execute("SELECT key, size FROM responses ORDER BY last_used ASC").fetchall()
+        for key, size in rows:
+            if total <= self.max_size_bytes:
+                break
+            self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+            total -= size
+
+
+# Instância do processo (configurada pelo run_pipeline)
+_llm_cache = None
+
+
+def configure_llm_cache(path='cache/llm_cache.sqlite', ttl_days=30, max_size_mb=200, enabled=True):
+    """Define o cache usado por GetHighlights e IAJudge neste processo."""
+    global _llm_cache
+    _llm_cache = LLMCache(path, ttl_days=ttl_days, max_size_mb=max_size_mb, enabled=enabled)
+    return _llm_cache
+
+
+def get_llm_cache():
+    """Cache do processo (criado com os padrões na primeira chamada)."""
+    global _llm_cache
+    if _llm_cache is None:
+        _llm_cache = LLMCache()
+    return _llm_cache
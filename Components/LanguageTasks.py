@@ -19,10 +19,16 @@ IDENTIFICAÇÃO DE HIGHLIGHTS - PERSONALIZADO PARA 11CLOSED
 import os
 import json
 import re
+import bisect
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from dotenv import load_dotenv
 
+from Components.LLMCache import get_llm_cache
+from Components.MemeIndex import get_meme_index, invalidate_meme_index
+
 load_dotenv()
 
 if not os.getenv("OPENAI_API_KEY") and os.getenv("OPENAI_API"):
@@ -31,6 +37,32 @@ if not os.getenv("OPENAI_API_KEY"):
     print("⚠️ OPENAI_API_KEY não encontrada no .env")
 
 
+# Modelo/prompt do GetHighlights (mudar PROMPT_VERSION ao editar o prompt)
+HIGHLIGHTS_MODEL = "gpt-4o-mini"
+HIGHLIGHTS_TEMPERATURE = 0.3
+PROMPT_VERSION = "11closed-v1"
+
+# Janelas de tempo (map-reduce sobre a live inteira)
+WINDOW_MIN = 30
+WINDOW_OVERLAP_MIN = 3
+DEDUPE_DISTANCE_SEC = 20
+HIGHLIGHTS_CONCURRENCY = int(os.getenv("HIGHLIGHTS_CONCURRENCY", "4"))
+
+_TIMESTAMP_RE = re.compile(r'^\[(\d+(?:\.\d+)?)s\]')
+
+
+def highlights_params():
+    """Parâmetros que definem o resultado do GetHighlights."""
+    return {
+        'model': HIGHLIGHTS_MODEL,
+        'temperature': HIGHLIGHTS_TEMPERATURE,
+        'prompt_version': PROMPT_VERSION,
+        'window_min': WINDOW_MIN,
+        'window_overlap_min': WINDOW_OVERLAP_MIN,
+        'dedupe_distance_sec': DEDUPE_DISTANCE_SEC
+    }
+
+
 # =============================================================================
 # BIBLIOTECA DE MEMES E FRASES DO 11CLOSED
 # =============================================================================
@@ -221,62 +253,16 @@ def _check_meme_match(text: str) -> bool:
     TOLERÂNCIA: Aceita similaridade parcial (para erros de OCR)
     - "tres dias depois" match "três dias depois" ✅
     - "voce e homem ou e bixa" match "você é homem ou é bixa" ✅
-    """
-    text_lower = text.lower()
-    
-    # Normalizar (remover acentos para comparação)
-    normalized = text_lower
-    normalized = normalized.replace('á', 'a').replace('à', 'a').replace('â', 'a').replace('ã', 'a')
-    normalized = normalized.replace('é', 'e').replace('ê', 'e')
-    normalized = normalized.replace('í', 'i')
-    normalized = normalized.replace('ó', 'o').replace('ô', 'o').replace('õ', 'o')
-    normalized = normalized.replace('ú', 'u').replace('ü', 'u')
-    normalized = normalized.replace('ç', 'c')
-    
-    # Verificar cada meme
-    for meme in MEMES_11CLOSED:
-        meme_normalized = meme.lower()
-        meme_normalized = meme_normalized.replace('á', 'a').replace('à', 'a').replace('â', 'a').replace('ã', 'a')
-        meme_normalized = meme_normalized.replace('é', 'e').replace('ê', 'e')
-        meme_normalized = meme_normalized.replace('í', 'i')
-        meme_normalized = meme_normalized.replace('ó', 'o').replace('ô', 'o').replace('õ', 'o')
-        meme_normalized = meme_normalized.replace('ú', 'u').replace('ü', 'u')
-        meme_normalized = meme_normalized.replace('ç', 'c')
-        
-        # Match parcial (pelo menos 70% das palavras)
-        meme_words = set(meme_normalized.split())
-        text_words = set(normalized.split())
-        
-        if meme_words and text_words:
-            overlap = len(meme_words & text_words) / len(meme_words)
-            if overlap >= 0.7:  # 70% de similaridade
-                return True
-    
-    return False
-
-
-def GetHighlights(transcript_text: str, video_duration_min: float = 240):
-    """
-    Retorna highlights PERSONALIZADOS para o canal 11closed.
     
-    MUDANÇA PRINCIPAL:
-    - Prompt inclui TODOS os memes e frases específicas
-    - GPT prioriza momentos com esses memes
+    Usa o índice compilado (Components/MemeIndex.py): pelo menos 70%
+    das palavras de algum meme presentes no texto. Memes customizados
+    (custom_memes.txt / add_custom_meme) contam, como antes: eram
+    adicionados em MEMES_11CLOSED; comentários do chat ficam de fora.
     """
-    llm = ChatOpenAI(
-        model="gpt-4o-mini",
-        temperature=0.3
-    )
+    return bool(get_meme_index().match_text(text, min_overlap=0.7, sources=('meme', 'custom')))
 
-    # Calcular quantos momentos pedir
-    num_moments = min(60, max(30, int(video_duration_min / 4)))
 
-    # CRIAR LISTA DE MEMES PARA O PROMPT
-    memes_str = "\n".join([f"   - \"{meme}\"" for meme in MEMES_11CLOSED[:30]])  # Top 30
-    comentarios_str = "\n".join([f"   - \"{com}\"" for com in COMENTARIOS_11CLOSED])
-
-    prompt = ChatPromptTemplate.from_template(
-        """
+HIGHLIGHTS_PROMPT = """
 Você é editor de Shorts VIRAIS do canal 11CLOSED (gameplay sem webcam).
 
 🎯 PRIORIDADE ABSOLUTA: MEMES E FRASES ESPECÍFICAS DO CANAL
@@ -316,29 +302,119 @@ Retorne EXATAMENTE {num_moments} momentos.
 TRANSCRIÇÃO (procure os memes e frases acima):
 {transcript}
 """
+
+
+def _build_llm():
+    """
+    Cliente do GetHighlights.
+
+    OPENAI_BASE_URL aponta para outro servidor compatível com a API
+    da OpenAI (ex: fake_openai_server.py para testar offline).
+    """
+    return ChatOpenAI(
+        model=HIGHLIGHTS_MODEL,
+        temperature=HIGHLIGHTS_TEMPERATURE,
+        base_url=os.getenv("OPENAI_BASE_URL") or None
     )
 
-    chain = prompt | llm
-    response = chain.invoke({
-        "transcript": transcript_text[:120000],
+
+_llm = None
+_llm_lock = threading.Lock()
+
+
+def _get_llm():
+    """Cliente único do processo, criado só no primeiro cache miss."""
+    global _llm
+    with _llm_lock:
+        if _llm is None:
+            _llm = _build_llm()
+    return _llm
+
+
+def split_transcript_windows(transcript_text: str,
+                             window_sec: float = WINDOW_MIN * 60,
+                             overlap_sec: float = WINDOW_OVERLAP_MIN * 60):
+    """
+    Divide a transcrição ("[123.4s] texto" por linha) em janelas de tempo
+    sobrepostas.
+
+    Returns:
+        Lista de {'start', 'end', 'text'}; transcrição sem timestamps
+        vira uma única janela
+    """
+    lines = []
+    for line in transcript_text.splitlines():
+        match = _TIMESTAMP_RE.match(line)
+        lines.append((float(match.group(1)) if match else None, line))
+
+    timed = [t for t, _ in lines if t is not None]
+    if not timed:
+        return [{'start': 0.0, 'end': float('inf'), 'text': transcript_text}]
+
+    last = max(timed)
+    step = max(1.0, window_sec - overlap_sec)
+
+    windows = []
+    window_start = 0.0
+    while True:
+        window_end = window_start + window_sec
+        current_time = 0.0
+        selected = []
+        for t, line in lines:
+            current_time = t if t is not None else current_time
+            if window_start <= current_time < window_end:
+                selected.append(line)
+
+        if selected:
+            windows.append({'start': window_start, 'end': window_end, 'text': "\n".join(selected)})
+
+        if window_end > last:
+            break
+        window_start += step
+
+    return windows
+
+
+def _request_moments(window, num_moments, memes_str, comentarios_str):
+    """
+    Uma chamada ao LLM para uma janela (ou resposta do LLMCache).
+
+    Returns:
+        Lista crua de momentos
+    """
+    prompt = ChatPromptTemplate.from_template(HIGHLIGHTS_PROMPT)
+    prompt_value = prompt.invoke({
+        "transcript": window['text'][:120000],
         "num_moments": num_moments,
         "memes_list": memes_str,
         "comentarios_list": comentarios_str
     })
+    rendered = prompt_value.to_string()
+
+    cache = get_llm_cache()
+    raw = cache.get(HIGHLIGHTS_MODEL, HIGHLIGHTS_TEMPERATURE, PROMPT_VERSION, rendered)
+    from_cache = raw is not None
+    if not from_cache:
+        raw = _get_llm().invoke(prompt_value).content
 
-    raw = response.content
-    print(f"🔍 DEBUG - Resposta do GPT (primeiros 500 chars):")
-    print(raw[:500])
-    
     cleaned = _clean_llm_json(raw)
 
     try:
         moments = json.loads(cleaned)
     except Exception as e:
-        print(f"❌ Erro ao parsear JSON: {e}")
+        print(f"❌ Erro ao parsear JSON ({window['start']/60:.0f}-{window['end']/60:.0f} min): {e}")
         print(f"Raw: {raw[:500]}")
         return []
 
+    # Só guarda respostas válidas (JSON quebrado é pedido de novo)
+    if not from_cache:
+        cache.put(HIGHLIGHTS_MODEL, HIGHLIGHTS_TEMPERATURE, PROMPT_VERSION, rendered, raw)
+
+    return moments if isinstance(moments, list) else []
+
+
+def _postprocess_moments(moments, window=None):
+    """Converte momentos do LLM em clips (start/end/score)."""
     # PÓS-PROCESSAMENTO
     valid_clips = []
     seen_timestamps = set()
@@ -353,6 +429,10 @@ TRANSCRIÇÃO (procure os memes e frases acima):
             else:
                 continue
             
+            # Clímax inventado fora da janela pedida
+            if window is not None and not (window['start'] - 60 <= climax <= window['end'] + 60):
+                continue
+            
             # Evitar duplicatas
             if climax in seen_timestamps:
                 continue
@@ -382,6 +462,7 @@ TRANSCRIÇÃO (procure os memes e frases acima):
             score = 1.5 if has_known_meme else 1.0
             
             valid_clips.append({
+                "climax": climax,
                 "start": start,
                 "end": end,
                 "reason": reason,
@@ -392,8 +473,86 @@ TRANSCRIÇÃO (procure os memes e frases acima):
         except (KeyError, ValueError, TypeError) as e:
             continue
 
-    # Ordenar por score (memes primeiro) e depois por timestamp
-    valid_clips = sorted(valid_clips, key=lambda x: (-x["score"], x["start"]))
+    return valid_clips
+
+
+def merge_highlights(clips, min_distance_sec: float = DEDUPE_DISTANCE_SEC):
+    """
+    Junta os clips de todas as janelas em uma lista global.
+
+    Clímax a menos de `min_distance_sec` de outro já aceito é duplicata
+    (mesmo momento visto em duas janelas sobrepostas): fica o de maior
+    score.
+
+    Returns:
+        Lista ordenada por score (memes primeiro) e depois por timestamp
+    """
+    ranked = sorted(clips, key=lambda c: (-c["score"], c["climax"]))
+
+    accepted = []
+    climaxes = []
+    for clip in ranked:
+        index = bisect.bisect_left(climaxes, clip["climax"])
+        near = climaxes[max(0, index - 1):index + 1]
+        if any(abs(c - clip["climax"]) < min_distance_sec for c in near):
+            continue
+        climaxes.insert(index, clip["climax"])
+        accepted.append(clip)
+
+    return sorted(accepted, key=lambda x: (-x["score"], x["start"]))
+
+
+def GetHighlights(transcript_text: str, video_duration_min: float = 240, max_concurrency: int = None):
+    """
+    Retorna highlights PERSONALIZADOS para o canal 11closed.
+    
+    MUDANÇA PRINCIPAL:
+    - Prompt inclui TODOS os memes e frases específicas
+    - GPT prioriza momentos com esses memes
+    - Live inteira analisada: janelas de WINDOW_MIN minutos (com
+      sobreposição) enviadas em paralelo e depois mescladas
+    
+    Args:
+        transcript_text: Transcrição "[123.4s] texto" por linha
+        video_duration_min: Duração da live
+        max_concurrency: Requisições simultâneas (None = HIGHLIGHTS_CONCURRENCY)
+    """
+    # Calcular quantos momentos pedir
+    num_moments = min(60, max(30, int(video_duration_min / 4)))
+
+    # CRIAR LISTA DE MEMES PARA O PROMPT
+    memes_str = "\n".join([f"   - \"{meme}\"" for meme in MEMES_11CLOSED[:30]])  # Top 30
+    comentarios_str = "\n".join([f"   - \"{com}\"" for com in COMENTARIOS_11CLOSED])
+
+    windows = split_transcript_windows(transcript_text)
+
+    # Momentos por janela proporcionais à duração coberta
+    window_sec = WINDOW_MIN * 60
+    total_sec = max(video_duration_min * 60, window_sec)
+    per_window = max(5, round(num_moments * window_sec / total_sec)) if len(windows) > 1 else num_moments
+
+    concurrency = max(1, min(len(windows), max_concurrency or HIGHLIGHTS_CONCURRENCY))
+    print(f"🤖 {len(windows)} janela(s) de {WINDOW_MIN} min, {per_window} momentos cada, "
+          f"{concurrency} requisições simultâneas")
+
+    def run_window(window):
+        moments = _request_moments(window, per_window, memes_str, comentarios_str)
+        return _postprocess_moments(moments, window if len(windows) > 1 else None)
+
+    all_clips = []
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        futures = {pool.submit(run_window, w): w for w in windows}
+        for future in as_completed(futures):
+            window = futures[future]
+            try:
+                clips = future.result()
+            except Exception as e:
+                print(f"   ❌ Janela {window['start']/60:.0f}-{window['end']/60:.0f} min: {e}")
+                continue
+            print(f"   ✅ Janela {window['start']/60:.0f}-{window['end']/60:.0f} min: {len(clips)} momentos")
+            all_clips.extend(clips)
+
+    valid_clips = merge_highlights(all_clips)
     
     print(f"✅ {len(valid_clips)} highlights encontrados")
     print(f"   🎭 {sum(1 for c in valid_clips if c['has_meme'])} com memes conhecidos")
@@ -422,6 +581,8 @@ def add_custom_meme(meme_text: str):
         os.makedirs("profiles/lives_do_11closed", exist_ok=True)
         with open(memes_file, 'a', encoding='utf-8') as f:
             f.write(f"{meme_text}\n")
+        
+        invalidate_meme_index()
     else:
         print(f"⚠️ Meme já existe: {meme_text}")
 
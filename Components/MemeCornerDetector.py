@@ -17,6 +17,16 @@ MÉTODO:
   1. Usa haarcascade (OpenCV) para detectar faces nas regiões 0-25% e 75-100%
   2. Se haarcascade não existir: fallback por diferença de movimento entre
      terço esquerdo e direito do frame
+  3. Leitura direta: só os frames amostrados são decodificados por inteiro
+     (grab() nos demais) e o Haar roda só nos cantos, reduzidos pela escala
+     ligada ao min_face_size
+  4. Com index (VisualFeatureIndex já aberto) ou index_dir (onde abrir/criar
+     o índice do vídeo) os dois viram consultas ao índice (decode único,
+     compartilhado com VisualEvents/VisualTracker); sem eles (ou com
+     parâmetros diferentes dos do índice) o vídeo é lido diretamente, sem
+     gravar nada
+  5. workers != 1: leitura direta dividida em trechos alinhados a keyframes
+     e processada em paralelo (Components/ShardedDetector.py)
 
 ALTERAÇÕES:
   - Componente criado do zero para esta funcionalidade
@@ -32,27 +42,62 @@ import cv2
 import os
 import numpy as np
 
+from Components.VisualFeatureIndex import face_scale
+
+
+CASCADE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(__file__)),
+    "haarcascade_frontalface_default.xml"
+)
+
+# Fallback por movimento: terços subamostrados (1 pixel a cada 4) antes da
+# diferença. Subamostrar preserva a média da diferença; reduzir com média
+# (INTER_AREA) suaviza textura e baixaria a intensidade frente ao limiar
+MOTION_STEP = 4
+MOTION_THRESHOLD = 25
+MOTION_RATIO = 1.3
+
 
 def detect_meme_corners(
     video_path: str,
     sample_interval: float = 0.5,
     show_duration: float = 2.5,
     face_region_ratio: float = 0.25,
-    min_face_size: int = 40
+    min_face_size: int = 40,
+    index=None,
+    index_dir: str = None,
+    workers: int = 1
 ) -> list:
     """
     Retorna lista de eventos: [{"start": t, "end": t+duration, "region": "left"|"right"}, ...]
     show_duration: quanto tempo manter o pan no meme (segundos)
+    index: VisualFeatureIndex já aberto
+    index_dir: diretório do índice do vídeo (open_or_build); sem index
+               nem index_dir, leitura direta
+    workers: leitura direta em paralelo por trechos (0 = um por core);
+             resultado idêntico ao sequencial (test_sharded_detector.py)
     """
-    cascade_path = os.path.join(
-        os.path.dirname(os.path.dirname(__file__)),
-        "haarcascade_frontalface_default.xml"
-    )
-
-    if not os.path.exists(cascade_path):
+    if index is not None or index_dir is not None:
+        from Components.VisualFeatureIndex import VisualFeatureIndex
+        if (face_region_ratio == VisualFeatureIndex.FACE_REGION_RATIO
+                and min_face_size == VisualFeatureIndex.MIN_FACE_SIZE):
+            if index is None:
+                index = VisualFeatureIndex.open_or_build(video_path, index_dir)
+            if not index.meta.get('faces'):
+                return index.motion_region_events(show_duration, sample_interval)
+            return index.corner_events(show_duration, sample_interval)
+
+    if not os.path.exists(CASCADE_PATH):
         return _detect_by_motion_regions(video_path, sample_interval, show_duration)
 
-    face_cascade = cv2.CascadeClassifier(cascade_path)
+    if workers != 1:
+        from Components.ShardedDetector import detect_meme_corners_sharded
+        return detect_meme_corners_sharded(
+            video_path, sample_interval, show_duration,
+            face_region_ratio, min_face_size, workers=workers
+        )
+
+    face_cascade = cv2.CascadeClassifier(CASCADE_PATH)
     cap = cv2.VideoCapture(video_path)
 
     if not cap.isOpened():
@@ -66,62 +111,90 @@ def detect_meme_corners(
         cap.release()
         return []
 
-    events = []
     sample_every = max(1, int(fps * sample_interval))
-    frame_idx = 0
+    events = _scan_corner_faces(
+        cap, face_cascade, 0, None, sample_every, fps, duration,
+        show_duration, face_region_ratio, min_face_size
+    )
 
-    while True:
-        ret, frame = cap.read()
-        if not ret:
+    cap.release()
+    events = _merge_overlapping_events(events)
+    return events
+
+
+def _sampled_frames(cap, first_frame, last_frame, sample_every):
+    """
+    Frames amostrados (frame_idx % sample_every == 0) em [first, last);
+    last None = até o fim. cap já deve estar em first_frame (trechos:
+    ShardedDetector._open_at). Os demais só passam por grab(): sem
+    retrieve/conversão de cor.
+    """
+    frame_idx = first_frame
+    while last_frame is None or frame_idx < last_frame:
+        if not cap.grab():
             break
+        if frame_idx % sample_every == 0:
+            ret, frame = cap.retrieve()
+            if not ret:
+                break
+            yield frame_idx, frame
+        frame_idx += 1
 
-        if frame_idx % sample_every != 0:
-            frame_idx += 1
-            continue
 
-        t = frame_idx / fps
-        h, w = frame.shape[:2]
+def _corner_faces(frame, face_cascade, face_region_ratio, min_face_size):
+    """
+    Há face em cada canto? Haar só nas ROIs dos cantos, reduzidas pela
+    face_scale(min_face_size): a menor face ainda ocupa a janela do Haar.
+    """
+    h, w = frame.shape[:2]
+    scale = face_scale(min_face_size)
+    min_size = max(1, int(round(min_face_size * scale)))
+
+    # Regiões: esquerda 0-25%, direita 75-100%
+    regions = (
+        ("left", frame[:, :int(w * face_region_ratio)]),
+        ("right", frame[:, int(w * (1 - face_region_ratio)):])
+    )
 
-        # Regiões: esquerda 0-25%, direita 75-100%
-        left_x1, left_x2 = 0, int(w * face_region_ratio)
-        right_x1, right_x2 = int(w * (1 - face_region_ratio)), w
+    hits = {}
+    for region, roi in regions:
+        if scale < 1.0:
+            roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+        gray = cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+        faces = face_cascade.detectMultiScale(gray, 1.1, 5, minSize=(min_size, min_size))
+        hits[region] = len(faces) > 0
+    return hits
 
-        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
-        left_gray = gray[:, left_x1:left_x2]
-        right_gray = gray[:, right_x1:right_x2]
 
-        left_faces = face_cascade.detectMultiScale(
-            left_gray, 1.1, 5, minSize=(min_face_size, min_face_size)
-        )
-        right_faces = face_cascade.detectMultiScale(
-            right_gray, 1.1, 5, minSize=(min_face_size, min_face_size)
-        )
+def _scan_corner_faces(cap, face_cascade, first_frame, last_frame, sample_every, fps,
+                       duration, show_duration, face_region_ratio, min_face_size):
+    """Eventos (ainda não mesclados) dos frames amostrados em [first, last)."""
+    events = []
 
-        if len(left_faces) > 0:
-            events.append({
-                "start": max(0, t - 0.2),
-                "end": min(duration, t + show_duration),
-                "region": "left"
-            })
-        if len(right_faces) > 0:
-            events.append({
-                "start": max(0, t - 0.2),
-                "end": min(duration, t + show_duration),
-                "region": "right"
-            })
+    for frame_idx, frame in _sampled_frames(cap, first_frame, last_frame, sample_every):
+        t = frame_idx / fps
+        hits = _corner_faces(frame, face_cascade, face_region_ratio, min_face_size)
 
-        frame_idx += 1
+        for region in ("left", "right"):
+            if hits[region]:
+                events.append({
+                    "start": max(0, t - 0.2),
+                    "end": min(duration, t + show_duration),
+                    "region": region
+                })
 
-    cap.release()
-    events = _merge_overlapping_events(events)
     return events
 
 
-def _detect_by_motion_regions(video_path, sample_interval, show_duration):
+def _detect_by_motion_regions(video_path, sample_interval, show_duration, index=None):
     """
     Fallback: quando não há haarcascade. Detecta movimento forte em um
     terço da tela (esquerda ou direita) comparado ao outro.
+    Com index (VisualFeatureIndex), só consulta as energias por terço.
     """
+    if index is not None:
+        return index.motion_region_events(show_duration, sample_interval)
+
     cap = cv2.VideoCapture(video_path)
     if not cap.isOpened():
         return []
@@ -131,43 +204,37 @@ def _detect_by_motion_regions(video_path, sample_interval, show_duration):
     prev_left = None
     prev_right = None
     events = []
-    frame_idx = 0
-
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-
-        if frame_idx % sample_every == 0:
-            t = frame_idx / fps
-            h, w = frame.shape[:2]
-            left_roi = frame[:, :w//3]
-            right_roi = frame[:, 2*w//3:]
 
-            left_gray = cv2.cvtColor(left_roi, cv2.COLOR_BGR2GRAY)
-            right_gray = cv2.cvtColor(right_roi, cv2.COLOR_BGR2GRAY)
+    for frame_idx, frame in _sampled_frames(cap, 0, None, sample_every):
+        t = frame_idx / fps
+        h, w = frame.shape[:2]
 
-            if prev_left is not None:
-                left_diff = cv2.absdiff(left_gray, prev_left)
-                right_diff = cv2.absdiff(right_gray, prev_right)
-                left_int = left_diff.mean()
-                right_int = right_diff.mean()
+        # Terços subamostrados: mesma média de diferença, 1/16 dos pixels
+        left_gray = _small_gray(frame[:, :w//3])
+        right_gray = _small_gray(frame[:, 2*w//3:])
 
-                threshold = 25
-                if left_int > threshold and left_int > right_int * 1.3:
-                    events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "left"})
-                elif right_int > threshold and right_int > left_int * 1.3:
-                    events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "right"})
+        if prev_left is not None:
+            left_int = cv2.absdiff(left_gray, prev_left).mean()
+            right_int = cv2.absdiff(right_gray, prev_right).mean()
 
-            prev_left = left_gray
-            prev_right = right_gray
+            if left_int > MOTION_THRESHOLD and left_int > right_int * MOTION_RATIO:
+                events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "left"})
+            elif right_int > MOTION_THRESHOLD and right_int > left_int * MOTION_RATIO:
+                events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "right"})
 
-        frame_idx += 1
+        prev_left = left_gray
+        prev_right = right_gray
 
     cap.release()
     return _merge_overlapping_events(events)
 
 
+def _small_gray(roi):
+    """ROI em cinza, 1 pixel a cada MOTION_STEP (sem suavizar)."""
+    roi = np.ascontiguousarray(roi[::MOTION_STEP, ::MOTION_STEP])
+    return cv2.cvtColor(roi, cv2.COLOR_BGR2GRAY)
+
+
 def _merge_overlapping_events(events):
     """Junta eventos do mesmo lado que se sobrepõem ou estão próximos."""
     if not events:
@@ -0,0 +1,368 @@
+# Components/MemeIndex.py
+"""
+=============================================================================
+ÍNDICE COMPILADO DE MEMES
+=============================================================================
+
+✨ FEATURES:
+- Compilado UMA vez a partir de:
+    MEMES_11CLOSED, COMENTARIOS_11CLOSED (LanguageTasks),
+    profiles/lives_do_11closed/custom_memes.txt e
+    meme_templates/meme_config.json
+- Acentos/pontuação normalizados uma vez (fold)
+- Cada meme vira um conjunto de IDs de tokens
+- Autômato Aho-Corasick sobre tokens: frases exatas em uma passada
+- Sobreposição parcial (tolerância a erros do Whisper) por contadores
+  vetorizados: custo proporcional aos tokens da transcrição, não a
+  memes × segmentos
+
+⚙️ USO:
+    index = get_meme_index()
+
+    index.match_text("tres dias depois")         # [(entry, overlap)]
+    hits = index.scan(transcription['segments'])  # live inteira
+    # (FeatureTimeline.build faz isso para a coluna 'memes' do CandidateScorer)
+    # [{'meme', 'source', 'timestamp', 'overlap', 'exact'}]
+
+=============================================================================
+"""
+
+import re
+import json
+import threading
+import unicodedata
+from pathlib import Path
+
+import numpy as np
+
+
+CUSTOM_MEMES_FILE = "profiles/lives_do_11closed/custom_memes.txt"
+MEME_CONFIG_FILE = "meme_templates/meme_config.json"
+
+DEFAULT_MIN_OVERLAP = 0.7   # Mesmo limiar do _check_meme_match antigo
+
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+
+
+def fold(text):
+    """Minúsculas, sem acentos e sem pontuação."""
+    text = unicodedata.normalize('NFKD', text.lower())
+    return text.encode('ascii', 'ignore').decode('ascii')
+
+
+def tokenize(text):
+    """Tokens normalizados do texto."""
+    return _TOKEN_RE.findall(fold(text))
+
+
+class MemeIndex:
+    """Memes compilados para busca em transcrições."""
+
+    def __init__(self, entries):
+        """
+        Compila entradas.
+
+        Args:
+            entries: Lista de {'meme', 'phrase', 'source', 'min_match'}
+                     (source: meme, comentario, custom ou template)
+        """
+        self.vocab = {}
+        self.entries = []
+        self.sequences = []
+        seen = set()
+
+        for entry in entries:
+            tokens = tokenize(entry['phrase'])
+            key = (entry['source'], entry['meme'], tuple(tokens))
+            if not tokens or key in seen:
+                continue
+            seen.add(key)
+
+            ids = tuple(self.vocab.setdefault(t, len(self.vocab)) for t in tokens)
+            self.entries.append(dict(entry, tokens=frozenset(ids)))
+            self.sequences.append(ids)
+
+        self._build_postings()
+        self._build_automaton()
+
+    # -------------------------------------------------------------------------
+    # COMPILAÇÃO
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def from_sources(cls, memes=(), comments=(), custom_file=CUSTOM_MEMES_FILE, config_path=MEME_CONFIG_FILE):
+        """Monta o índice a partir das listas e arquivos do canal."""
+        entries = []
+        for meme in memes:
+            entries.append({'meme': meme, 'phrase': meme, 'source': 'meme', 'min_match': DEFAULT_MIN_OVERLAP})
+        for comment in comments:
+            entries.append({'meme': comment, 'phrase': comment, 'source': 'comentario', 'min_match': DEFAULT_MIN_OVERLAP})
+
+        custom_file = Path(custom_file) if custom_file else None
+        if custom_file and custom_file.exists():
+            with open(custom_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    line = line.strip()
+                    if line:
+                        entries.append({'meme': line, 'phrase': line, 'source': 'custom', 'min_match': DEFAULT_MIN_OVERLAP})
+
+        config_path = Path(config_path) if config_path else None
+        if config_path and config_path.exists():
+            with open(config_path, 'r', encoding='utf-8') as f:
+                config = json.load(f)
+            for name, data in config.items():
+                if isinstance(data, dict) and data.get('description'):
+                    entries.append({
+                        'meme': name,
+                        'phrase': data['description'],
+                        'source': 'template',
+                        'min_match': float(data.get('min_match', DEFAULT_MIN_OVERLAP))
+                    })
+
+        return cls(entries)
+
+    def _build_postings(self):
+        """Token -> entradas que o contêm (CSR), e tamanho de cada entrada."""
+        n_vocab = len(self.vocab)
+        postings = [[] for _ in range(n_vocab)]
+        for i, entry in enumerate(self.entries):
+            for token in entry['tokens']:
+                postings[token].append(i)
+
+        counts = np.array([len(p) for p in postings], dtype=np.int64)
+        self._post_ptr = np.concatenate([[0], np.cumsum(counts)]).astype(np.int64)
+        self._post_entries = np.array([i for p in postings for i in p], dtype=np.int64)
+        self._entry_sizes = np.array([len(e['tokens']) for e in self.entries], dtype=np.float64)
+        self._min_match = np.array([e['min_match'] for e in self.entries], dtype=np.float64)
+
+    def _build_automaton(self):
+        """Aho-Corasick sobre as sequências de IDs de tokens."""
+        goto = [{}]
+        output = [[]]
+
+        for i, sequence in enumerate(self.sequences):
+            state = 0
+            for token in sequence:
+                if token not in goto[state]:
+                    goto.append({})
+                    output.append([])
+                    goto[state][token] = len(goto) - 1
+                state = goto[state][token]
+            output[state].append(i)
+
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        head = 0
+        while head < len(queue):
+            state = queue[head]
+            head += 1
+            for token, child in goto[state].items():
+                queue.append(child)
+                f = fail[state]
+                while f and token not in goto[f]:
+                    f = fail[f]
+                fail[child] = goto[f].get(token, 0)
+                output[child] = output[child] + output[fail[child]]
+
+        self._goto = goto
+        self._fail = fail
+        self._output = output
+
+    # -------------------------------------------------------------------------
+    # BUSCA
+    # -------------------------------------------------------------------------
+
+    def token_ids(self, text):
+        """IDs dos tokens do texto (-1 = fora do vocabulário)."""
+        vocab = self.vocab
+        return [vocab.get(t, -1) for t in tokenize(text)]
+
+    def find_exact(self, ids):
+        """
+        Frases exatas em uma sequência de IDs (uma passada).
+
+        Returns:
+            Lista de (entrada, posição do primeiro token)
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        hits = []
+        state = 0
+        for pos, token in enumerate(ids):
+            while state and token not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(token, 0)
+            for i in output[state]:
+                hits.append((i, pos - len(self.sequences[i]) + 1))
+        return hits
+
+    def overlaps(self, ids, units, min_overlap=None):
+        """
+        Fração das palavras de cada entrada presente em cada unidade.
+
+        Args:
+            ids: IDs de tokens (array)
+            units: Unidade (segmento/janela) de cada token, não decrescente
+            min_overlap: Limiar fixo (None = min_match de cada entrada)
+
+        Returns:
+            (unidades, entradas, overlap) das combinações acima do limiar
+        """
+        ids = np.asarray(ids, dtype=np.int64)
+        units = np.asarray(units, dtype=np.int64)
+        known = ids >= 0
+        if not known.any() or len(self.entries) == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        # Pares (unidade, token) distintos
+        n_vocab = len(self.vocab)
+        pairs = np.unique(units[known] * n_vocab + ids[known])
+        pair_units = pairs // n_vocab
+        pair_tokens = pairs % n_vocab
+
+        # Expande cada token para as entradas que o contêm
+        starts = self._post_ptr[pair_tokens]
+        counts = self._post_ptr[pair_tokens + 1] - starts
+        total = int(counts.sum())
+        if total == 0:
+            empty = np.zeros(0, dtype=np.int64)
+            return empty, empty, np.zeros(0)
+
+        offsets = np.arange(total) - np.repeat(np.cumsum(counts) - counts, counts)
+        entries = self._post_entries[np.repeat(starts, counts) + offsets]
+        hit_units = np.repeat(pair_units, counts)
+
+        # Contador por (unidade, entrada)
+        n_entries = len(self.entries)
+        keys, matched = np.unique(hit_units * n_entries + entries, return_counts=True)
+        hit_units = keys // n_entries
+        entries = keys % n_entries
+        overlap = matched / self._entry_sizes[entries]
+
+        threshold = self._min_match[entries] if min_overlap is None else min_overlap
+        keep = overlap >= threshold - 1e-9
+
+        return hit_units[keep], entries[keep], overlap[keep]
+
+    def match_text(self, text, min_overlap=None, sources=None):
+        """
+        Memes presentes em um texto.
+
+        Args:
+            text: Texto livre (reason do LLM, trecho da transcrição...)
+            min_overlap: Limiar fixo (None = min_match de cada entrada)
+            sources: Filtrar por origem (ex: ('meme', 'custom'))
+
+        Returns:
+            Lista de (entrada, overlap), maior overlap primeiro
+        """
+        ids = self.token_ids(text)
+        _, entries, overlap = self.overlaps(ids, np.zeros(len(ids), dtype=np.int64), min_overlap)
+
+        found = [
+            (self.entries[e], float(o))
+            for e, o in zip(entries, overlap)
+            if sources is None or self.entries[e]['source'] in sources
+        ]
+        return sorted(found, key=lambda x: -x[1])
+
+    def contains_phrase(self, text, sources=None):
+        """Entradas cuja frase aparece inteira (em ordem) no texto."""
+        found = []
+        for i, _ in self.find_exact(self.token_ids(text)):
+            entry = self.entries[i]
+            if (sources is None or entry['source'] in sources) and entry not in found:
+                found.append(entry)
+        return found
+
+    def scan(self, segments, min_overlap=None, window_sec=None, sources=None):
+        """
+        Varre a transcrição inteira em uma passada.
+
+        Args:
+            segments: Segmentos {'start', 'text'} (ordenados por tempo)
+            min_overlap: Limiar fixo (None = min_match de cada entrada)
+            window_sec: Agrupar segmentos em janelas de N segundos
+                        (None = cada segmento é uma unidade)
+            sources: Filtrar por origem
+
+        Returns:
+            Lista de {'meme', 'source', 'timestamp', 'overlap', 'exact'}
+            ordenada por timestamp
+        """
+        ids = []
+        token_segment = []
+        starts = []
+        for i, segment in enumerate(segments):
+            segment_ids = self.token_ids(segment.get('text', ''))
+            ids.extend(segment_ids)
+            token_segment.extend([i] * len(segment_ids))
+            starts.append(float(segment.get('start', 0.0)))
+
+        if not ids:
+            return []
+
+        starts = np.asarray(starts)
+        token_segment = np.asarray(token_segment, dtype=np.int64)
+
+        if window_sec:
+            segment_units = np.floor(starts / window_sec).astype(np.int64)
+        else:
+            segment_units = np.arange(len(segments), dtype=np.int64)
+        token_units = segment_units[token_segment]
+
+        # Início de cada unidade = primeiro segmento dela
+        unit_start = {}
+        for unit, start in zip(segment_units.tolist(), starts.tolist()):
+            unit_start.setdefault(unit, start)
+
+        hits = {}
+        units, entries, overlap = self.overlaps(ids, token_units, min_overlap)
+        for unit, e, o in zip(units.tolist(), entries.tolist(), overlap.tolist()):
+            hits[(e, unit)] = {'entry': e, 'timestamp': unit_start[unit], 'overlap': o, 'exact': False}
+
+        # Frases exatas (inclusive atravessando segmentos)
+        for e, position in self.find_exact(ids):
+            segment = token_segment[position]
+            key = (e, int(segment_units[segment]))
+            if key in hits:
+                hits[key]['exact'] = True
+            else:
+                hits[key] = {'entry': e, 'timestamp': float(starts[segment]), 'overlap': 1.0, 'exact': True}
+
+        result = []
+        for hit in hits.values():
+            entry = self.entries[hit['entry']]
+            if sources is not None and entry['source'] not in sources:
+                continue
+            result.append({
+                'meme': entry['meme'],
+                'source': entry['source'],
+                'timestamp': hit['timestamp'],
+                'overlap': hit['overlap'],
+                'exact': hit['exact']
+            })
+
+        return sorted(result, key=lambda h: (h['timestamp'], -h['overlap']))
+
+
+# Índice do processo (recompilado quando um meme é adicionado)
+_meme_index = None
+_meme_index_lock = threading.Lock()
+
+
+def get_meme_index():
+    """Índice com todas as fontes do canal (compilado na primeira chamada)."""
+    global _meme_index
+    with _meme_index_lock:
+        if _meme_index is None:
+            from Components.LanguageTasks import MEMES_11CLOSED, COMENTARIOS_11CLOSED
+            _meme_index = MemeIndex.from_sources(MEMES_11CLOSED, COMENTARIOS_11CLOSED)
+        return _meme_index
+
+
+def invalidate_meme_index():
+    """Força recompilação (ex: depois de add_custom_meme)."""
+    global _meme_index
+    with _meme_index_lock:
+        _meme_index = None
@@ -22,7 +22,9 @@ PONTUADOR DE MEMES PROFISSIONAL
 import json
 from pathlib import Path
 from collections import defaultdict
-import re
+
+from Components.MemeIndex import MemeIndex, MEME_CONFIG_FILE, get_meme_index
+from Components.TranscriptIndex import TranscriptIndex
 
 
 class MemeScorer:
@@ -37,11 +39,11 @@ class MemeScorer:
         """
         self.meme_config_path = Path(meme_config_path)
         self.memes = self._load_memes()
-        self.meme_phrases = self._extract_phrases()
+        self.index = self._load_index()
         
         print(f"🎭 MemeScorer inicializado")
         print(f"   {len(self.memes)} memes carregados")
-        print(f"   {len(self.meme_phrases)} frases únicas")
+        print(f"   {len(self.index.entries)} frases no índice")
     
     def _load_memes(self):
         """Carrega configuração dos memes."""
@@ -52,28 +54,11 @@ class MemeScorer:
         with open(self.meme_config_path, 'r', encoding='utf-8') as f:
             return json.load(f)
     
-    def _extract_phrases(self):
-        """Extrai frases dos memes."""
-        phrases = set()
-        
-        for meme_name, meme_data in self.memes.items():
-            description = meme_data.get('description', '').lower()
-            
-            if description:
-                # Limpar e normalizar
-                cleaned = re.sub(r'[^\w\s]', ' ', description)
-                cleaned = ' '.join(cleaned.split())
-                
-                if len(cleaned) > 3:  # Ignorar muito curtos
-                    phrases.add(cleaned)
-                    
-                    # Adicionar variações sem acentos
-                    import unicodedata
-                    normalized = unicodedata.normalize('NFKD', cleaned)
-                    normalized = normalized.encode('ASCII', 'ignore').decode('utf-8')
-                    phrases.add(normalized)
-        
-        return phrases
+    def _load_index(self):
+        """Índice compilado (compartilhado quando o config é o padrão)."""
+        if self.meme_config_path == Path(MEME_CONFIG_FILE):
+            return get_meme_index()
+        return MemeIndex.from_sources(custom_file=None, config_path=self.meme_config_path)
     
     def score_moment(self, moment, transcription_segments, window_seconds=30):
         """
@@ -130,45 +115,26 @@ class MemeScorer:
         
         return meme_score
     
+    def _segment_index(self, segments):
+        """Índice temporal dos segmentos (reaproveitado entre momentos)."""
+        if isinstance(segments, TranscriptIndex):
+            return segments
+        if getattr(self, '_indexed_segments', None) is not segments:
+            self._indexed_segments = segments
+            self._transcript_index = TranscriptIndex.build(segments)
+        return self._transcript_index
+    
     def _get_text_around(self, segments, timestamp, window):
         """Obtém texto ao redor de um timestamp."""
-        text_parts = []
-        
-        start_time = timestamp - window
-        end_time = timestamp + window
-        
-        for segment in segments:
-            if isinstance(segment, dict):
-                seg_start = segment.get('start', 0)
-                seg_text = segment.get('text', '')
-                
-                if start_time <= seg_start <= end_time:
-                    text_parts.append(seg_text)
-        
-        return ' '.join(text_parts).lower()
+        index = self._segment_index(segments)
+        return index.text_between(timestamp - window, timestamp + window).lower()
     
     def _detect_memes_in_text(self, text):
-        """Detecta quais memes estão presentes no texto."""
-        found_memes = []
-        
-        # Normalizar texto
-        import unicodedata
-        normalized_text = unicodedata.normalize('NFKD', text)
-        normalized_text = normalized_text.encode('ASCII', 'ignore').decode('utf-8')
-        
-        # Buscar cada frase de meme
-        for phrase in self.meme_phrases:
-            if phrase in text or phrase in normalized_text:
-                # Encontrar qual meme é
-                for meme_name, meme_data in self.memes.items():
-                    description = meme_data.get('description', '').lower()
-                    
-                    if phrase in description:
-                        if meme_name not in found_memes:
-                            found_memes.append(meme_name)
-                        break
-        
-        return found_memes
+        """Detecta quais memes (templates) estão presentes no texto."""
+        return [
+            entry['meme']
+            for entry in self.index.contains_phrase(text, sources=('template',))
+        ]
     
     def _detect_laugh_concentration(self, segments, timestamp, window):
         """
@@ -177,29 +143,8 @@ class MemeScorer:
         Returns:
             Número de risadas na janela
         """
-        laugh_count = 0
-        
-        start_time = timestamp - window
-        end_time = timestamp + window
-        
-        # Padrões de riso
-        laugh_patterns = [
-            '[riso]', '[risada]', '[risos]',
-            'hahaha', 'kkkk', 'rsrs', 'kkk',
-            '[laughing]', '[laughter]'
-        ]
-        
-        for segment in segments:
-            if isinstance(segment, dict):
-                seg_start = segment.get('start', 0)
-                seg_text = segment.get('text', '').lower()
-                
-                if start_time <= seg_start <= end_time:
-                    # Contar risadas
-                    for pattern in laugh_patterns:
-                        laugh_count += seg_text.count(pattern)
-        
-        return laugh_count
+        index = self._segment_index(segments)
+        return index.laugh_count(timestamp - window, timestamp + window)
     
     def get_statistics(self, moments_with_scores):
         """Retorna estatísticas dos memes detectados."""
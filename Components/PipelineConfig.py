@@ -21,6 +21,10 @@ def get_pipeline_config(mode="INSANO"):
     
     Returns:
         dict com MAX_SHORTS, MIN_RETENTION, MIN_VIRAL
+
+    Usados pelo Clipper (CandidateScorer):
+        MIN_RETENTION  fração dos segundos do trecho com fala
+        MIN_VIRAL      score do trecho relativo ao melhor trecho da live
     """
     configs = {
         "TEST": {
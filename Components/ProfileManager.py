@@ -55,7 +55,8 @@ class ProfileManagerV3:
                 'min_score': 3.5,
                 'min_audio_score': 1.0,
                 'min_context_score': 1.0,
-                'min_meme_score': 1.0
+                'min_meme_score': 1.0,
+                'min_gap': 10.0                 # Segundos entre clips (--selection optimal)
             },
             
             # Configurações de vídeo
@@ -67,6 +68,12 @@ class ProfileManagerV3:
                 'camera_movement_enabled': True
             },
             
+            # Transcrição (backend: whisper, faster_whisper)
+            'asr': {
+                'backend': 'whisper',
+                'model': 'base'
+            },
+            
             # Configurações de legendas
             'subtitles': {
                 'enabled': True,
@@ -1,3 +1,29 @@
+import math
+
+from Components.AttentionScorer import EARLY_WINDOW
+
+
+def _segment_points(ev, attention):
+    """
+    Trecho RLE de câmera {"time", "frame", "fps", "frames"} → pontos com
+    peso = frames, divididos na janela inicial (mesmo score de um ponto por
+    frame: o frame i conta como inicial se i / fps < EARLY_WINDOW).
+    """
+    start, frames = ev["time"], ev["frames"]
+    if "fps" not in ev:
+        return [{"time": start, "attention": attention, "weight": frames}]
+
+    early = math.ceil(EARLY_WINDOW * ev["fps"] - 1e-9) - ev["frame"]
+    early = min(frames, max(0, early))
+
+    points = []
+    if early:
+        points.append({"time": start, "attention": attention, "weight": early})
+    if frames - early:
+        points.append({"time": max(start, EARLY_WINDOW), "attention": attention, "weight": frames - early})
+    return points
+
+
 def build_retention_curve(
     duration: float,
     audio_peak_time,
@@ -20,6 +46,9 @@ def build_retention_curve(
         })
 
     for ev in camera_events:
+        if "frames" in ev:
+            curve.extend(_segment_points(ev, min(1.0, base_attention + 0.15)))
+            continue
         curve.append({
             "time": ev["time"],
             "attention": min(1.0, base_attention + 0.15)
@@ -10,15 +10,25 @@ POWER_WORDS = [
 ]
 
 
-def score_segment(text: str):
-    text_l = text.lower()
+def score_segment(text: str, keyword_index=None, start=None, end=None):
+    """
+    Pontua um trecho de fala.
+
+    Com keyword_index (KeywordIndex da transcrição) e start/end, as
+    palavras fortes vêm do índice em vez de varrer o texto.
+    """
     score = 0
     reasons = []
 
-    for w in POWER_WORDS:
-        if w in text_l:
-            score += 12
-            reasons.append(f"palavra forte: {w}")
+    if keyword_index is not None and start is not None and end is not None:
+        power_words = keyword_index.matches_between(POWER_WORDS, start, end)
+    else:
+        text_l = text.lower()
+        power_words = [w for w in POWER_WORDS if w in text_l]
+
+    for w in power_words:
+        score += 12
+        reasons.append(f"palavra forte: {w}")
 
     if "?" in text:
         score += 10
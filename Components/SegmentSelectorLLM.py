@@ -176,9 +176,10 @@ def _fallback_heuristic(transcriptions, max_seg, min_dur, max_dur):
     - Quando GPT falha/crasheia
     
     COMO FUNCIONA:
-    - Usa AISegmentSelector (baseado em palavras-chave)
-    - Busca por densidade de palavras interessantes
-    - Não usa IA, apenas regex e contagem
+    - Usa AISegmentSelector com engine="timeline" (CandidateScorer):
+      fala, keywords, risadas e memes por segundo, todas as durações
+      entre min_dur e max_dur pontuadas de uma vez
+    - Não usa IA, apenas contagens vetorizadas
     
     ⚠️ PROBLEMA: Muito menos preciso que GPT
     ⚠️ PROBLEMA: Não detecta contexto ou humor
@@ -195,7 +196,14 @@ def _fallback_heuristic(transcriptions, max_seg, min_dur, max_dur):
         
         # NOTA: mode="RELAXED" aceita mais clips
         # Outros modos: "STRICT", "BALANCED"
-        raw = select_best_segments(transcriptions, mode="RELAXED")
+        raw = select_best_segments(
+            transcriptions,
+            mode="RELAXED",
+            engine="timeline",
+            min_duration=min_dur,
+            max_duration=max_dur,
+            max_clips=max_seg * 2
+        )
         
         # Filtrar por duração e limitar quantidade
         filtered = [
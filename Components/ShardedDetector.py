@@ -0,0 +1,371 @@
+# Components/ShardedDetector.py
+"""
+=============================================================================
+DETECÇÃO DE FACES EM PARALELO POR TRECHOS DE TEMPO
+=============================================================================
+
+✨ FEATURES:
+- Vídeo dividido em trechos de frames alinhados a keyframes
+  (KeyframeIndex, tempos relativos ao start_time do stream): o seek de
+  cada worker cai num keyframe e é conferido em CAP_PROP_POS_FRAMES
+  (_open_at); seek inexato = reabre e avança por grab(). Assim os
+  frames decodificados são os mesmos da leitura sequencial
+- Pool de processos; cada worker carrega o detector UMA vez no
+  initializer (haarcascade ou DNN res10 do Speaker.py)
+- Mais trechos que workers (SHARDS_PER_WORKER) para balancear a carga
+- Resultado determinístico, idêntico ao serial:
+    cantos: eventos brutos concatenados na ordem dos trechos e mesclados
+            UMA vez com _merge_overlapping_events (a mesclagem enxerga a
+            lista inteira, inclusive através das fronteiras)
+    orador: DNN + VAD + desenho por trecho (cada frame decodificado uma
+            vez), caixas na ordem original e trechos anotados juntados
+            com ffmpeg concat (-c copy)
+- Speedup quase linear até o número de cores (trechos independentes)
+
+⚙️ USO:
+    events = detect_meme_corners_sharded('clip.mp4', workers=4)
+    boxes = detect_speakers_sharded('clip.mp4', 'out.mp4', 'temp_audio.wav', prototxt, model, workers=4)
+
+    Conferência serial x paralelo num vídeo real:
+    python test_sharded_detector.py clip.mp4 --workers 4
+
+=============================================================================
+"""
+
+import contextlib
+import os
+import shutil
+import subprocess
+import tempfile
+import time
+import wave
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+from Components.ClipWorkers import resolve_workers
+
+
+# Trechos por worker (trechos com muitas faces demoram mais)
+SHARDS_PER_WORKER = 2
+
+# Trecho menor que isso não compensa o seek + abertura do vídeo
+MIN_SHARD_SEC = 5.0
+
+# Memória estimada por worker (decode 1080p + detector)
+MEM_PER_WORKER_MB = 400
+
+# Detector do processo atual (definido pelo initializer do pool)
+_detector = None
+
+
+def _load_detector(kind, config):
+    """
+    Carrega o detector.
+
+    Args:
+        kind: 'haar' ou 'dnn'
+        config: {'cascade_path'} ou {'prototxt_path', 'model_path'}
+    """
+    global _detector
+    if kind == 'haar':
+        _detector = cv2.CascadeClassifier(config['cascade_path'])
+    else:
+        _detector = cv2.dnn.readNetFromCaffe(config['prototxt_path'], config['model_path'])
+
+
+def _init_detector_worker(kind, config):
+    """Initializer do pool: detector uma vez por worker, OpenCV com 1 thread."""
+    cv2.setNumThreads(1)
+    _load_detector(kind, config)
+
+
+def _video_info(video_path):
+    """(fps, frame_count) do vídeo; (0, 0) se não abrir."""
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        return 0.0, 0
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30
+    frame_count = int(cap.get(cv2.CAP_PROP_FRAME_COUNT))
+    cap.release()
+    return fps, frame_count
+
+
+def _open_at(video_path, first_frame):
+    """
+    VideoCapture posicionado em first_frame. O seek por frame é conferido
+    em CAP_PROP_POS_FRAMES; se não caiu exatamente no frame, reabre e
+    avança por grab() (lento, mas mantém a numeração da leitura sequencial).
+    """
+    cap = cv2.VideoCapture(video_path)
+    if first_frame <= 0:
+        return cap
+
+    cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+    if int(round(cap.get(cv2.CAP_PROP_POS_FRAMES))) == first_frame:
+        return cap
+
+    print(f"   ⚠️  Seek inexato no frame {first_frame}, avançando do início")
+    cap.release()
+    cap = cv2.VideoCapture(video_path)
+    for _ in range(first_frame):
+        if not cap.grab():
+            break
+    return cap
+
+
+def plan_shards(frame_count, fps, n_shards, keyframes=None, min_shard=MIN_SHARD_SEC):
+    """
+    Divide [0, frame_count) em trechos começando em keyframes.
+
+    Args:
+        frame_count: Frames do vídeo
+        fps: Frames por segundo
+        n_shards: Trechos desejados
+        keyframes: KeyframeIndex (None = cortes uniformes)
+        min_shard: Duração mínima de um trecho (segundos)
+
+    Returns:
+        Lista de (primeiro_frame, último_frame); o último trecho termina
+        em None (lê até o fim, como a leitura sequencial)
+    """
+    duration = frame_count / fps if fps else 0.0
+    n_shards = max(1, min(int(n_shards), int(duration // min_shard) if min_shard > 0 else n_shards))
+
+    starts = [0]
+    for k in range(1, n_shards):
+        t = duration * k / n_shards
+        if keyframes is not None and len(keyframes):
+            t = keyframes.at_or_before(t)
+            if t is None:
+                continue
+        frame = int(round(t * fps))
+        if frame > starts[-1]:
+            starts.append(frame)
+
+    return [(first, last) for first, last in zip(starts, starts[1:] + [None])]
+
+
+def _run_shards(task, shards, args, kind, config, workers):
+    """Executa task(first, last, *args) por trecho; resultados na ordem dos trechos."""
+    if workers <= 1 or len(shards) == 1:
+        _load_detector(kind, config)
+        return [task(first, last, *args) for first, last in shards]
+
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        initializer=_init_detector_worker,
+        initargs=(kind, config)
+    ) as pool:
+        futures = [pool.submit(task, first, last, *args) for first, last in shards]
+        return [future.result() for future in futures]
+
+
+def _resolve(video_path, workers, keyframes):
+    """(fps, frame_count, workers, trechos) ou None se o vídeo não abre."""
+    fps, frame_count = _video_info(video_path)
+    if frame_count <= 0:
+        return None
+
+    workers = resolve_workers(workers, mem_per_worker_mb=MEM_PER_WORKER_MB)
+
+    if keyframes is None and workers > 1:
+        from Components.KeyframeIndex import KeyframeIndex
+        keyframes = KeyframeIndex.build(video_path)
+
+    shards = plan_shards(frame_count, fps, workers * SHARDS_PER_WORKER if workers > 1 else 1, keyframes)
+    return fps, frame_count, min(workers, len(shards)), shards
+
+
+# =============================================================================
+# CANTOS (HAARCASCADE)
+# =============================================================================
+
+def _corner_shard(first, last, video_path, sample_every, fps, duration,
+                  show_duration, face_region_ratio, min_face_size):
+    """Eventos brutos (não mesclados) de um trecho."""
+    from Components.MemeCornerDetector import _scan_corner_faces
+
+    cap = _open_at(video_path, first)
+    try:
+        return _scan_corner_faces(
+            cap, _detector, first, last, sample_every, fps, duration,
+            show_duration, face_region_ratio, min_face_size
+        )
+    finally:
+        cap.release()
+
+
+def detect_meme_corners_sharded(video_path, sample_interval=0.5, show_duration=2.5,
+                                face_region_ratio=0.25, min_face_size=40,
+                                workers=0, keyframes=None):
+    """
+    detect_meme_corners (leitura direta) em paralelo.
+
+    Args:
+        video_path: Vídeo de entrada
+        sample_interval, show_duration, face_region_ratio, min_face_size:
+            Mesmos parâmetros do detect_meme_corners
+        workers: Processos (0 = um por core)
+        keyframes: KeyframeIndex já calculado (None = calcula com ffprobe)
+
+    Returns:
+        Eventos mesclados, idênticos aos do detect_meme_corners
+    """
+    from Components.MemeCornerDetector import CASCADE_PATH, _merge_overlapping_events
+
+    resolved = _resolve(video_path, workers, keyframes)
+    if resolved is None:
+        return []
+    fps, frame_count, workers, shards = resolved
+
+    duration = frame_count / fps
+    sample_every = max(1, int(fps * sample_interval))
+
+    started = time.perf_counter()
+    results = _run_shards(
+        _corner_shard, shards,
+        (video_path, sample_every, fps, duration, show_duration, face_region_ratio, min_face_size),
+        'haar', {'cascade_path': CASCADE_PATH}, workers
+    )
+
+    events = [event for shard_events in results for event in shard_events]
+    print(f"   🧩 Cantos: {len(shards)} trechos, {workers} workers "
+          f"({time.perf_counter() - started:.1f}s)")
+
+    return _merge_overlapping_events(events)
+
+
+# =============================================================================
+# ORADOR (DNN + VAD DO SPEAKER)
+# =============================================================================
+
+def _part_path(work_dir, first):
+    """Vídeo anotado do trecho que começa em first."""
+    return os.path.join(work_dir, f'part_{first:09d}.mp4')
+
+
+def _speaker_shard(first, last, video_path, audio_path, work_dir):
+    """
+    Speaker.py num trecho: DNN, VAD do frame de áudio correspondente e
+    desenho, gravando o trecho anotado em _part_path(work_dir, first).
+
+    Returns:
+        (caixas por frame, fim atingido); fim = vídeo ou áudio acabou
+        dentro do trecho (os trechos seguintes são descartados)
+    """
+    from Components.Speaker import annotate_frame, voice_activity_detection, FRAME_DURATION_MS
+
+    boxes = []
+    ended = False
+    cap = _open_at(video_path, first)
+    out = cv2.VideoWriter(
+        _part_path(work_dir, first), cv2.VideoWriter_fourcc(*'mp4v'), 30.0,
+        (int(cap.get(3)), int(cap.get(4)))
+    )
+    try:
+        with contextlib.closing(wave.open(audio_path, 'rb')) as wf:
+            sample_rate = wf.getframerate()
+            # Mesmo fatiamento do process_audio_frame: frame k = amostras [k*n, (k+1)*n)
+            samples = int(sample_rate * FRAME_DURATION_MS / 1000)
+            audio_frames = wf.getnframes() // samples if samples else 0
+            if first < audio_frames:
+                wf.setpos(first * samples)
+
+            frame_idx = first
+            while last is None or frame_idx < last:
+                ret, frame = cap.read()
+                if not ret or frame_idx >= audio_frames:
+                    ended = True
+                    break
+
+                blob = cv2.dnn.blobFromImage(cv2.resize(frame, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0))
+                _detector.setInput(blob)
+                detections = _detector.forward()
+
+                is_speaking_audio = voice_activity_detection(wf.readframes(samples), sample_rate)
+                boxes.append(annotate_frame(frame, detections, is_speaking_audio))
+                out.write(frame)
+                frame_idx += 1
+    finally:
+        cap.release()
+        out.release()
+
+    return boxes, ended
+
+
+def _concat_parts(part_paths, output_path):
+    """Junta os trechos anotados sem re-encode (mesmo codec e tamanho). True se ok."""
+    if len(part_paths) == 1:
+        shutil.move(part_paths[0], output_path)
+        return True
+
+    list_path = os.path.join(os.path.dirname(part_paths[0]), 'parts.txt')
+    with open(list_path, 'w', encoding='utf-8') as f:
+        f.writelines(f"file '{os.path.abspath(p)}'\n" for p in part_paths)
+
+    cmd = [
+        'ffmpeg',
+        '-f', 'concat', '-safe', '0', '-i', list_path,
+        '-c', 'copy',
+        '-y',
+        str(output_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True)
+    return result.returncode == 0
+
+
+def detect_speakers_sharded(video_path, output_video_path, audio_path, prototxt_path, model_path,
+                            workers=0, keyframes=None):
+    """
+    detect_faces_and_speakers em paralelo: cada frame é decodificado uma
+    única vez, no worker do seu trecho (DNN, VAD e desenho juntos).
+
+    Args:
+        video_path: Vídeo de entrada
+        output_video_path: Vídeo anotado (mesmos frames da versão serial)
+        audio_path: WAV extraído do vídeo (extract_audio_from_video)
+        prototxt_path, model_path: Modelo Caffe (mesmo do Speaker.py)
+        workers: Processos (0 = um por core)
+        keyframes: KeyframeIndex já calculado (None = calcula com ffprobe)
+
+    Returns:
+        Lista por frame (ordem original) da caixa [x, y, x1, y1] do orador,
+        None nos frames sem face
+    """
+    resolved = _resolve(video_path, workers, keyframes)
+    if resolved is None:
+        return []
+    fps, frame_count, workers, shards = resolved
+
+    output_dir = os.path.dirname(os.path.abspath(output_video_path))
+    work_dir = tempfile.mkdtemp(prefix='speaker_', dir=output_dir)
+    try:
+        started = time.perf_counter()
+        results = _run_shards(
+            _speaker_shard, shards, (video_path, audio_path, work_dir),
+            'dnn', {'prototxt_path': prototxt_path, 'model_path': model_path}, workers
+        )
+
+        # Como na leitura sequencial, tudo para no trecho onde vídeo/áudio acabou
+        boxes = []
+        part_paths = []
+        for (first, _), (shard_boxes, ended) in zip(shards, results):
+            if shard_boxes:
+                boxes.extend(shard_boxes)
+                part_paths.append(_part_path(work_dir, first))
+            if ended:
+                break
+
+        if part_paths and not _concat_parts(part_paths, output_video_path):
+            raise RuntimeError(f"Falha ao juntar os trechos anotados em {output_video_path}")
+
+        print(f"   🧩 Orador: {len(boxes)} frames, {len(shards)} trechos, {workers} workers "
+              f"({time.perf_counter() - started:.1f}s)")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return boxes
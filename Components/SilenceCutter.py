@@ -1,5 +1,51 @@
 from moviepy.editor import VideoFileClip, concatenate_videoclips
 import numpy as np
+from pathlib import Path
+
+from Components.AudioFeatureStore import AudioFeatureStore
+
+
+# O limiar de silêncio (0.02) foi ajustado para a norma de UMA amostra
+# estéreo do moviepy: com canais iguais, norma = √2·|x|. Em fala (amplitude
+# ~ gaussiana) E|x| = √(2/π)·RMS, então a norma vale em média ≈ 1.13·RMS.
+# O AudioFeatureStore guarda RMS mono (janela de 2048 amostras), então o
+# limiar é dividido por esse fator: 0.02 → 0.0177 ≈ -35 dBFS, o mesmo
+# SILENCE_DB do store e do VideoOptimizer. A janela também tira os falsos
+# "silêncios" de uma amostra isolada perto de zero.
+NORM_PER_RMS = np.sqrt(2) * np.sqrt(2 / np.pi)
+
+
+def sample_volumes(clip, times):
+    """Volume (norma do frame de áudio) em cada tempo, via moviepy."""
+    volumes = []
+    for t in times:
+        try:
+            frame = clip.audio.get_frame(t)
+            volume = np.linalg.norm(frame) if frame is not None else 0.0
+        except Exception:
+            volume = 0.0
+        volumes.append(volume)
+    return np.array(volumes)
+
+
+def silent_mask(clip, times, silence_threshold, feature_store=None, source_offset=0.0):
+    """
+    Silêncio em cada tempo do clip.
+
+    Args:
+        clip: VideoFileClip (usado só sem feature_store)
+        times: Tempos relativos ao clip
+        silence_threshold: Limiar na escala da norma do moviepy
+        feature_store: AudioFeatureStore da live (RMS, sem decodificar)
+        source_offset: Início do clip na live
+
+    Returns:
+        Array bool
+    """
+    if feature_store is not None:
+        rms = feature_store.sample('rms', np.asarray(times) + source_offset)
+        return rms < silence_threshold / NORM_PER_RMS
+    return sample_volumes(clip, times) < silence_threshold
 
 
 def remove_silence_intelligently(
@@ -8,8 +54,16 @@ def remove_silence_intelligently(
     silence_threshold=0.02,
     min_silence_duration=0.8,
     padding=0.15,
-    analysis_fps=20
+    analysis_fps=20,
+    feature_store=None,
+    source_offset=0.0
 ):
+    """
+    Remove silêncios e concatena os trechos com som.
+
+    Com feature_store (AudioFeatureStore da live), o volume vem do RMS já
+    calculado a partir de source_offset, sem loop em clip.audio.get_frame.
+    """
     clip = VideoFileClip(input_video)
 
     if clip.audio is None:
@@ -25,17 +79,7 @@ def remove_silence_intelligently(
     step = 1.0 / analysis_fps
 
     times = np.arange(0, duration, step)
-    volumes = []
-
-    for t in times:
-        try:
-            frame = clip.audio.get_frame(t)
-            volume = np.linalg.norm(frame) if frame is not None else 0.0
-        except Exception:
-            volume = 0.0
-        volumes.append(volume)
-
-    silent = np.array(volumes) < silence_threshold
+    silent = silent_mask(clip, times, silence_threshold, feature_store, source_offset)
 
     segments = []
     last_sound = 0.0
@@ -81,3 +125,41 @@ def remove_silence_intelligently(
 
     clip.close()
     final.close()
+
+
+def get_non_silent_segments(
+    audio_path,
+    silence_threshold_db=-35,
+    min_silence_duration=0.8,
+    min_segment_duration=15.0,
+    feature_store=None,
+    features_dir=None
+):
+    """
+    Trechos com som entre silêncios longos de um áudio inteiro.
+
+    Usa o AudioFeatureStore (criado ao lado do áudio se não for passado).
+
+    Returns:
+        Lista de {"start", "end"} em segundos
+    """
+    if feature_store is None:
+        features_dir = features_dir or f"{Path(audio_path).with_suffix('')}_features"
+        feature_store = AudioFeatureStore.open_or_build(audio_path, features_dir)
+
+    silences = feature_store.silences(
+        threshold_db=silence_threshold_db,
+        min_duration=min_silence_duration
+    )
+
+    segments = []
+    last_end = 0.0
+    for silence in silences:
+        if silence['start'] - last_end >= min_segment_duration:
+            segments.append({"start": last_end, "end": silence['start']})
+        last_end = silence['end']
+
+    if feature_store.duration - last_end >= min_segment_duration:
+        segments.append({"start": last_end, "end": feature_store.duration})
+
+    return segments
@@ -11,6 +11,9 @@ prototxt_path = "models/deploy.prototxt"
 model_path = "models/res10_300x300_ssd_iter_140000_fp16.caffemodel"
 temp_audio_path = "temp_audio.wav"
 
+# Um frame de áudio (VAD) por frame de vídeo
+FRAME_DURATION_MS = 30
+
 # Load DNN model
 net = cv2.dnn.readNetFromCaffe(prototxt_path, model_path)
 
@@ -36,12 +39,86 @@ def process_audio_frame(audio_data, sample_rate=16000, frame_duration_ms=30):
 global Frames
 Frames = [] # [x,y,w,h]
 
-def detect_faces_and_speakers(input_video_path, output_video_path):
+def annotate_frame(frame, detections, is_speaking_audio):
+    """
+    Desenha faces/orador no frame e retorna a caixa [x, y, x1, y1]
+    escolhida (None se não houver face acima da confiança).
+    """
+    h, w = frame.shape[:2]
+    MaxDif = 0
+    Add = []
+    face_found = False
+    for i in range(detections.shape[2]):
+        confidence = detections[0, 0, i, 2]
+        if confidence > 0.3:  # Confidence threshold
+            box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
+            (x, y, x1, y1) = box.astype("int")
+            face_width = x1 - x
+            face_height = y1 - y
+
+            # Draw bounding box
+            cv2.rectangle(frame, (x, y), (x1, y1), (0, 255, 0), 2)
+
+            # Assuming lips are approximately at the bottom third of the face
+            lip_distance = abs((y + 2 * face_height // 3) - (y1))
+            Add.append([[x, y, x1, y1], lip_distance])
+
+            MaxDif = max(lip_distance, MaxDif)
+            face_found = True
+    for i in range(detections.shape[2]):
+        confidence = detections[0, 0, i, 2]
+        if confidence > 0.3:  # Confidence threshold
+            box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
+            (x, y, x1, y1) = box.astype("int")
+            face_width = x1 - x
+            face_height = y1 - y
+
+            # Draw bounding box
+            cv2.rectangle(frame, (x, y), (x1, y1), (0, 255, 0), 2)
+
+            # Assuming lips are approximately at the bottom third of the face
+            lip_distance = abs((y + 2 * face_height // 3) - (y1))
+            print(lip_distance)
+
+            # Combine visual and audio cues
+            if lip_distance >= MaxDif and is_speaking_audio:  # Adjust the threshold as needed
+                cv2.putText(frame, "Active Speaker", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
+            if lip_distance >= MaxDif:
+                break
+
+    return [x, y, x1, y1] if face_found else None
+
+
+def append_face(box):
+    """Caixa do frame em Frames (sem face: repete a anterior ou None)."""
+    if box is not None:
+        Frames.append(box)
+    elif len(Frames) > 0:
+        Frames.append(Frames[-1])
+    else:
+        Frames.append(None)
+
+
+def detect_faces_and_speakers(input_video_path, output_video_path, workers=1):
     # Return Frams:
+    # workers != 1: frames processados em paralelo por trechos (0 = um
+    # por core), cada trecho com DNN, VAD e desenho; vídeo montado no fim
     global Frames
+
     # Extract audio from the video
     extract_audio_from_video(input_video_path, temp_audio_path)
 
+    if workers != 1:
+        from Components.ShardedDetector import detect_speakers_sharded
+        boxes = detect_speakers_sharded(
+            input_video_path, output_video_path, temp_audio_path,
+            prototxt_path, model_path, workers=workers
+        )
+        for box in boxes:
+            append_face(box)
+        os.remove(temp_audio_path)
+        return
+
     # Read the extracted audio
     with contextlib.closing(wave.open(temp_audio_path, 'rb')) as wf:
         sample_rate = wf.getframerate()
@@ -51,7 +128,7 @@ def detect_faces_and_speakers(input_video_path, output_video_path):
     fourcc = cv2.VideoWriter_fourcc(*'mp4v')
     out = cv2.VideoWriter(output_video_path, fourcc, 30.0, (int(cap.get(3)), int(cap.get(4))))
 
-    frame_duration_ms = 30  # 30ms frames
+    frame_duration_ms = FRAME_DURATION_MS  # 30ms frames
     audio_generator = process_audio_frame(audio_data, sample_rate, frame_duration_ms)
 
     while cap.isOpened():
@@ -59,7 +136,6 @@ def detect_faces_and_speakers(input_video_path, output_video_path):
         if not ret:
             break
 
-        h, w = frame.shape[:2]
         blob = cv2.dnn.blobFromImage(cv2.resize(frame, (300, 300)), 1.0, (300, 300), (104.0, 177.0, 123.0))
         net.setInput(blob)
         detections = net.forward()
@@ -68,55 +144,8 @@ def detect_faces_and_speakers(input_video_path, output_video_path):
         if audio_frame is None:
             break
         is_speaking_audio = voice_activity_detection(audio_frame, sample_rate)
-        MaxDif = 0
-        Add = []
-        face_found = False
-        for i in range(detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            if confidence > 0.3:  # Confidence threshold
-                box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                (x, y, x1, y1) = box.astype("int")
-                face_width = x1 - x
-                face_height = y1 - y
-
-                # Draw bounding box
-                cv2.rectangle(frame, (x, y), (x1, y1), (0, 255, 0), 2)
-
-                # Assuming lips are approximately at the bottom third of the face
-                lip_distance = abs((y + 2 * face_height // 3) - (y1))
-                Add.append([[x, y, x1, y1], lip_distance])
-
-                MaxDif = max(lip_distance, MaxDif)
-                face_found = True
-        for i in range(detections.shape[2]):
-            confidence = detections[0, 0, i, 2]
-            if confidence > 0.3:  # Confidence threshold
-                box = detections[0, 0, i, 3:7] * np.array([w, h, w, h])
-                (x, y, x1, y1) = box.astype("int")
-                face_width = x1 - x
-                face_height = y1 - y
-
-                # Draw bounding box
-                cv2.rectangle(frame, (x, y), (x1, y1), (0, 255, 0), 2)
-
-                # Assuming lips are approximately at the bottom third of the face
-                lip_distance = abs((y + 2 * face_height // 3) - (y1))
-                print(lip_distance)
-
-                # Combine visual and audio cues
-                if lip_distance >= MaxDif and is_speaking_audio:  # Adjust the threshold as needed
-                    cv2.putText(frame, "Active Speaker", (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 0), 2)
-                if lip_distance >= MaxDif:
-                    break
-
-        if face_found:
-            Frames.append([x, y, x1, y1])
-        else:
-            # If no face detected, append previous frame's values or None
-            if len(Frames) > 0:
-                Frames.append(Frames[-1])
-            else:
-                Frames.append(None)
+
+        append_face(annotate_frame(frame, detections, is_speaking_audio))
 
         out.write(frame)
         # cv2.imshow('Frame', frame)
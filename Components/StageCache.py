@@ -0,0 +1,328 @@
+# Components/StageCache.py
+"""
+=============================================================================
+CACHE DE ETAPAS DO PIPELINE (CONTENT-ADDRESSED)
+=============================================================================
+
+✨ FEATURES:
+- Chave = hash do CONTEÚDO do vídeo + parâmetros da etapa
+  (modelo, chunk, versão do prompt, thresholds...)
+- Re-rodar a mesma live pula áudio, transcrição, análise e highlights
+- Guarda JSON (resultados) e arquivos (ex: audio.wav, via hardlink)
+- Limite de tamanho com remoção dos itens menos usados (LRU)
+- Invalidação por etapa (--invalidate transcription) ou total (--no-cache)
+
+📁 ESTRUTURA:
+    cache/
+      index.json              ← tamanho e último uso de cada entrada
+      hashes.json             ← hash do vídeo por (caminho, tamanho, mtime)
+      transcription/<chave>/data.json
+      audio/<chave>/audio.wav
+
+=============================================================================
+"""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+from pathlib import Path
+
+
+CACHE_VERSION = 1
+
+# Etapas conhecidas (para a CLI)
+STAGES = ['audio', 'features', 'vad', 'transcription', 'audio_analysis', 'highlights', 'keyframes', 'visual']
+
+
+def _json_default(value):
+    """Converte tipos do numpy (np.float32, np.ndarray...) para JSON."""
+    if hasattr(value, 'tolist'):
+        return value.tolist()
+    if hasattr(value, 'item'):
+        return value.item()
+    raise TypeError(f"Tipo não serializável: {type(value).__name__}")
+
+
+class StageCache:
+    """Cache em disco dos resultados de cada etapa."""
+
+    def __init__(self, cache_dir='cache', max_size_mb=10240, enabled=True, invalidate=None):
+        """
+        Inicializa cache.
+
+        Args:
+            cache_dir: Diretório do cache
+            max_size_mb: Tamanho máximo (MB) antes de remover entradas antigas
+            enabled: False desliga leitura e escrita (--no-cache)
+            invalidate: Etapas a recalcular ('all' = todas)
+        """
+        self.cache_dir = Path(cache_dir)
+        self.max_size_bytes = int(max_size_mb * 1024 * 1024)
+        self.enabled = enabled
+        self.invalidate = set(invalidate or [])
+        self._invalidated = set()
+
+        self.hits = 0
+        self.misses = 0
+
+        if self.enabled:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+        self._index_path = self.cache_dir / 'index.json'
+        self._hashes_path = self.cache_dir / 'hashes.json'
+        self._index = self._load(self._index_path) if self.enabled else {}
+
+    # -------------------------------------------------------------------------
+    # CHAVES
+    # -------------------------------------------------------------------------
+
+    def source_hash(self, path):
+        """
+        SHA-256 do conteúdo do arquivo.
+
+        O hash é memorizado por (caminho, tamanho, mtime), então só é
+        calculado de novo se o arquivo mudar.
+
+        Returns:
+            Hash hexadecimal (ou None com cache desligado)
+        """
+        if not self.enabled:
+            return None
+
+        path = Path(path).resolve()
+        stat = path.stat()
+        memo_key = f"{path}|{stat.st_size}|{stat.st_mtime_ns}"
+
+        hashes = self._load(self._hashes_path)
+        if memo_key in hashes:
+            return hashes[memo_key]
+
+        print(f"   🔑 Calculando hash de {path.name}...")
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(4 * 1024 * 1024), b''):
+                digest.update(block)
+
+        value = digest.hexdigest()
+
+        # Remove memos antigos do mesmo caminho
+        hashes = {k: v for k, v in hashes.items() if not k.startswith(f"{path}|")}
+        hashes[memo_key] = value
+        self._save(self._hashes_path, hashes)
+
+        return value
+
+    def key(self, stage, source_hash, params):
+        """Chave da entrada: hash de (etapa, fonte, parâmetros, versão)."""
+        payload = json.dumps({
+            'stage': stage,
+            'source': source_hash,
+            'params': params,
+            'version': CACHE_VERSION
+        }, sort_keys=True, default=_json_default)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+
+    # -------------------------------------------------------------------------
+    # LEITURA / ESCRITA
+    # -------------------------------------------------------------------------
+
+    def get_json(self, stage, source_hash, params):
+        """
+        Lê resultado JSON de uma etapa.
+
+        Returns:
+            Valor salvo ou None (miss / cache desligado / invalidado)
+        """
+        entry = self._lookup(stage, source_hash, params)
+        if entry is None:
+            return None
+
+        data_file = entry / 'data.json'
+        if not data_file.exists():
+            self._miss(stage)
+            return None
+
+        start = time.perf_counter()
+        with open(data_file, 'r', encoding='utf-8') as f:
+            value = json.load(f)
+
+        self._hit(stage, entry, time.perf_counter() - start)
+        return value
+
+    def put_json(self, stage, source_hash, params, value):
+        """Salva resultado JSON de uma etapa."""
+        if not self.enabled or source_hash is None:
+            return
+
+        entry = self._entry_dir(stage, self.key(stage, source_hash, params))
+        entry.mkdir(parents=True, exist_ok=True)
+
+        tmp_file = entry / 'data.json.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(value, f, ensure_ascii=False, default=_json_default)
+        os.replace(tmp_file, entry / 'data.json')
+
+        self._register(stage, entry)
+
+    def get_file(self, stage, source_hash, params, dest):
+        """
+        Restaura arquivo de uma etapa em `dest`.
+
+        Returns:
+            True se restaurou do cache
+        """
+        entry = self._lookup(stage, source_hash, params)
+        if entry is None:
+            return False
+
+        cached = entry / Path(dest).name
+        if not cached.exists():
+            self._miss(stage)
+            return False
+
+        start = time.perf_counter()
+        self._link_or_copy(cached, Path(dest))
+        self._hit(stage, entry, time.perf_counter() - start)
+        return True
+
+    def put_file(self, stage, source_hash, params, path):
+        """Guarda arquivo de uma etapa (hardlink quando possível)."""
+        if not self.enabled or source_hash is None or not Path(path).exists():
+            return
+
+        entry = self._entry_dir(stage, self.key(stage, source_hash, params))
+        entry.mkdir(parents=True, exist_ok=True)
+        self._link_or_copy(Path(path), entry / Path(path).name)
+
+        self._register(stage, entry)
+
+    def cached_json(self, stage, source_hash, params, compute, should_store=bool):
+        """
+        Atalho: lê do cache ou calcula e salva.
+
+        Args:
+            stage: Nome da etapa
+            source_hash: Hash do vídeo
+            params: Parâmetros da etapa
+            compute: Função sem argumentos que calcula o resultado
+            should_store: Decide se o resultado vale ser salvo
+                          (padrão: não salva resultados vazios)
+
+        Returns:
+            Resultado da etapa
+        """
+        value = self.get_json(stage, source_hash, params)
+        if value is not None:
+            return value
+
+        value = compute()
+        if should_store(value):
+            self.put_json(stage, source_hash, params, value)
+        return value
+
+    def stats(self):
+        """Contadores de hit/miss."""
+        return {'hits': self.hits, 'misses': self.misses}
+
+    # -------------------------------------------------------------------------
+    # INTERNOS
+    # -------------------------------------------------------------------------
+
+    def _entry_dir(self, stage, key):
+        return self.cache_dir / stage / key
+
+    def _lookup(self, stage, source_hash, params):
+        """Diretório da entrada, ou None se deve recalcular."""
+        if not self.enabled or source_hash is None:
+            return None
+
+        entry = self._entry_dir(stage, self.key(stage, source_hash, params))
+        rel = self._rel(entry)
+
+        # Invalida uma vez por execução (o valor recalculado vale depois)
+        if (stage in self.invalidate or 'all' in self.invalidate) and rel not in self._invalidated:
+            self._invalidated.add(rel)
+            if entry.exists():
+                shutil.rmtree(entry, ignore_errors=True)
+                self._index.pop(rel, None)
+                self._save(self._index_path, self._index)
+            self._miss(stage)
+            return None
+
+        if not entry.exists():
+            self._miss(stage)
+            return None
+
+        return entry
+
+    def _hit(self, stage, entry, elapsed):
+        self.hits += 1
+        record = self._index.get(self._rel(entry))
+        if record is not None:
+            record['last_used'] = time.time()
+            self._save(self._index_path, self._index)
+        print(f"   ♻️  Cache: {stage} ({elapsed * 1000:.0f} ms)")
+
+    def _miss(self, stage):
+        self.misses += 1
+
+    def _register(self, stage, entry):
+        """Atualiza índice e aplica limite de tamanho."""
+        size = sum(f.stat().st_size for f in entry.iterdir() if f.is_file())
+        self._index[self._rel(entry)] = {
+            'stage': stage,
+            'size': size,
+            'last_used': time.time()
+        }
+        self._evict(keep=self._rel(entry))
+        self._save(self._index_path, self._index)
+
+    def _evict(self, keep=None):
+        """Remove entradas menos usadas até caber no limite."""
+        total = sum(r['size'] for r in self._index.values())
+        if total <= self.max_size_bytes:
+            return
+
+        by_age = sorted(self._index.items(), key=lambda item: item[1]['last_used'])
+
+        for rel, record in by_age:
+            if total <= self.max_size_bytes:
+                break
+            if rel == keep:
+                continue
+
+            shutil.rmtree(self.cache_dir / rel, ignore_errors=True)
+            del self._index[rel]
+            total -= record['size']
+            print(f"   🗑️  Cache removido: {rel} ({record['size'] / 1024 / 1024:.1f} MB)")
+
+    def _rel(self, entry):
+        return str(entry.relative_to(self.cache_dir).as_posix())
+
+    @staticmethod
+    def _link_or_copy(src, dest):
+        if dest.exists():
+            dest.unlink()
+        try:
+            os.link(src, dest)
+        except OSError:
+            shutil.copy2(src, dest)
+
+    @staticmethod
+    def _load(path):
+        if path.exists():
+            try:
+                with open(path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    @staticmethod
+    def _save(path, data):
+        tmp = path.with_suffix('.tmp')
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, indent=2)
+        os.replace(tmp, path)
@@ -0,0 +1,273 @@
+# Components/TranscriptIndex.py
+"""
+=============================================================================
+ÍNDICE TEMPORAL DA TRANSCRIÇÃO
+=============================================================================
+
+✨ FEATURES:
+- Palavras (ou segmentos) em arrays NumPy: start, end, IDs de tokens
+- Consultas por intervalo com busca binária: O(log n)
+    "o que foi dito entre t0 e t1", "quantas risadas nessa janela"
+- Somas prefixadas de palavras e marcadores de riso
+- Pausas entre palavras pré-calculadas por limiar
+- Substitui as varreduras da transcrição inteira em MemeScorer,
+  HookDetector, EtapaG_CoherentSegments e context_builder
+
+⚙️ USO:
+    index = TranscriptIndex.build(transcriptions)   # [(texto, start, end)]
+    index = TranscriptIndex.build(segments)         # [{'text', 'start', 'end'}]
+
+    index.text_between(120.0, 150.0)
+    index.laugh_count(120.0, 150.0)
+    index.word_count(120.0, 150.0)
+
+Entradas devem estar em ordem de tempo (são ordenadas por start).
+
+=============================================================================
+"""
+
+import numpy as np
+
+from Components.MemeIndex import tokenize
+
+
+# Padrões de riso (mesma contagem do MemeScorer)
+LAUGH_PATTERNS = [
+    '[riso]', '[risada]', '[risos]',
+    'hahaha', 'kkkk', 'rsrs', 'kkk',
+    '[laughing]', '[laughter]'
+]
+
+
+class TranscriptIndex:
+    """Palavras/segmentos da transcrição indexados por tempo."""
+
+    def __init__(self, texts, starts, ends):
+        """Use build() ou from_transcription()."""
+        order = np.argsort(np.asarray(starts, dtype=np.float64), kind='stable')
+
+        self.texts = [texts[i] for i in order]
+        self.starts = np.asarray(starts, dtype=np.float64)[order]
+        self.ends = np.asarray(ends, dtype=np.float64)[order]
+
+        # Maior end até cada posição (busca por sobreposição)
+        self._max_ends = np.maximum.accumulate(self.ends) if len(self.ends) else self.ends
+
+        # Tokens normalizados (CSR: token_ptr[i]:token_ptr[i+1] são da entrada i)
+        self.vocab = {}
+        token_ids = []
+        counts = []
+        words = []
+        laughs = []
+        for text in self.texts:
+            tokens = tokenize(text)
+            token_ids.extend(self.vocab.setdefault(t, len(self.vocab)) for t in tokens)
+            counts.append(len(tokens))
+
+            lower = text.lower()
+            words.append(len(lower.split()))
+            laughs.append(sum(lower.count(p) for p in LAUGH_PATTERNS))
+
+        self.token_ids = np.asarray(token_ids, dtype=np.int32)
+        self.token_ptr = _prefix(counts)
+        self._word_prefix = _prefix(words)
+        self._laugh_prefix = _prefix(laughs)
+
+        self._pauses = {}
+
+    def __len__(self):
+        return len(self.texts)
+
+    # -------------------------------------------------------------------------
+    # CRIAÇÃO
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, items):
+        """
+        Índice de uma lista de palavras ou segmentos.
+
+        Args:
+            items: (texto, start, end) ou dicts {'text'/'word', 'start', 'end'}
+                   (outros tipos são ignorados)
+        """
+        texts, starts, ends = [], [], []
+        for item in items:
+            if isinstance(item, dict):
+                text = item.get('text', item.get('word', ''))
+                start = item.get('start', 0)
+                end = item.get('end', start)
+            elif isinstance(item, (tuple, list)) and len(item) >= 3:
+                text, start, end = item[0], item[1], item[2]
+            else:
+                continue
+            texts.append(str(text))
+            starts.append(float(start))
+            ends.append(float(end))
+
+        return cls(texts, starts, ends)
+
+    @classmethod
+    def from_transcription(cls, transcription, level='words'):
+        """
+        Índice de um resultado de transcribe_audio.
+
+        Args:
+            level: 'words' (timestamps por palavra) ou 'segments'
+        """
+        segments = transcription.get('segments', []) if isinstance(transcription, dict) else transcription
+        if level == 'segments':
+            return cls.build(segments)
+        return cls.build(w for s in segments for w in s.get('words', []))
+
+    @classmethod
+    def ensure(cls, transcriptions):
+        """
+        Aceita TranscriptIndex ou lista.
+
+        A última lista indexada é lembrada: chamadas repetidas com a mesma
+        lista (ex: uma vez por clip) não reconstroem o índice.
+        """
+        if isinstance(transcriptions, cls):
+            return transcriptions
+
+        source, size, index = _last_built
+        if source is transcriptions and size == _size(transcriptions):
+            return index
+
+        index = cls.build(transcriptions)
+        _last_built[:] = [transcriptions, _size(transcriptions), index]
+        return index
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS POR TEMPO
+    # -------------------------------------------------------------------------
+
+    def range_by_start(self, t0, t1):
+        """Posições (i, j) das entradas com t0 <= start <= t1."""
+        i = int(np.searchsorted(self.starts, t0, side='left'))
+        j = int(np.searchsorted(self.starts, t1, side='right'))
+        return i, max(i, j)
+
+    def range_overlapping(self, t0, t1):
+        """Posições (i, j) das entradas com end >= t0 e start <= t1."""
+        i = int(np.searchsorted(self._max_ends, t0, side='left'))
+        j = int(np.searchsorted(self.starts, t1, side='right'))
+        return i, max(i, j)
+
+    def entries(self, i, j):
+        """Entradas i..j-1 como (texto, start, end)."""
+        return [
+            (self.texts[k], float(self.starts[k]), float(self.ends[k]))
+            for k in range(i, j)
+        ]
+
+    def entries_between(self, t0, t1, overlapping=False):
+        """Entradas do intervalo (por start ou por sobreposição)."""
+        i, j = self.range_overlapping(t0, t1) if overlapping else self.range_by_start(t0, t1)
+        return self.entries(i, j)
+
+    def text_between(self, t0, t1, overlapping=False):
+        """Texto dito no intervalo."""
+        i, j = self.range_overlapping(t0, t1) if overlapping else self.range_by_start(t0, t1)
+        return ' '.join(self.texts[i:j])
+
+    def tokens_between(self, t0, t1):
+        """IDs de tokens das entradas com start no intervalo."""
+        i, j = self.range_by_start(t0, t1)
+        return self.token_ids[self.token_ptr[i]:self.token_ptr[j]]
+
+    def word_count(self, t0, t1):
+        """Palavras (split) nas entradas com start no intervalo."""
+        i, j = self.range_by_start(t0, t1)
+        return int(self._word_prefix[j] - self._word_prefix[i])
+
+    def word_counts(self):
+        """Palavras (split) de cada entrada."""
+        return np.diff(self._word_prefix)
+
+    def laugh_count(self, t0, t1):
+        """Marcadores de riso nas entradas com start no intervalo."""
+        i, j = self.range_by_start(t0, t1)
+        return int(self._laugh_prefix[j] - self._laugh_prefix[i])
+
+    # -------------------------------------------------------------------------
+    # BORDAS DE PALAVRAS E PAUSAS
+    # -------------------------------------------------------------------------
+
+    def word_containing(self, t):
+        """Posição da palavra que contém `t` (None se cai num gap)."""
+        i = int(np.searchsorted(self._max_ends, t, side='left'))
+        if i < len(self) and self.starts[i] <= t <= self.ends[i]:
+            return i
+        return None
+
+    def last_containing(self, t):
+        """Última palavra (start <= t) que contém `t` (None se nenhuma)."""
+        j = int(np.searchsorted(self.starts, t, side='right')) - 1
+        if j >= 0 and self.ends[j] >= t:
+            return j
+        return None
+
+    def first_start_at_or_after(self, t):
+        """Primeiro start >= t (None se não há)."""
+        i = int(np.searchsorted(self.starts, t, side='left'))
+        return float(self.starts[i]) if i < len(self) else None
+
+    def last_end_at_or_before(self, t):
+        """Último end <= t (None se não há)."""
+        j = int(np.searchsorted(self._max_ends, t, side='right')) - 1
+        return float(self.ends[j]) if j >= 0 else None
+
+    def pauses(self, min_gap):
+        """
+        Pausas entre entradas consecutivas com gap >= min_gap.
+
+        Returns:
+            (posições k, meios) — pausa entre as entradas k e k+1
+        """
+        if min_gap not in self._pauses:
+            gaps = self.starts[1:] - self.ends[:-1]
+            positions = np.flatnonzero(gaps >= min_gap)
+            middles = self.ends[positions] + gaps[positions] / 2
+            self._pauses[min_gap] = (positions, middles)
+        return self._pauses[min_gap]
+
+    def chain_end(self, t, max_gap):
+        """
+        Estende `t` pelas entradas seguintes enquanto cada end estiver a
+        no máximo `max_gap` do anterior.
+
+        Returns:
+            Novo fim (ou `t` se a próxima entrada está longe demais)
+        """
+        ends = self._max_ends
+        j = int(np.searchsorted(ends, t, side='right'))
+        if j >= len(self) or ends[j] - t > max_gap:
+            return t
+
+        key = ('chain', max_gap)
+        if key not in self._pauses:
+            self._pauses[key] = np.flatnonzero(np.diff(ends) > max_gap)
+        breaks = self._pauses[key]
+
+        b = int(np.searchsorted(breaks, j, side='left'))
+        last = int(breaks[b]) if b < len(breaks) else len(self) - 1
+        return float(ends[last])
+
+
+# Última lista indexada por ensure(): [lista, tamanho, índice]
+_last_built = [None, None, None]
+
+
+def _size(items):
+    """Tamanho da lista (None para iteradores, que nunca são reaproveitados)."""
+    try:
+        return len(items)
+    except TypeError:
+        return None
+
+
+def _prefix(values):
+    """Soma prefixada com zero inicial."""
+    return np.concatenate([[0], np.cumsum(np.asarray(values, dtype=np.int64))]).astype(np.int64)
@@ -2,23 +2,97 @@
 """
 TRANSCRIÇÃO CORRIGIDA - PROCESSA EM CHUNKS
 Evita travamento com áudios longos em CPU
+
+Modo paralelo (transcribe_audio(..., workers=N)): cortes em silêncio,
+uma réplica do modelo por processo e junção das palavras nas bordas.
+
+Com mapa de fala (speech_map=SpeechMap), só as regiões de fala vão para
+o Whisper e os tempos voltam para a timeline original.
+
+O motor de ASR vem do ASRBackends (whisper por padrão, faster_whisper
+int8 pela seção 'asr' do perfil).
 """
 
-import whisper
 import warnings
 from pydub import AudioSegment
 import os
+import re
+import time
+import unicodedata
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from Components.AudioStream import WavReader
+from Components.ClipWorkers import resolve_workers
+from Components.VoiceActivity import SpeechMap, PackedAudio
+from Components.ASRBackends import get_backend
 
 warnings.filterwarnings("ignore")
 
+# Parâmetros da transcrição (também usados como chave do StageCache)
+WHISPER_MODEL = "base"
+LANGUAGE = "pt"
+CHUNK_DURATION_MIN = 30
+
+# Modo paralelo: chunks menores (balanceamento entre workers), cortados
+# no ponto mais silencioso perto do alvo, com sobreposição nas bordas
+PARALLEL_CHUNK_MIN = 5
+SPLIT_SEARCH_SEC = 20
+OVERLAP_SEC = 2.0
+DEDUPE_TOLERANCE_SEC = 0.5
+# Mesma palavra nos dois chunks = intervalos sobrepostos em pelo menos
+# metade da palavra mais curta (repetição real vem em sequência)
+DEDUPE_MIN_OVERLAP = 0.5
+WHISPER_SAMPLE_RATE = 16000
+
+
+def default_backend():
+    """Backend original: whisper base em pt."""
+    return get_backend('whisper', model=WHISPER_MODEL, language=LANGUAGE)
+
+
+def transcription_params(parallel=False, vad=False, backend=None):
+    """Parâmetros que definem o resultado da transcrição."""
+    model = backend.model_name if backend is not None else WHISPER_MODEL
+    language = backend.language if backend is not None else LANGUAGE
+    params = _layout_params(model, parallel, vad, language)
+
+    # Chave do whisper padrão não muda (cache antigo continua valendo)
+    if backend is not None and backend.name != 'whisper':
+        params['backend'] = backend.params()
+
+    return params
+
+
+def _layout_params(model, parallel, vad, language=LANGUAGE):
+    if parallel or vad:
+        # Número de workers não muda o resultado; os cortes sim
+        params = {
+            'model': model,
+            'language': language,
+            'mode': 'parallel',
+            'chunk_duration_min': PARALLEL_CHUNK_MIN,
+            'split_search_sec': SPLIT_SEARCH_SEC,
+            'overlap_sec': OVERLAP_SEC
+        }
+        if vad:
+            params['vad'] = {**SpeechMap.params(), 'gap_sec': PackedAudio.GAP_SEC}
+        return params
+
+    return {
+        'model': model,
+        'language': language,
+        'chunk_duration_min': CHUNK_DURATION_MIN
+    }
+
 
-def transcribeAudio(audio_path, chunk_duration_min=30):
+def transcribeAudio(audio_path, chunk_duration_min=CHUNK_DURATION_MIN, backend=None):
     """
     Transcreve áudio em chunks para evitar travamento.
     
     Args:
         audio_path: Caminho do áudio
         chunk_duration_min: Duração de cada chunk em minutos
+        backend: ASRBackend (None = whisper base)
     
     Returns:
         Transcrição completa
@@ -27,7 +101,7 @@ def transcribeAudio(audio_path, chunk_duration_min=30):
     print("   💻 Processando em CPU (pode demorar)")
     
     # Carregar modelo
-    model = whisper.load_model("base")
+    backend = (backend or default_backend()).load()
     
     # Carregar áudio completo
     audio = AudioSegment.from_wav(audio_path)
@@ -62,18 +136,12 @@ def transcribeAudio(audio_path, chunk_duration_min=30):
         
         try:
             # Transcrever chunk
-            result = model.transcribe(
-                chunk_file,
-                language="pt",
-                task="transcribe",
-                word_timestamps=True,
-                condition_on_previous_text=True
-            )
+            segments = backend.transcribe(chunk_file)
             
             # Ajustar timestamps (somar offset do chunk)
             offset_seconds = start_ms / 1000
             
-            for segment in result.get("segments", []):
+            for segment in segments:
                 segment["start"] += offset_seconds
                 segment["end"] += offset_seconds
                 
@@ -85,7 +153,7 @@ def transcribeAudio(audio_path, chunk_duration_min=30):
                 all_segments.append(segment)
             
             # Contar palavras e risadas
-            text = result.get("text", "")
+            text = "".join(segment["text"] for segment in segments)
             words = len(text.split())
             laughs = text.lower().count("[riso]") + text.lower().count("hahaha") + text.lower().count("kkkk")
             
@@ -113,7 +181,342 @@ def transcribeAudio(audio_path, chunk_duration_min=30):
     return all_segments
 
 
+# =============================================================================
+# MODO PARALELO (N RÉPLICAS DO MODELO)
+# =============================================================================
+
+# Backend do worker atual (carregado uma vez pelo initializer do pool)
+_worker_backend = None
+
+
+def _init_asr_worker(backend_name, backend_config, threads):
+    """Initializer do pool: carrega o modelo com as threads do worker."""
+    global _worker_backend
+
+    warnings.filterwarnings("ignore")
+    _worker_backend = get_backend(backend_name, threads=max(1, threads), **backend_config).load()
+
+
+def find_split_points(reader, chunk_sec, search_sec=SPLIT_SEARCH_SEC, frame_sec=0.03):
+    """
+    Pontos de corte nos trechos mais silenciosos perto de cada alvo.
+
+    Só lê a janela de busca em volta de cada alvo (não o áudio todo).
+
+    Args:
+        reader: WavReader do áudio
+        chunk_sec: Duração alvo de cada chunk
+        search_sec: Busca o silêncio em ±search_sec do alvo
+        frame_sec: Tamanho do frame de energia
+
+    Returns:
+        Lista de cortes em segundos, de 0 até a duração total
+    """
+    duration = reader.duration
+    frame = max(1, int(frame_sec * reader.sample_rate))
+
+    points = [0.0]
+    target = chunk_sec
+
+    # Último chunk não fica menor que meio chunk
+    while target < duration - chunk_sec / 2:
+        window_start = max(points[-1] + chunk_sec / 2, target - search_sec)
+        window_end = min(duration, target + search_sec)
+
+        y = reader.read(window_start, window_end)
+        n_frames = len(y) // frame
+
+        if n_frames == 0:
+            cut = target
+        else:
+            energy = (y[:n_frames * frame].reshape(n_frames, frame) ** 2).mean(axis=1)
+            cut = window_start + (int(energy.argmin()) + 0.5) * frame / reader.sample_rate
+
+        points.append(cut)
+        target = cut + chunk_sec
+
+    points.append(duration)
+    return points
+
+
+def _transcribe_chunk(audio_path, index, core_start, core_end, overlap_sec, speech_regions=None):
+    """
+    Transcreve um chunk (roda no worker).
+
+    O áudio é lido direto do WAV (memmap) e passado ao Whisper como
+    array: nada de temp_chunk_{i}.wav no diretório de trabalho.
+
+    Args:
+        speech_regions: Regiões do SpeechMap (tempos do chunk ficam na
+                        timeline compactada, remapeados depois da junção)
+
+    Returns:
+        (index, segmentos com tempos absolutos, segundos gastos)
+    """
+    started = time.perf_counter()
+
+    reader = WavReader(audio_path)
+    if speech_regions:
+        reader = PackedAudio(reader, SpeechMap(speech_regions))
+    start = max(0.0, core_start - overlap_sec)
+    end = min(reader.duration, core_end + overlap_sec)
+
+    segments = []
+    for segment in _worker_backend.transcribe(reader.read(start, end)):
+        segment["start"] += start
+        segment["end"] += start
+        for word in segment.get("words", []):
+            word["start"] += start
+            word["end"] += start
+        segments.append(segment)
+
+    return index, segments, time.perf_counter() - started
+
+
+def _clip_to_core(segments, core_start, core_end):
+    """
+    Mantém só o que começa dentro do núcleo do chunk.
+
+    Cada palavra fica com exatamente um chunk (o dono do seu início);
+    segmentos cortados têm texto e tempos refeitos a partir das palavras.
+    """
+    kept = []
+
+    for segment in segments:
+        words = segment.get("words")
+
+        if not words:
+            middle = (segment["start"] + segment["end"]) / 2
+            if core_start <= middle < core_end:
+                kept.append(segment)
+            continue
+
+        inside = [w for w in words if core_start <= w["start"] < core_end]
+        if not inside:
+            continue
+
+        if len(inside) < len(words):
+            segment = {
+                **segment,
+                "words": inside,
+                "text": "".join(w["word"] for w in inside),
+                "start": inside[0]["start"],
+                "end": inside[-1]["end"]
+            }
+
+        kept.append(segment)
+
+    return kept
+
+
+def _normalize_word(text):
+    text = unicodedata.normalize('NFKD', text.lower())
+    text = ''.join(c for c in text if not unicodedata.combining(c))
+    return re.sub(r'[^\w]', '', text)
+
+
+def _is_same_word(a, b, min_overlap=DEDUPE_MIN_OVERLAP):
+    """Mesmo texto e intervalos [start, end] sobrepostos (a mesma fala)."""
+    if _normalize_word(a["word"]) != _normalize_word(b["word"]):
+        return False
+    overlap = min(a["end"], b["end"]) - max(a["start"], b["start"])
+    shortest = min(a["end"] - a["start"], b["end"] - b["start"])
+    return overlap >= 0 and overlap >= min_overlap * shortest
+
+
+def _dedupe_boundary(previous, current, boundary, tolerance=DEDUPE_TOLERANCE_SEC):
+    """
+    Remove do início de `current` palavras repetidas do fim de `previous`.
+
+    Na sobreposição a mesma palavra pode sair nos dois chunks com
+    tempos um pouco diferentes (ex: 3.98s num, 4.02s no outro). Só conta
+    como duplicata se os tempos se sobrepõem: "não, não" dito duas vezes
+    na fronteira fica (intervalos em sequência).
+    """
+    tail = [
+        w
+        for segment in previous
+        for w in segment.get("words", [])
+        if w["end"] >= boundary - tolerance
+    ]
+    if not tail:
+        return current, 0
+
+    removed = 0
+    result = []
+
+    for segment in current:
+        words = segment.get("words")
+        if not words or segment["start"] > boundary + tolerance:
+            result.append(segment)
+            continue
+
+        kept = [
+            w for w in words
+            if w["start"] > boundary + tolerance or not any(
+                _is_same_word(w, previous_word) for previous_word in tail
+            )
+        ]
+        removed += len(words) - len(kept)
+
+        if not kept:
+            continue
+        if len(kept) < len(words):
+            segment = {
+                **segment,
+                "words": kept,
+                "text": "".join(w["word"] for w in kept),
+                "start": kept[0]["start"],
+                "end": kept[-1]["end"]
+            }
+        result.append(segment)
+
+    return result, removed
+
+
+def transcribeAudioParallel(audio_path,
+                            workers=0,
+                            chunk_duration_min=PARALLEL_CHUNK_MIN,
+                            overlap_sec=OVERLAP_SEC,
+                            max_memory_mb=None,
+                            speech_map=None,
+                            backend=None):
+    """
+    Transcreve chunks em paralelo, com uma réplica do modelo por processo.
+
+    Args:
+        audio_path: WAV 16 kHz PCM 16-bit (gerado por extract_audio)
+        workers: Número de réplicas (0 = automático, limitado pela RAM;
+                 1 = no próprio processo)
+        chunk_duration_min: Duração alvo de cada chunk
+        overlap_sec: Sobreposição em cada borda do chunk
+        max_memory_mb: Orçamento de memória (None = memória disponível)
+        speech_map: SpeechMap (opcional) para transcrever só a fala
+        backend: ASRBackend (None = whisper base); cada worker cria o seu
+
+    Returns:
+        Transcrição completa (mesmo formato de transcribeAudio)
+    """
+    reader = WavReader(audio_path)
+
+    if reader.sample_rate != WHISPER_SAMPLE_RATE:
+        print(f"   ⚠️ Áudio em {reader.sample_rate} Hz, modo paralelo exige 16 kHz: usando modo sequencial")
+        return transcribeAudio(audio_path, backend=backend)
+
+    backend = backend or default_backend()
+
+    speech_regions = None
+    source = reader
+    if speech_map is not None:
+        speech_regions = speech_map.regions
+        source = PackedAudio(reader, speech_map)
+        print(f"   🗣️  VAD: {source.duration / 60:.1f} de {reader.duration / 60:.1f} min vão para o Whisper")
+
+    if source.duration <= 0:
+        print("   ⚠️ Nenhuma fala detectada")
+        return []
+
+    points = find_split_points(source, chunk_duration_min * 60)
+    num_chunks = len(points) - 1
+
+    workers = resolve_workers(
+        workers,
+        mem_per_worker_mb=backend.memory_mb(),
+        max_memory_mb=max_memory_mb
+    )
+    workers = min(workers, num_chunks)
+    threads = max(1, (os.cpu_count() or 1) // workers)
+
+    print(f"🎤 Transcrevendo em paralelo ({backend.name} {backend.model_name}): "
+          f"{num_chunks} chunks, {workers} réplicas do modelo ({threads} threads cada)")
+    print(f"   📊 Duração total: {reader.duration / 60:.1f} minutos")
+
+    results = {}
+    started = time.perf_counter()
+    tasks = [
+        (str(audio_path), i, points[i], points[i + 1], overlap_sec, speech_regions)
+        for i in range(num_chunks)
+    ]
+
+    def collect(index, segments, elapsed):
+        results[index] = segments
+        print(f"   [{len(results)}/{num_chunks}] {points[index]/60:.1f}-{points[index + 1]/60:.1f} min ({elapsed:.0f}s)")
+
+    if workers == 1:
+        _init_asr_worker(backend.name, backend.config(), threads)
+        for task in tasks:
+            try:
+                collect(*_transcribe_chunk(*task))
+            except Exception as e:
+                print(f"      ❌ Erro no chunk {task[1] + 1}: {e}")
+    else:
+        with ProcessPoolExecutor(
+            max_workers=workers,
+            initializer=_init_asr_worker,
+            initargs=(backend.name, backend.config(), threads)
+        ) as pool:
+            futures = [pool.submit(_transcribe_chunk, *task) for task in tasks]
+
+            for future in as_completed(futures):
+                try:
+                    collect(*future.result())
+                except Exception as e:
+                    print(f"      ❌ Erro em um chunk: {e}")
+
+    # Junta na ordem, cada palavra no chunk dono do seu início
+    all_segments = []
+    duplicates = 0
+
+    for i in range(num_chunks):
+        if i not in results:
+            continue
+
+        core_end = points[i + 1] if i < num_chunks - 1 else float('inf')
+        segments = _clip_to_core(results[i], points[i], core_end)
+
+        if all_segments:
+            segments, removed = _dedupe_boundary(all_segments[-3:], segments, points[i])
+            duplicates += removed
+
+        all_segments.extend(segments)
+
+    if speech_map is not None:
+        source.remap_segments(all_segments)
+
+    for i, segment in enumerate(all_segments):
+        segment["id"] = i
+
+    text = " ".join(s.get("text", "") for s in all_segments).lower()
+    total_words = len(text.split())
+    total_laughs = text.count("[riso]") + text.count("hahaha") + text.count("kkkk")
+
+    print(f"\n✅ Transcrição completa! ({time.perf_counter() - started:.0f}s)")
+    print(f"   📝 Total: {total_words} palavras")
+    print(f"   😂 Total: {total_laughs} risadas detectadas")
+    if duplicates:
+        print(f"   🧹 {duplicates} palavras duplicadas removidas nas bordas")
+
+    return all_segments
+
+
 # Função de compatibilidade
-def transcribe_audio(audio_path):
-    """Wrapper para compatibilidade."""
-    return transcribeAudio(audio_path)
+def transcribe_audio(audio_path, workers=1, max_memory_mb=None, speech_map=None, backend=None):
+    """
+    Wrapper para compatibilidade.
+
+    Args:
+        audio_path: Caminho do áudio
+        workers: 1 = sequencial (original), 0 = paralelo automático, N = N réplicas
+        max_memory_mb: Orçamento de memória do modo paralelo
+        speech_map: SpeechMap para transcrever só as regiões de fala
+        backend: ASRBackend (None = whisper base)
+    """
+    if workers == 1 and speech_map is None:
+        return transcribeAudio(audio_path, backend=backend)
+    return transcribeAudioParallel(
+        audio_path,
+        workers=workers,
+        max_memory_mb=max_memory_mb,
+        speech_map=speech_map,
+        backend=backend
+    )
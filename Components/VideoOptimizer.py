@@ -10,6 +10,7 @@ OTIMIZADOR DE VÍDEO PROFISSIONAL
 - Normaliza áudio
 - Mantém sincronia perfeita
 - Processamento eficiente
+- Silêncios do AudioFeatureStore (sem silencedetect por clip)
 
 =============================================================================
 """
@@ -24,11 +25,14 @@ import json
 class VideoOptimizer:
     """Otimiza vídeos para maior engajamento."""
     
+    LOUDNORM_FILTER = 'loudnorm=I=-16:LRA=11:TP=-1.5'
+    
     def __init__(self, 
                  silence_threshold=-35,      # dB
                  min_silence_duration=1.0,   # segundos
                  speed_factor=1.25,          # 1.0 = normal, 1.25 = 25% mais rápido
-                 keep_silence_padding=0.2):  # segundos de padding
+                 keep_silence_padding=0.2,   # segundos de padding
+                 feature_store=None):
         """
         Inicializa otimizador.
         
@@ -37,13 +41,31 @@ class VideoOptimizer:
             min_silence_duration: Duração mínima para considerar silêncio
             speed_factor: Fator de aceleração (1.2 = 20% mais rápido)
             keep_silence_padding: Segundos de silêncio para manter (naturalidade)
+            feature_store: AudioFeatureStore da live (opcional)
         """
         self.silence_threshold = silence_threshold
         self.min_silence_duration = min_silence_duration
         self.speed_factor = speed_factor
         self.keep_silence_padding = keep_silence_padding
+        self.feature_store = feature_store
+    
+    def silences_from_store(self, start, duration):
+        """
+        Silêncios de [start, start + duration] da live pelo AudioFeatureStore.
+        
+        Returns:
+            Lista relativa a `start`, ou None sem feature_store
+        """
+        if self.feature_store is None:
+            return None
+        return self.feature_store.silences(
+            start,
+            start + duration,
+            threshold_db=self.silence_threshold,
+            min_duration=self.min_silence_duration
+        )
     
-    def optimize_video(self, input_video, output_video):
+    def optimize_video(self, input_video, output_video, source_offset=None):
         """
         Otimiza vídeo completo.
         
@@ -55,6 +77,7 @@ class VideoOptimizer:
         Args:
             input_video: Vídeo de entrada
             output_video: Vídeo de saída
+            source_offset: Início do vídeo na live (usa o feature_store)
         
         Returns:
             Caminho do vídeo otimizado
@@ -67,7 +90,7 @@ class VideoOptimizer:
         try:
             # PASSO 1: Remover silêncios
             print(f"   [1/3] Removendo silêncios...")
-            no_silence_video = self._remove_silences(input_video, temp_video)
+            no_silence_video = self._remove_silences(input_video, temp_video, source_offset)
             
             # PASSO 2: Acelerar vídeo
             print(f"   [2/3] Acelerando {self.speed_factor}x...")
@@ -93,67 +116,19 @@ class VideoOptimizer:
                 shutil.copy(input_video, output_video)
             return output_video
     
-    def _remove_silences(self, input_video, output_video):
+    def _remove_silences(self, input_video, output_video, source_offset=None):
         """Remove silêncios longos do vídeo."""
         
-        # Detectar silêncios com ffmpeg
-        cmd_detect = [
-            'ffmpeg',
-            '-i', input_video,
-            '-af', f'silencedetect=noise={self.silence_threshold}dB:d={self.min_silence_duration}',
-            '-f', 'null',
-            '-'
-        ]
+        silences = None
+        duration = None
+        if self.feature_store is not None and source_offset is not None:
+            duration = self._get_video_duration(input_video)
+            silences = self.silences_from_store(source_offset, duration)
         
-        result = subprocess.run(
-            cmd_detect,
-            capture_output=True,
-            text=True,
-            encoding='utf-8',
-            errors='ignore'
-        )
-        
-        # Parsear silêncios detectados
-        silences = self._parse_silence_output(result.stderr)
+        segments = self.detect_keep_segments(input_video, duration=duration, silences=silences)
         
-        if not silences:
-            # Sem silêncios longos, copiar vídeo
-            import shutil
-            shutil.copy(input_video, output_video)
-            return output_video
-        
-        # Criar filtro complexo para remover silêncios
-        filter_parts = []
-        segments = []
-        
-        # Obter duração total
-        duration = self._get_video_duration(input_video)
-        
-        # Criar segmentos (partes sem silêncio)
-        last_end = 0
-        
-        for silence in silences:
-            start = silence['start']
-            end = silence['end']
-            
-            # Adicionar segmento antes do silêncio
-            if start - last_end > 0.1:  # Mínimo 0.1s
-                segments.append({
-                    'start': last_end,
-                    'end': start + self.keep_silence_padding  # Manter um pouco
-                })
-            
-            last_end = max(last_end, end - self.keep_silence_padding)
-        
-        # Adicionar último segmento
-        if duration - last_end > 0.1:
-            segments.append({
-                'start': last_end,
-                'end': duration
-            })
-        
-        # Se muito poucos segmentos, não vale a pena
-        if len(segments) <= 1:
+        # Sem silêncios longos (ou poucos segmentos), copiar vídeo
+        if not segments:
             import shutil
             shutil.copy(input_video, output_video)
             return output_video
@@ -192,6 +167,86 @@ class VideoOptimizer:
         
         return output_video
     
+    def detect_keep_segments(self, input_media, start=None, duration=None, silences=None):
+        """
+        Detecta os trechos a MANTER (entre silêncios longos).
+        
+        Args:
+            input_media: Vídeo ou áudio (ex: audio.wav do pipeline)
+            start: Início do trecho a analisar (None = início do arquivo)
+            duration: Duração do trecho (None = até o fim)
+            silences: Silêncios já conhecidos, relativos a `start`
+                      (ex: SpeechMap.silences); pula o silencedetect
+        
+        Returns:
+            Lista de {'start', 'end'} relativos a `start`,
+            ou [] se não há silêncios que valha a pena remover
+        """
+        if silences is None:
+            silences = self._detect_silences(input_media, start, duration)
+        
+        if not silences:
+            return []
+        
+        # Obter duração total
+        if duration is None:
+            duration = self._get_video_duration(input_media)
+        
+        # Criar segmentos (partes sem silêncio)
+        segments = []
+        last_end = 0
+        
+        for silence in silences:
+            silence_start = silence['start']
+            silence_end = silence['end']
+            
+            # Adicionar segmento antes do silêncio
+            if silence_start - last_end > 0.1:  # Mínimo 0.1s
+                segments.append({
+                    'start': last_end,
+                    'end': silence_start + self.keep_silence_padding  # Manter um pouco
+                })
+            
+            last_end = max(last_end, silence_end - self.keep_silence_padding)
+        
+        # Adicionar último segmento
+        if duration - last_end > 0.1:
+            segments.append({
+                'start': last_end,
+                'end': duration
+            })
+        
+        # Se muito poucos segmentos, não vale a pena
+        if len(segments) <= 1:
+            return []
+        
+        return segments
+    
+    def _detect_silences(self, input_media, start=None, duration=None):
+        """Silêncios do trecho via ffmpeg silencedetect."""
+        cmd_detect = ['ffmpeg']
+        if start is not None:
+            cmd_detect += ['-ss', str(start)]
+        if duration is not None:
+            cmd_detect += ['-t', str(duration)]
+        cmd_detect += [
+            '-i', input_media,
+            '-vn',
+            '-af', f'silencedetect=noise={self.silence_threshold}dB:d={self.min_silence_duration}',
+            '-f', 'null',
+            '-'
+        ]
+        
+        result = subprocess.run(
+            cmd_detect,
+            capture_output=True,
+            text=True,
+            encoding='utf-8',
+            errors='ignore'
+        )
+        
+        return self._parse_silence_output(result.stderr)
+    
     def _adjust_speed(self, input_video, output_video):
         """Acelera vídeo mantendo pitch do áudio."""
         
@@ -224,7 +279,7 @@ class VideoOptimizer:
         cmd = [
             'ffmpeg',
             '-i', input_video,
-            '-af', 'loudnorm=I=-16:LRA=11:TP=-1.5',
+            '-af', self.LOUDNORM_FILTER,
             '-c:v', 'copy',
             '-c:a', 'aac',
             '-b:a', '192k',
@@ -2,13 +2,28 @@
 
 import cv2
 
-def detect_visual_activity(video_path, threshold=30):
+def detect_visual_activity(video_path, threshold=30, index=None, index_dir=None,
+                           start=0.0, end=None):
     """
     Detecta atividade visual (movimento forte),
     útil para identificar memes, overlays, reações.
     Retorna lista de eventos com tempo e intensidade.
+
+    index (VisualFeatureIndex da live) + start/end do clip na live: consulta
+    o índice, tempos relativos ao clip. index_dir: abre/cria o índice do
+    próprio vídeo nesse diretório. A intensidade é a mesma diferença entre
+    frames consecutivos, mas só nos frames amostrados
+    (VisualFeatureIndex.ANALYSIS_FPS). Sem index nem index_dir lê todos os
+    frames, sem gravar nada.
     """
 
+    if index is None and index_dir is not None:
+        from Components.VisualFeatureIndex import VisualFeatureIndex
+        index = VisualFeatureIndex.open_or_build(video_path, index_dir)
+        start, end = 0.0, None
+    if index is not None:
+        return index.motion_events(threshold, start=start, end=end)
+
     cap = cv2.VideoCapture(video_path)
     fps = cap.get(cv2.CAP_PROP_FPS)
 
@@ -0,0 +1,429 @@
+# Components/VisualFeatureIndex.py
+"""
+=============================================================================
+ÍNDICE DE FEATURES VISUAIS (UMA PASSADA POR VÍDEO)
+=============================================================================
+
+✨ FEATURES:
+- Um único decode do vídeo, já reduzido pelo ffmpeg (fps + scale + cinza),
+  na taxa de análise (ANALYSIS_FPS, padrão 2 amostras/s)
+- Por amostra:
+    frame_motion           diferença média entre frames CONSECUTIVOS, na
+                           resolução original (tblend do ffmpeg): mesma
+                           escala 0-255 do detect_visual_activity antigo
+    motion                 diferença média entre amostras (0.5s)
+    motion_left/center/right  idem, por terço da tela
+    (movimento/cena vêm de um frame reduzido por vizinho mais próximo e
+    subamostrado: pixels da fonte sem suavização, então a média da
+    diferença fica na escala da resolução original)
+    scene                  mudança de cena (diferença de histogramas, 0-1)
+    face_left/face_right   faces (Haar) nos cantos (0-25% e 75-100%)
+    columns                fração de pixels claros por faixa de coluna
+                           (COLUMN_BINS), mesma medida do
+                           VisualTracker.detect_active_x (blur + limiar 25)
+- Resolução do decode ligada ao MIN_FACE_SIZE: a menor face ainda ocupa a
+  janela mínima do Haar (24 px); o movimento usa uma versão ainda menor,
+  por amostragem de pixels (reduzir com média baixaria a diferença)
+- Salvo como array estruturado .npy + metadados .json (mesmo formato do
+  AudioFeatureStore), aberto com mmap
+- Detectores viram consultas baratas, sem reler pixels:
+    VisualEvents.detect_visual_activity      → motion_events()
+    MemeCornerDetector.detect_meme_corners   → corner_events()
+    MemeCornerDetector._detect_by_motion_regions → motion_region_events()
+    VisualTracker.detect_active_x            → active_x()
+- Calculado UMA vez na live (run_pipeline) e consultado por clip com
+  start/end (tempos relativos ao início do clip)
+
+⚠️ LIMIARES:
+- motion_events compara frame_motion: o threshold=30 e o "> 45" do
+  CameraEventCollector continuam na escala original
+- Mas só os frames amostrados (ANALYSIS_FPS) são avaliados: no máximo um
+  evento por amostra, e picos de movimento mais curtos que o intervalo
+  entre amostras podem não aparecer
+- motion_region_events usa motion_left/right (amostras a 0.5s, como o
+  sample_interval do MemeCornerDetector)
+
+📁 ARQUIVOS:
+    <video>_visual/visual_features.npy
+    <video>_visual/visual_features.json
+
+⚙️ USO:
+    index = VisualFeatureIndex.open_or_build('live.mp4', 'output/visual')
+    events = index.corner_events(show_duration=2.5, start=120.0, end=150.0)
+    motion = index.motion_events(threshold=30, start=120.0, end=150.0)
+
+=============================================================================
+"""
+
+import os
+import json
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+try:
+    import cv2
+except ImportError:
+    cv2 = None
+
+
+# Faixas de coluna do active_x (15 px numa fonte de 1920)
+COLUMN_BINS = 128
+
+# detect_active_x: GaussianBlur 21x21 e limiar de brilho 25 (px da fonte)
+ACTIVE_BLUR = 21
+ACTIVE_THRESHOLD = 25
+
+FEATURE_DTYPE = np.dtype([
+    ('frame_motion', '<f4'),
+    ('motion', '<f4'),
+    ('motion_left', '<f4'),
+    ('motion_center', '<f4'),
+    ('motion_right', '<f4'),
+    ('scene', '<f4'),
+    ('face_left', 'u1'),
+    ('face_right', 'u1'),
+    ('columns', 'u1', (COLUMN_BINS,))
+])
+
+CASCADE_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    "haarcascade_frontalface_default.xml"
+)
+
+# Menor janela do haarcascade_frontalface_default
+HAAR_WINDOW = 24
+
+
+def face_scale(min_face_size):
+    """Escala em que a menor face (px da fonte) ainda cabe na janela do Haar."""
+    return min(1.0, HAAR_WINDOW / float(min_face_size))
+
+
+def _box_blur(gray, k):
+    """Média k x k (somas acumuladas 2D; bordas replicadas)."""
+    if k <= 1:
+        return gray.astype(np.float32)
+    pad = k // 2
+    padded = np.pad(gray.astype(np.float32), pad, mode='edge')
+    sums = np.pad(padded.cumsum(axis=0).cumsum(axis=1), ((1, 0), (1, 0)))
+    h, w = gray.shape
+    return (sums[k:k + h, k:k + w] - sums[:h, k:k + w] - sums[k:k + h, :w] + sums[:h, :w]) / (k * k)
+
+
+def load_face_cascade():
+    """Cascade de faces (None sem OpenCV ou sem o XML)."""
+    if cv2 is None or not os.path.exists(CASCADE_PATH):
+        return None
+    return cv2.CascadeClassifier(CASCADE_PATH)
+
+
+def probe_video(video_path):
+    """(largura, altura, duração) do vídeo."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height:format=duration',
+        '-of', 'json',
+        str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        data = json.loads(result.stdout)
+        stream = data['streams'][0]
+        return int(stream['width']), int(stream['height']), float(data['format']['duration'])
+    except (ValueError, KeyError, IndexError):
+        return 0, 0, 0.0
+
+
+class VisualFeatureIndex:
+    """Features visuais por amostra de um vídeo, mapeadas em memória."""
+
+    DATA_FILE = 'visual_features.npy'
+    META_FILE = 'visual_features.json'
+
+    ANALYSIS_FPS = 2.0          # Mesmo sample_interval (0.5s) do MemeCornerDetector
+    MIN_FACE_SIZE = 40          # Px da fonte (define a resolução do decode)
+    FACE_REGION_RATIO = 0.25    # Cantos: 0-25% e 75-100%
+    MOTION_STEP = 4             # Subamostragem extra para movimento/cena
+    SCENE_BINS = 16
+    VERSION = 3                 # 3: colunas do active_x
+
+    def __init__(self, data, meta):
+        """Use build() ou open()."""
+        self.data = data
+        self.meta = meta
+        self.fps = meta['fps']
+        self.duration = meta['duration']
+        self.width = meta['source_width']
+        self.height = meta['source_height']
+
+    @classmethod
+    def params(cls):
+        """Parâmetros que definem o índice."""
+        return {
+            'fps': cls.ANALYSIS_FPS,
+            'min_face_size': cls.MIN_FACE_SIZE,
+            'face_region_ratio': cls.FACE_REGION_RATIO,
+            'motion_step': cls.MOTION_STEP,
+            'scene_bins': cls.SCENE_BINS,
+            'version': cls.VERSION,
+            'dtype': FEATURE_DTYPE.descr
+        }
+
+    @staticmethod
+    def default_dir(video_path):
+        return f"{Path(video_path).with_suffix('')}_visual"
+
+    # -------------------------------------------------------------------------
+    # CRIAÇÃO / ABERTURA
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def build(cls, video_path, output_dir=None):
+        """
+        Decodifica o vídeo uma vez (reduzido, cinza) e calcula as features.
+
+        Args:
+            video_path: Vídeo de entrada
+            output_dir: Diretório de saída (padrão <video>_visual)
+
+        Returns:
+            VisualFeatureIndex aberto
+        """
+        print("👁️  Indexando features visuais (passada única)...")
+
+        output_dir = Path(output_dir or cls.default_dir(video_path))
+        output_dir.mkdir(parents=True, exist_ok=True)
+
+        width, height, duration = probe_video(video_path)
+        if not width:
+            raise ValueError(f"Não foi possível ler o vídeo: {video_path}")
+
+        scale = face_scale(cls.MIN_FACE_SIZE)
+        w = max(2, int(round(width * scale / 2)) * 2)
+        h = max(2, int(round(height * scale / 2)) * 2)
+        min_face = max(HAAR_WINDOW, int(round(cls.MIN_FACE_SIZE * w / width)))
+        blur = max(1, int(round(ACTIVE_BLUR * w / width)) | 1)
+        column_edges = np.linspace(0, w, COLUMN_BINS + 1).astype(int)[:-1]
+        cascade = load_face_cascade()
+
+        cmd = [
+            'ffmpeg',
+            '-v', 'error',
+            '-i', str(video_path),
+            '-an',
+            # Três faixas: frame cinza reduzido (faces); o mesmo frame por
+            # vizinho mais próximo (movimento/cena, sem suavizar); diferença
+            # com o frame anterior, calculada na resolução original e só
+            # depois reduzida (flags=area preserva a média)
+            '-filter_complex',
+            f'[0:v]format=gray,split=3[a][p][b];'
+            f'[b]tblend=all_mode=difference,scale={w}:{h}:flags=area[d];'
+            f'[a]scale={w}:{h}[g];'
+            f'[p]scale={w}:{h}:flags=neighbor[n];'
+            f'[g][n][d]vstack=inputs=3,fps={cls.ANALYSIS_FPS}[out]',
+            '-map', '[out]',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'gray',
+            '-'
+        ]
+        process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+        frame_bytes = w * h * 3
+        corner = int(w * cls.FACE_REGION_RATIO)
+        rows = []
+        previous = None
+        previous_hist = None
+
+        while True:
+            buffer = process.stdout.read(frame_bytes)
+            if len(buffer) < frame_bytes:
+                break
+            stacked = np.frombuffer(buffer, dtype=np.uint8).reshape(3 * h, w)
+            gray = stacked[:h]
+            row = np.zeros((), dtype=FEATURE_DTYPE)
+            row['frame_motion'] = stacked[2 * h:].mean()
+
+            small = stacked[h:2 * h:cls.MOTION_STEP, ::cls.MOTION_STEP].astype(np.int16)
+            hist = np.bincount(small.ravel() * cls.SCENE_BINS // 256, minlength=cls.SCENE_BINS) / small.size
+
+            if previous is not None:
+                diff = np.abs(small - previous)
+                third = diff.shape[1] // 3
+                row['motion'] = diff.mean()
+                row['motion_left'] = diff[:, :third].mean()
+                row['motion_center'] = diff[:, third:2 * third].mean()
+                row['motion_right'] = diff[:, 2 * third:].mean()
+                row['scene'] = 0.5 * np.abs(hist - previous_hist).sum()
+
+            bright = _box_blur(gray, blur) > ACTIVE_THRESHOLD
+            row['columns'] = np.add.reduceat(bright.mean(axis=0), column_edges) \
+                / np.diff(np.append(column_edges, w)) * 255
+
+            if cascade is not None:
+                for field, roi in (('face_left', gray[:, :corner]), ('face_right', gray[:, w - corner:])):
+                    faces = cascade.detectMultiScale(roi, 1.1, 5, minSize=(min_face, min_face))
+                    row[field] = min(255, len(faces))
+
+            rows.append(row)
+            previous, previous_hist = small, hist
+
+        process.stdout.close()
+        process.wait()
+
+        data = np.array(rows, dtype=FEATURE_DTYPE)
+        np.save(output_dir / cls.DATA_FILE, data)
+
+        stat = os.stat(video_path)
+        meta = {
+            'source': str(video_path),
+            'source_size': stat.st_size,
+            'source_mtime': stat.st_mtime,
+            'source_width': width,
+            'source_height': height,
+            'analysis_width': w,
+            'analysis_height': h,
+            'faces': cascade is not None,
+            'fps': cls.ANALYSIS_FPS,
+            'n_samples': len(data),
+            'duration': duration or len(data) / cls.ANALYSIS_FPS,
+            'params': cls.params()
+        }
+        with open(output_dir / cls.META_FILE, 'w', encoding='utf-8') as f:
+            json.dump(meta, f, indent=2)
+
+        print(f"   ✅ {len(data)} amostras ({w}x{h} @ {cls.ANALYSIS_FPS} fps)")
+
+        return cls.open(output_dir)
+
+    @classmethod
+    def open(cls, output_dir):
+        """Abre índice salvo (mmap)."""
+        output_dir = Path(output_dir)
+        with open(output_dir / cls.META_FILE, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        data = np.load(output_dir / cls.DATA_FILE, mmap_mode='r')
+        return cls(data, meta)
+
+    @classmethod
+    def open_or_build(cls, video_path, output_dir=None):
+        """Abre se já existe para o mesmo vídeo (caminho, tamanho, mtime), senão calcula."""
+        output_dir = Path(output_dir or cls.default_dir(video_path))
+        meta_path = output_dir / cls.META_FILE
+        if meta_path.exists() and (output_dir / cls.DATA_FILE).exists():
+            with open(meta_path, 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            stat = os.stat(video_path)
+            if (meta.get('source') == str(video_path)
+                    and meta.get('source_size') == stat.st_size
+                    and meta.get('source_mtime') == stat.st_mtime
+                    and meta.get('params') == json.loads(json.dumps(cls.params()))):
+                return cls.open(output_dir)
+        return cls.build(video_path, output_dir)
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS POR TEMPO
+    # -------------------------------------------------------------------------
+
+    def __len__(self):
+        return len(self.data)
+
+    def sample_index(self, t):
+        """Amostra mais próxima de `t` (segundos)."""
+        return int(np.clip(round(t * self.fps), 0, len(self.data) - 1))
+
+    def slice(self, start=0.0, end=None):
+        """(tempos relativos a start, amostras) entre start e end."""
+        first = max(0, int(np.ceil(start * self.fps - 1e-9)))
+        last = len(self.data) if end is None else min(len(self.data), int(np.floor(end * self.fps + 1e-9)) + 1)
+        times = np.arange(first, max(first, last)) / self.fps - start
+        return times, self.data[first:max(first, last)]
+
+    def motion_events(self, threshold=30, start=0.0, end=None):
+        """
+        Amostras com movimento forte (formato do detect_visual_activity).
+
+        Compara frame_motion (diferença entre frames consecutivos, escala
+        do detect_visual_activity original), só nos frames amostrados.
+
+        Returns:
+            [{"time", "intensity"}] com time relativo a start
+        """
+        times, rows = self.slice(start, end)
+        hits = np.flatnonzero(rows['frame_motion'] > threshold)
+        return [
+            {"time": round(float(times[i]), 3), "intensity": float(rows['frame_motion'][i])}
+            for i in hits
+        ]
+
+    def corner_events(self, show_duration=2.5, sample_interval=None, start=0.0, end=None):
+        """
+        Faces nos cantos (formato do detect_meme_corners, já mescladas).
+
+        Returns:
+            [{"start", "end", "region": "left"|"right"}]
+        """
+        from Components.MemeCornerDetector import _merge_overlapping_events
+
+        times, rows = self.slice(start, end)
+        clip_end = (self.duration if end is None else end) - start
+        step = self._step(sample_interval)
+
+        events = []
+        for i in range(0, len(rows), step):
+            t = float(times[i])
+            for region in ('left', 'right'):
+                if rows[f'face_{region}'][i] > 0:
+                    events.append({
+                        "start": max(0, t - 0.2),
+                        "end": min(clip_end, t + show_duration),
+                        "region": region
+                    })
+        return _merge_overlapping_events(events)
+
+    def motion_region_events(self, show_duration=2.5, sample_interval=None, threshold=25,
+                             ratio=1.3, start=0.0, end=None):
+        """
+        Movimento forte em um terço lateral comparado ao outro
+        (formato do _detect_by_motion_regions, já mesclado).
+        """
+        from Components.MemeCornerDetector import _merge_overlapping_events
+
+        times, rows = self.slice(start, end)
+        step = self._step(sample_interval)
+
+        events = []
+        for i in range(step, len(rows), step):
+            t = float(times[i])
+            left, right = float(rows['motion_left'][i]), float(rows['motion_right'][i])
+            if left > threshold and left > right * ratio:
+                events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "left"})
+            elif right > threshold and right > left * ratio:
+                events.append({"start": max(0, t - 0.2), "end": t + show_duration, "region": "right"})
+        return _merge_overlapping_events(events)
+
+    def active_x(self, t, video_width=None, vertical_width=608):
+        """
+        Borda esquerda da janela vertical centrada na faixa com mais
+        pixels claros em `t` (mesma medida do VisualTracker.detect_active_x,
+        com resolução de COLUMN_BINS faixas), limitada à largura do vídeo.
+        """
+        video_width = video_width or self.width
+        columns = np.asarray(self.data['columns'][self.sample_index(t)])
+        center_x = int((int(np.argmax(columns)) + 0.5) * video_width / COLUMN_BINS)
+        left = max(0, center_x - vertical_width // 2)
+        return min(left, max(0, video_width - vertical_width))
+
+    def scene_changes(self, threshold=0.5, start=0.0, end=None):
+        """Tempos (relativos a start) com mudança de cena."""
+        times, rows = self.slice(start, end)
+        return [round(float(times[i]), 3) for i in np.flatnonzero(rows['scene'] > threshold)]
+
+    def _step(self, sample_interval):
+        """Amostras do índice por amostra pedida."""
+        if not sample_interval:
+            return 1
+        return max(1, int(round(sample_interval * self.fps)))
@@ -21,3 +21,11 @@ def detect_active_x(frame):
     right = min(VIDEO_WIDTH - VERTICAL_WIDTH, left)
 
     return left
+
+
+def detect_active_x_at(index, t):
+    """
+    Mesmo X do detect_active_x, consultando o VisualFeatureIndex no
+    tempo t (segundos), sem decodificar o frame.
+    """
+    return index.active_x(t, video_width=VIDEO_WIDTH, vertical_width=VERTICAL_WIDTH)
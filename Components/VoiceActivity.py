@@ -0,0 +1,324 @@
+# Components/VoiceActivity.py
+"""
+=============================================================================
+MAPA DE FALA (VAD) DA LIVE INTEIRA
+=============================================================================
+
+✨ FEATURES:
+- Pré-passo com webrtcvad no audio.wav (frames de 30 ms, em blocos)
+- Regiões de fala suavizadas (junta pausas curtas, descarta estalos)
+  e com padding nas bordas
+- Áudio "compactado": só as regiões de fala, para o Whisper não gastar
+  tempo em horas de gameplay sem ninguém falando
+- Remapeamento de tempos compactado → timeline original
+- Mapa salvo em JSON (vad_map.json) para reuso: remoção de silêncios
+  e ajuste das bordas dos clips
+
+⚙️ USO:
+    speech_map = SpeechMap.build('audio.wav')
+    speech_map.save('output/vad_map.json')
+
+    packed = PackedAudio(WavReader('audio.wav'), speech_map)
+    y = packed.read(0, 60)          # 60s de FALA
+    t = packed.to_source(42.0)      # tempo na live original
+
+=============================================================================
+"""
+
+import json
+from bisect import bisect_right
+
+import numpy as np
+
+# Só o build() precisa do VAD (opcional: --vad); carregar/remapear um mapa não
+try:
+    import webrtcvad
+except ImportError:
+    webrtcvad = None
+
+from Components.AudioStream import WavReader
+
+
+class SpeechMap:
+    """Regiões de fala [(start, end)] em segundos da timeline original."""
+
+    AGGRESSIVENESS = 2          # 0-3 (mesmo valor do Speaker.py)
+    FRAME_MS = 30
+    MIN_SILENCE_SEC = 0.5       # Pausas menores fazem parte da fala
+    MIN_SPEECH_SEC = 0.25       # Falas menores são descartadas (estalos)
+    PADDING_SEC = 0.3           # Margem antes/depois de cada região
+    BLOCK_SEC = 60              # Áudio lido por vez
+
+    def __init__(self, regions, duration=None):
+        """
+        Args:
+            regions: Lista de (start, end) ordenada e sem sobreposição
+            duration: Duração total do áudio
+        """
+        self.regions = [(float(s), float(e)) for s, e in regions]
+        self.duration = duration if duration is not None else (self.regions[-1][1] if self.regions else 0.0)
+        self._starts = [s for s, _ in self.regions]
+
+    @classmethod
+    def params(cls):
+        """Parâmetros que definem o mapa (chave do StageCache)."""
+        return {
+            'aggressiveness': cls.AGGRESSIVENESS,
+            'frame_ms': cls.FRAME_MS,
+            'min_silence_sec': cls.MIN_SILENCE_SEC,
+            'min_speech_sec': cls.MIN_SPEECH_SEC,
+            'padding_sec': cls.PADDING_SEC
+        }
+
+    @classmethod
+    def build(cls, audio_path):
+        """
+        Roda o VAD no áudio inteiro.
+
+        Args:
+            audio_path: WAV PCM 16-bit mono (8/16/32/48 kHz)
+
+        Returns:
+            SpeechMap
+        """
+        if webrtcvad is None:
+            raise ImportError("webrtcvad não instalado: pip install webrtcvad")
+
+        print("🗣️  Detectando fala (VAD)...")
+
+        reader = WavReader(audio_path)
+        vad = webrtcvad.Vad(cls.AGGRESSIVENESS)
+
+        frame = int(reader.sample_rate * cls.FRAME_MS / 1000)
+        frame_sec = frame / reader.sample_rate
+        block = max(1, int(cls.BLOCK_SEC / frame_sec)) * frame
+
+        raw = []
+        current = None
+
+        for block_start in range(0, len(reader) - frame + 1, block):
+            pcm = reader.read_pcm16(block_start, min(len(reader), block_start + block))
+            n_bytes = frame * 2
+
+            for offset in range(0, len(pcm) - n_bytes + 1, n_bytes):
+                t = (block_start + offset // 2) / reader.sample_rate
+                if vad.is_speech(pcm[offset:offset + n_bytes], reader.sample_rate):
+                    if current is None:
+                        current = [t, t + frame_sec]
+                    else:
+                        current[1] = t + frame_sec
+                elif current is not None and t - current[1] >= cls.MIN_SILENCE_SEC:
+                    raw.append(tuple(current))
+                    current = None
+
+        if current is not None:
+            raw.append(tuple(current))
+
+        regions = cls._finalize(raw, reader.duration)
+        speech_map = cls(regions, reader.duration)
+
+        print(f"   ✅ {len(regions)} regiões, {speech_map.speech_duration() / 60:.1f} de "
+              f"{reader.duration / 60:.1f} min com fala")
+
+        return speech_map
+
+    @classmethod
+    def _finalize(cls, raw, duration):
+        """Descarta falas curtas, aplica padding e junta sobreposições."""
+        regions = []
+
+        for start, end in raw:
+            if end - start < cls.MIN_SPEECH_SEC:
+                continue
+
+            start = max(0.0, start - cls.PADDING_SEC)
+            end = min(duration, end + cls.PADDING_SEC)
+
+            if regions and start <= regions[-1][1]:
+                regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+            else:
+                regions.append((start, end))
+
+        return regions
+
+    # -------------------------------------------------------------------------
+    # CONSULTAS
+    # -------------------------------------------------------------------------
+
+    def speech_duration(self):
+        """Total de segundos com fala."""
+        return sum(e - s for s, e in self.regions)
+
+    def is_speech(self, t):
+        """True se `t` está dentro de uma região de fala."""
+        k = bisect_right(self._starts, t) - 1
+        return k >= 0 and t < self.regions[k][1]
+
+    def silences(self, start, end, min_duration=0.0):
+        """
+        Silêncios dentro de [start, end], relativos a `start`.
+
+        Mesmo formato do _parse_silence_output do VideoOptimizer,
+        para pular o silencedetect do ffmpeg.
+
+        Returns:
+            Lista de {'start', 'end', 'duration'}
+        """
+        silences = []
+        cursor = start
+
+        k = max(0, bisect_right(self._starts, start) - 1)
+        for s, e in self.regions[k:]:
+            if s >= end:
+                break
+            if e <= start:
+                continue
+            if s - cursor >= min_duration and s > cursor:
+                silences.append((cursor, s))
+            cursor = max(cursor, e)
+
+        if end - cursor >= min_duration and end > cursor:
+            silences.append((cursor, end))
+
+        return [
+            {'start': s - start, 'end': e - start, 'duration': e - s}
+            for s, e in silences
+        ]
+
+    def snap_to_silence(self, t, max_shift=1.0):
+        """
+        Move uma borda de clip para fora da fala, se der.
+
+        Se `t` cai no meio de uma região de fala, vai para a borda mais
+        próxima da região (até `max_shift` segundos); senão fica igual.
+        """
+        k = bisect_right(self._starts, t) - 1
+        if k < 0 or t >= self.regions[k][1]:
+            return t
+
+        start, end = self.regions[k]
+        nearest = start if t - start <= end - t else end
+
+        return nearest if abs(nearest - t) <= max_shift else t
+
+    # -------------------------------------------------------------------------
+    # PERSISTÊNCIA
+    # -------------------------------------------------------------------------
+
+    def to_dict(self):
+        return {
+            'params': self.params(),
+            'duration': self.duration,
+            'regions': [[s, e] for s, e in self.regions]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls([tuple(r) for r in data['regions']], data.get('duration'))
+
+    def save(self, path):
+        """Salva o mapa em JSON."""
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f)
+        return path
+
+    @classmethod
+    def load(cls, path):
+        """Carrega mapa salvo por save()."""
+        with open(path, 'r', encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+class PackedAudio:
+    """
+    Áudio só com as regiões de fala, em sequência.
+
+    Tem a mesma interface de leitura do WavReader (duration, sample_rate,
+    read), então os chunks do Whisper são calculados sobre ele.
+    """
+
+    GAP_SEC = 0.2   # Silêncio entre regiões (evita colar palavras)
+
+    def __init__(self, reader, speech_map):
+        """
+        Args:
+            reader: WavReader do áudio original
+            speech_map: SpeechMap do mesmo áudio
+        """
+        self.reader = reader
+        self.sample_rate = reader.sample_rate
+        self.regions = speech_map.regions
+
+        # Início de cada região na timeline compactada
+        self.packed_starts = []
+        cursor = 0.0
+        for start, end in self.regions:
+            self.packed_starts.append(cursor)
+            cursor += (end - start) + self.GAP_SEC
+
+        self.duration = max(0.0, cursor - self.GAP_SEC) if self.regions else 0.0
+
+    def read(self, start_sec=0.0, end_sec=None):
+        """Lê trecho da timeline compactada (regiões + gaps de silêncio)."""
+        end_sec = self.duration if end_sec is None else min(end_sec, self.duration)
+        pieces = []
+
+        k = max(0, bisect_right(self.packed_starts, start_sec) - 1)
+        cursor = start_sec
+
+        for index in range(k, len(self.regions)):
+            packed_start = self.packed_starts[index]
+            if packed_start >= end_sec:
+                break
+
+            source_start, source_end = self.regions[index]
+            packed_end = packed_start + (source_end - source_start)
+
+            # Gap antes desta região
+            if packed_start > cursor:
+                pieces.append(np.zeros(int(round((packed_start - cursor) * self.sample_rate)), dtype=np.float32))
+                cursor = packed_start
+
+            if cursor < packed_end:
+                piece_end = min(end_sec, packed_end)
+                offset = source_start + (cursor - packed_start)
+                pieces.append(self.reader.read(offset, offset + (piece_end - cursor)))
+                cursor = piece_end
+
+        if not pieces:
+            return np.zeros(0, dtype=np.float32)
+
+        return np.concatenate(pieces)
+
+    def to_source(self, t, side='start'):
+        """
+        Converte tempo compactado → timeline original.
+
+        Args:
+            t: Tempo na timeline compactada
+            side: Tempo caindo num gap vai para o início da próxima
+                  região ('start') ou fim da anterior ('end')
+        """
+        k = bisect_right(self.packed_starts, t) - 1
+        if k < 0:
+            return self.regions[0][0] if self.regions else t
+
+        source_start, source_end = self.regions[k]
+        source_t = source_start + (t - self.packed_starts[k])
+
+        if source_t <= source_end:
+            return source_t
+
+        if side == 'start' and k + 1 < len(self.regions):
+            return self.regions[k + 1][0]
+        return source_end
+
+    def remap_segments(self, segments):
+        """Leva segmentos Whisper (in-place) para a timeline original."""
+        for segment in segments:
+            segment['start'] = self.to_source(segment['start'], 'start')
+            segment['end'] = self.to_source(segment['end'], 'end')
+            for word in segment.get('words', []):
+                word['start'] = self.to_source(word['start'], 'start')
+                word['end'] = self.to_source(word['end'], 'end')
+        return segments
@@ -21,13 +21,18 @@ COMO USAR:
 =============================================================================
 """
 
+import numpy as np
+
+from Components.TranscriptIndex import TranscriptIndex
+
+
 def build_context_for_segments(segments, transcriptions, min_duration=45, max_duration=180):
     """
     Expande segmentos para ter contexto completo.
     
     Args:
         segments: Lista de dicts com start, end, reason
-        transcriptions: Lista de (palavra, start, end)
+        transcriptions: Lista de (palavra, start, end) ou TranscriptIndex
         min_duration: Duração mínima em segundos
         max_duration: Duração máxima em segundos
     
@@ -37,6 +42,7 @@ def build_context_for_segments(segments, transcriptions, min_duration=45, max_du
     if not segments or not transcriptions:
         return segments
     
+    transcriptions = TranscriptIndex.ensure(transcriptions)
     enhanced_segments = []
     
     for seg in segments:
@@ -85,6 +91,8 @@ def _expand_to_context(start, end, transcriptions, min_dur, max_dur):
     - Adiciona 3-5s de margem antes e depois
     - Busca pausas naturais (silêncios)
     """
+    transcriptions = TranscriptIndex.ensure(transcriptions)
+    
     # Margem de segurança
     BEFORE_MARGIN = 3.0  # 3s antes do setup
     AFTER_MARGIN = 2.0   # 2s após a reação
@@ -106,34 +114,36 @@ def _expand_to_context(start, end, transcriptions, min_dur, max_dur):
 
 def _align_to_word_start(timestamp, transcriptions, direction="before"):
     """Ajusta timestamp para não cortar palavra no início."""
-    for word, start, end in transcriptions:
-        if direction == "before":
-            # Buscar palavra ANTES ou NO timestamp
-            if start <= timestamp <= end:
-                return start  # Começar na palavra toda
-            elif end < timestamp < start:
-                return start  # Pular gap e pegar próxima
-        else:
-            # Buscar palavra DEPOIS do timestamp
-            if start >= timestamp:
-                return start
+    index = TranscriptIndex.ensure(transcriptions)
+    
+    if direction == "before":
+        # Palavra que contém o timestamp: começar na palavra toda
+        i = index.word_containing(timestamp)
+        if i is not None:
+            return float(index.starts[i])
+    else:
+        # Primeira palavra DEPOIS do timestamp
+        start = index.first_start_at_or_after(timestamp)
+        if start is not None:
+            return start
     
     return timestamp
 
 
 def _align_to_word_end(timestamp, transcriptions, direction="after"):
     """Ajusta timestamp para não cortar palavra no final."""
-    for word, start, end in reversed(transcriptions):
-        if direction == "after":
-            # Buscar palavra DEPOIS ou NO timestamp
-            if start <= timestamp <= end:
-                return end  # Terminar na palavra toda
-            elif start < timestamp < end:
-                return end
-        else:
-            # Buscar palavra ANTES do timestamp
-            if end <= timestamp:
-                return end
+    index = TranscriptIndex.ensure(transcriptions)
+    
+    if direction == "after":
+        # Palavra que contém o timestamp: terminar na palavra toda
+        j = index.last_containing(timestamp)
+        if j is not None:
+            return float(index.ends[j])
+    else:
+        # Última palavra ANTES do timestamp
+        end = index.last_end_at_or_before(timestamp)
+        if end is not None:
+            return end
     
     return timestamp
 
@@ -144,33 +154,27 @@ def _find_natural_pause(timestamp, transcriptions, direction="before", gap_thres
     
     Args:
         timestamp: Tempo alvo
-        transcriptions: Lista de palavras
+        transcriptions: Lista de palavras ou TranscriptIndex
         direction: "before" ou "after"
         gap_threshold: Tamanho mínimo do gap em segundos
     
     Returns:
         Timestamp ajustado para começar/terminar em pausa
     """
-    # Buscar gaps entre palavras
-    for i in range(len(transcriptions) - 1):
-        curr_word, curr_start, curr_end = transcriptions[i]
-        next_word, next_start, next_end = transcriptions[i + 1]
-        
-        gap = next_start - curr_end
-        
-        if gap >= gap_threshold:
-            # Encontrou pausa
-            gap_middle = curr_end + (gap / 2)
-            
-            if direction == "before":
-                # Quer pausa ANTES do timestamp
-                if gap_middle <= timestamp <= gap_middle + 2:
-                    return next_start  # Começar após a pausa
-            
-            else:
-                # Quer pausa DEPOIS do timestamp
-                if gap_middle - 2 <= timestamp <= gap_middle:
-                    return curr_end  # Terminar antes da pausa
+    index = TranscriptIndex.ensure(transcriptions)
+    positions, middles = index.pauses(gap_threshold)
+    
+    if direction == "before":
+        # Pausa ANTES do timestamp (meio da pausa até 2s antes)
+        k = int(np.searchsorted(middles, timestamp - 2, side='left'))
+        if k < len(middles) and middles[k] <= timestamp:
+            return float(index.starts[positions[k] + 1])  # Começar após a pausa
+    
+    else:
+        # Pausa DEPOIS do timestamp (meio da pausa até 2s depois)
+        k = int(np.searchsorted(middles, timestamp, side='left'))
+        if k < len(middles) and middles[k] <= timestamp + 2:
+            return float(index.ends[positions[k]])  # Terminar antes da pausa
     
     return timestamp
 
@@ -185,11 +189,8 @@ def validate_segment_context(segment, transcriptions):
     start = segment["start"]
     end = segment["end"]
     
-    # Contar palavras no segmento
-    words_in_segment = [
-        w for w, s, e in transcriptions
-        if start <= s <= end
-    ]
+    # Palavras no segmento (texto, start, end)
+    words_in_segment = TranscriptIndex.ensure(transcriptions).entries_between(start, end)
     
     # Buscar pausas longas no meio
     long_pauses = 0
@@ -321,6 +321,38 @@ class CameraControllerV2:
         
         return x1, y1, x2, y2
     
+    def solve_trajectory(self, duration: float):
+        """
+        Trajetória de todos os frames em uma passada NumPy.
+        
+        Mesmo comportamento do get_camera_position (foca no meme de maior
+        confidence, suavização exponencial, volta mais lenta), sem estado
+        por frame, com os limites do CameraLimits.
+        
+        Args:
+            duration: Duração total do vídeo em segundos
+        
+        Returns:
+            CameraTrajectory (x = centro da câmera, int16 por frame)
+        """
+        from Components.CameraTrajectory import solve_trajectory
+        from Components.CameraLimits import MAX_TRAVEL_RATIO
+        
+        events = [m for m in self.meme_events if m.get('position') in self.corner_positions]
+        
+        return solve_trajectory(
+            n_frames=int(duration * self.fps),
+            fps=self.fps,
+            default=self.corner_positions['center'],
+            starts=[m['timestamp'] for m in events],
+            ends=[m['timestamp'] + m.get('duration', 4.0) for m in events],
+            targets=[self.corner_positions[m['position']] for m in events],
+            priorities=[m.get('confidence', 0.5) for m in events],
+            smoothing=self.smoothing_factor,
+            return_speed=0.8,  # Volta um pouco mais lento
+            max_travel=self.video_width * MAX_TRAVEL_RATIO
+        )
+    
     def generate_camera_path(self, duration: float) -> List[Tuple[float, float, str]]:
         """
         Gera caminho completo da câmera para todo o vídeo.
@@ -341,16 +373,44 @@ class CameraControllerV2:
             crop_box = controller.calculate_crop_box(x_pos, frame_height)
             # Aplicar crop
         ```
+        
+        NOTA: para muitos frames prefira solve_trajectory() (arrays).
+        """
+        trajectory = self.solve_trajectory(duration)
+        
+        return list(zip(
+            trajectory.times.tolist(),
+            trajectory.x.astype(float).tolist(),
+            trajectory.states().tolist()
+        ))
+    
+    def compile_camera_path(self, duration: float, frame_height: int = None, tolerance: float = 1.0):
+        """
+        Caminho da câmera como keyframes lineares para o ffmpeg.
+        
+        Args:
+            duration: Duração total do vídeo em segundos
+            frame_height: Altura do frame (não usada: câmera só move em x)
+            tolerance: Erro máximo (pixels) da simplificação
+        
+        Returns:
+            CameraPath (x = borda esquerda do crop)
+        
+        USO:
+        ```python
+        path = controller.compile_camera_path(duration=120.0)
+        render_camera_path('in.mp4', 'out.mp4', path, crop_w=1080)
+        ```
         """
-        total_frames = int(duration * self.fps)
-        camera_path = []
+        from Render.CameraPathFFmpeg import CameraPath
+        
+        trajectory = self.solve_trajectory(duration)
         
-        for frame_num in range(total_frames):
-            current_time = frame_num / self.fps
-            x_pos, state = self.get_camera_position(current_time)
-            camera_path.append((current_time, x_pos, state))
+        # Mesma validação do calculate_crop_box, vetorizada
+        x1 = (trajectory.x.astype(np.float64) - self.output_width / 2).astype(np.int64)
+        x1 = np.clip(x1, 0, self.video_width - self.output_width)
         
-        return camera_path
+        return CameraPath.from_positions(trajectory.times, x1, tolerance=tolerance)
     
     def get_statistics(self) -> Dict:
         """
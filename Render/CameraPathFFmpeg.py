@@ -0,0 +1,364 @@
+# Render/CameraPathFFmpeg.py
+"""
+=============================================================================
+CAMINHO DE CÂMERA COMPILADO PARA O FFMPEG (SEM LOOP POR FRAME EM PYTHON)
+=============================================================================
+
+✨ FEATURES:
+- A câmera é só um offset x do crop ao longo do tempo: vira keyframes
+  (tempo, x, easing) com trechos 'hold', 'linear' ou 'ease' (smoothstep)
+- Compila de qualquer fonte de câmera do projeto:
+    from_intervals   SmartCropper.movement_intervals (left/center/right)
+    from_positions   caminho denso por frame (CameraControllerV2),
+                     simplificado com Ramer-Douglas-Peucker (tolerância
+                     em pixels)
+    from_timeline    CameraTimeline do FaceCrop (eventos com x fixo)
+- Saída como expressão de tempo do filtro crop (árvore de if() com
+  profundidade log n) ou arquivo sendcmd (caminhos muito longos)
+- Crop + scale + encode inteiros no filter graph multithread do ffmpeg:
+  velocidade limitada pelo encoder, não pelo interpretador
+
+⚙️ USO:
+    path = CameraPath.from_intervals(cropper.movement_intervals(memes), 1920, 608)
+    render_camera_path('clip.mp4', 'short.mp4', path, crop_w=608, crop_h=1080)
+
+=============================================================================
+"""
+
+import subprocess
+from pathlib import Path
+
+import numpy as np
+
+from Render.RenderGraph import _escape_filter_path
+
+
+EASINGS = ('hold', 'linear', 'ease')
+
+# Acima disso a expressão fica grande demais: usa sendcmd
+MAX_EXPRESSION_KEYFRAMES = 200
+
+
+class CameraPath:
+    """Keyframes (t, x, easing) do offset x do crop; easing vale até o próximo."""
+
+    def __init__(self, keyframes):
+        """
+        Args:
+            keyframes: Lista de (tempo, x, easing) — x é a borda esquerda
+                       do crop em pixels da fonte
+        """
+        keyframes = sorted(keyframes, key=lambda k: k[0])
+        self.times = np.array([float(k[0]) for k in keyframes], dtype=np.float64)
+        self.xs = np.array([float(k[1]) for k in keyframes], dtype=np.float64)
+        self.easings = [k[2] if len(k) > 2 else 'linear' for k in keyframes]
+
+        for easing in self.easings:
+            if easing not in EASINGS:
+                raise ValueError(f"Easing desconhecido: {easing}")
+
+    def __len__(self):
+        return len(self.times)
+
+    # -------------------------------------------------------------------------
+    # CONSTRUÇÃO
+    # -------------------------------------------------------------------------
+
+    @classmethod
+    def constant(cls, x):
+        return cls([(0.0, x, 'hold')])
+
+    @classmethod
+    def from_intervals(cls, intervals, width, crop_w, transition=0.0):
+        """
+        Intervalos (start, end, 'left'|'center'|'right') como os do
+        SmartCropper.movement_intervals (posteriores têm prioridade).
+
+        Args:
+            intervals: Lista de (start, end, position)
+            width: Largura da fonte
+            crop_w: Largura do crop na fonte
+            transition: Segundos de ease entre posições (0 = corte seco,
+                        igual ao render por frame)
+
+        Returns:
+            CameraPath
+        """
+        positions = {
+            'left': 0.0,
+            'center': float((width - crop_w) // 2),
+            'right': float(width - crop_w)
+        }
+        if not intervals:
+            return cls.constant(positions['center'])
+
+        def position_at(t):
+            value = positions['center']
+            for start, end, position in intervals:
+                if start <= t <= end:
+                    value = positions.get(position, positions['center'])
+            return value
+
+        # Trechos elementares entre todas as bordas: posição constante
+        bounds = sorted({0.0} | {float(b) for s, e, _ in intervals for b in (s, e) if b >= 0})
+        steps = []
+        for i, t in enumerate(bounds):
+            probe = (t + bounds[i + 1]) / 2 if i + 1 < len(bounds) else t + 1.0
+            x = position_at(probe)
+            if not steps or steps[-1][1] != x:
+                steps.append((t, x))
+
+        if transition <= 0:
+            return cls([(t, x, 'hold') for t, x in steps])
+
+        keyframes = [(steps[0][0], steps[0][1], 'hold')]
+        for t, x in steps[1:]:
+            previous = keyframes[-1]
+            # Movimento começa `transition` antes da borda (sem voltar no tempo)
+            move_start = max(previous[0], t - transition)
+            keyframes.append((move_start, previous[1], 'ease'))
+            keyframes.append((t, x, 'hold'))
+        return cls(_dedupe(keyframes))
+
+    @classmethod
+    def from_positions(cls, times, xs, tolerance=1.0):
+        """
+        Caminho denso (um x por frame) simplificado em trechos lineares.
+
+        Args:
+            times: Tempo de cada amostra
+            xs: Borda esquerda do crop em cada amostra
+            tolerance: Erro máximo (pixels) da aproximação
+
+        Returns:
+            CameraPath
+        """
+        times = np.asarray(times, dtype=np.float64)
+        xs = np.asarray(xs, dtype=np.float64)
+        if len(times) == 0:
+            return cls.constant(0.0)
+        if len(times) == 1:
+            return cls.constant(xs[0])
+
+        keep = _simplify(times, xs, tolerance)
+        return cls([(times[i], xs[i], 'linear') for i in keep])
+
+    @classmethod
+    def from_timeline(cls, timeline, default_x, duration, min_x=0, max_x=None):
+        """
+        CameraTimeline (trechos RLE de x fixo) como trechos 'hold'.
+
+        Returns:
+            CameraPath
+        """
+        def clamp(x):
+            x = max(min_x, int(x))
+            return min(x, max_x) if max_x is not None else x
+
+        keyframes = []
+        for start, _, x in timeline.segments(duration, default_x):
+            x = clamp(x)
+            if not keyframes or keyframes[-1][1] != x:
+                keyframes.append((start, x, 'hold'))
+        return cls(keyframes or [(0.0, clamp(default_x), 'hold')])
+
+    # -------------------------------------------------------------------------
+    # AVALIAÇÃO
+    # -------------------------------------------------------------------------
+
+    def x_at(self, t):
+        """x em um ou vários tempos (vetorizado, mesma fórmula do ffmpeg)."""
+        t = np.asarray(t, dtype=np.float64)
+        index = np.clip(np.searchsorted(self.times, t, side='right') - 1, 0, len(self.times) - 1)
+        x0 = self.xs[index]
+        nxt = np.minimum(index + 1, len(self.times) - 1)
+        span = self.times[nxt] - self.times[index]
+        u = np.clip(np.divide(t - self.times[index], span, out=np.zeros_like(t), where=span > 0), 0, 1)
+
+        kinds = np.array([EASINGS.index(e) for e in self.easings])[index]
+        weight = np.where(kinds == 1, u, np.where(kinds == 2, u * u * (3 - 2 * u), 0.0))
+        return x0 + (self.xs[nxt] - x0) * weight
+
+    # -------------------------------------------------------------------------
+    # SAÍDA FFMPEG
+    # -------------------------------------------------------------------------
+
+    def to_expression(self):
+        """
+        Expressão x do filtro crop (vírgulas escapadas para o filter graph).
+
+        Árvore binária de if(lt(t, T)): profundidade log n em vez de n.
+        """
+        def segment(i):
+            x0 = self.xs[i]
+            if i + 1 >= len(self.times) or self.easings[i] == 'hold':
+                return f"{x0:.2f}"
+            t0, t1, dx = self.times[i], self.times[i + 1], self.xs[i + 1] - x0
+            u = f"clip((t-{t0:.4f})/{t1 - t0:.4f}\\,0\\,1)"
+            if self.easings[i] == 'linear':
+                return f"({x0:.2f}+{dx:.2f}*{u})"
+            return f"({x0:.2f}+{dx:.2f}*{u}*{u}*(3-2*{u}))"
+
+        def tree(lo, hi):
+            if hi - lo == 1:
+                return segment(lo)
+            mid = (lo + hi) // 2
+            return f"if(lt(t\\,{self.times[mid]:.4f})\\,{tree(lo, mid)}\\,{tree(mid, hi)})"
+
+        return tree(0, len(self.times))
+
+    def to_sendcmd(self, path, fps, target='crop@camera'):
+        """
+        Arquivo sendcmd: um comando por keyframe 'hold' e um por frame
+        nos trechos em movimento.
+
+        Returns:
+            Caminho do arquivo
+        """
+        lines = []
+        for i, t0 in enumerate(self.times):
+            if i + 1 < len(self.times) and self.easings[i] != 'hold':
+                frame_times = np.arange(t0, self.times[i + 1], 1.0 / fps)
+            else:
+                frame_times = np.array([t0])
+            for t, x in zip(frame_times, self.x_at(frame_times)):
+                lines.append(f"{t:.4f} {target} x {x:.2f};")
+
+        Path(path).write_text('\n'.join(lines) + '\n', encoding='utf-8')
+        return path
+
+    def crop_filter(self, crop_w, crop_h, fps=30.0, sendcmd_path=None):
+        """
+        Filtro crop (com sendcmd se o caminho for longo demais).
+
+        Args:
+            crop_w: Largura do crop na fonte
+            crop_h: Altura do crop na fonte
+            fps: FPS (amostragem do sendcmd)
+            sendcmd_path: Arquivo para os comandos (obrigatório acima
+                          de MAX_EXPRESSION_KEYFRAMES)
+
+        Returns:
+            String do filtro
+        """
+        y = f"(ih-{crop_h})/2"
+        if len(self) <= MAX_EXPRESSION_KEYFRAMES or sendcmd_path is None:
+            return f"crop={crop_w}:{crop_h}:{self.to_expression()}:{y}"
+
+        self.to_sendcmd(sendcmd_path, fps)
+        return (f"sendcmd=f={_escape_filter_path(sendcmd_path)},"
+                f"crop@camera={crop_w}:{crop_h}:{self.xs[0]:.2f}:{y}")
+
+
+def _dedupe(keyframes):
+    """Remove keyframes repetidos no mesmo tempo (fica o último)."""
+    result = []
+    for keyframe in keyframes:
+        if result and abs(result[-1][0] - keyframe[0]) < 1e-9:
+            result[-1] = keyframe
+        else:
+            result.append(keyframe)
+    return result
+
+
+def _simplify(times, xs, tolerance):
+    """Ramer-Douglas-Peucker iterativo. Returns: índices mantidos (ordenados)."""
+    keep = np.zeros(len(times), dtype=bool)
+    keep[0] = keep[-1] = True
+    stack = [(0, len(times) - 1)]
+
+    while stack:
+        first, last = stack.pop()
+        if last - first < 2:
+            continue
+        t, x = times[first:last + 1], xs[first:last + 1]
+        span = t[-1] - t[0]
+        line = x[0] + (x[-1] - x[0]) * ((t - t[0]) / span if span > 0 else 0.0)
+        errors = np.abs(x - line)
+        worst = int(np.argmax(errors))
+        if errors[worst] > tolerance:
+            split = first + worst
+            keep[split] = True
+            stack.append((first, split))
+            stack.append((split, last))
+
+    return np.flatnonzero(keep)
+
+
+def probe_video(video_path):
+    """(largura, altura, fps) do vídeo."""
+    cmd = [
+        'ffprobe',
+        '-v', 'error',
+        '-select_streams', 'v:0',
+        '-show_entries', 'stream=width,height,r_frame_rate',
+        '-of', 'csv=p=0',
+        str(video_path)
+    ]
+    result = subprocess.run(cmd, capture_output=True, text=True)
+    try:
+        width, height, rate = result.stdout.strip().split(',')[:3]
+        num, _, den = rate.partition('/')
+        return int(width), int(height), float(num) / float(den or 1)
+    except ValueError:
+        return 1920, 1080, 30.0
+
+
+def render_camera_path(input_video, output_video, path, crop_w, crop_h=None,
+                       target_width=1080, target_height=1920, preset='medium', crf=23):
+    """
+    Renderiza crop (caminho de câmera) + scale + encode num único ffmpeg.
+
+    Args:
+        input_video: Vídeo de entrada
+        output_video: Vídeo de saída
+        path: CameraPath (x na fonte)
+        crop_w: Largura do crop na fonte
+        crop_h: Altura do crop na fonte (None = altura toda)
+        target_width: Largura final
+        target_height: Altura final
+        preset: Preset do libx264
+        crf: Qualidade do libx264
+
+    Returns:
+        Caminho do vídeo renderizado
+    """
+    width, height, fps = probe_video(input_video)
+    crop_h = crop_h or height
+    sendcmd_path = Path(output_video).with_suffix('.camera.txt')
+
+    crop = path.crop_filter(crop_w, crop_h, fps=fps, sendcmd_path=sendcmd_path)
+    video_filter = f"{crop},scale={target_width}:{target_height},setsar=1"
+
+    print(f"   🎥 Câmera no ffmpeg: {len(path)} keyframes")
+
+    cmd = [
+        'ffmpeg',
+        '-i', str(input_video),
+        '-vf', video_filter,
+        '-map', '0:v:0',
+        '-map', '0:a:0?',
+        '-c:v', 'libx264',
+        '-preset', preset,
+        '-crf', str(crf),
+        '-pix_fmt', 'yuv420p',
+        '-c:a', 'aac',
+        '-b:a', '192k',
+        '-y',
+        str(output_video)
+    ]
+
+    result = subprocess.run(
+        cmd,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+        encoding='utf-8',
+        errors='ignore'
+    )
+    sendcmd_path.unlink(missing_ok=True)
+
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg falhou: {result.stderr[-500:]}")
+
+    return output_video
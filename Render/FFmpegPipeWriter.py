@@ -0,0 +1,111 @@
+# Render/FFmpegPipeWriter.py
+"""
+=============================================================================
+WRITER DE FRAMES CRUS PARA O FFMPEG (PIPE)
+=============================================================================
+
+✨ FEATURES:
+- Substitui cv2.VideoWriter (mp4v) + segundo encode para juntar o áudio
+- Frames BGR crus vão pelo stdin direto para UM ffmpeg libx264
+- O mesmo ffmpeg faz o mux do áudio do vídeo original
+- Sem arquivo temporário, sem encode duplo
+- FPS fracionário preservado (29.97 não vira 29)
+
+⚙️ USO:
+    with FFmpegPipeWriter('short.mp4', 1080, 1920, fps, audio_source='clip.mp4') as writer:
+        for frame in frames:
+            writer.write(frame)
+
+=============================================================================
+"""
+
+import subprocess
+
+import numpy as np
+
+
+class FFmpegPipeWriter:
+    """Encoda frames BGR (numpy) com libx264, com áudio opcional."""
+
+    def __init__(self, output_path, width, height, fps, audio_source=None,
+                 crf=23, preset='medium', audio_bitrate='192k'):
+        """
+        Args:
+            output_path: Arquivo de saída
+            width: Largura dos frames
+            height: Altura dos frames
+            fps: FPS da saída
+            audio_source: Vídeo de onde copiar o áudio (None = sem áudio)
+            crf: Qualidade do libx264
+            preset: Preset do libx264
+            audio_bitrate: Bitrate do AAC
+        """
+        self.output_path = str(output_path)
+        self.width = int(width)
+        self.height = int(height)
+        self.frames = 0
+
+        cmd = [
+            'ffmpeg',
+            '-y',
+            '-f', 'rawvideo',
+            '-pix_fmt', 'bgr24',
+            '-s', f'{self.width}x{self.height}',
+            '-r', f'{fps:.6f}',
+            '-i', '-'
+        ]
+
+        if audio_source:
+            cmd += ['-i', str(audio_source), '-map', '0:v:0', '-map', '1:a:0?',
+                    '-c:a', 'aac', '-b:a', audio_bitrate, '-shortest']
+
+        cmd += [
+            '-c:v', 'libx264',
+            '-preset', preset,
+            '-crf', str(crf),
+            '-pix_fmt', 'yuv420p',
+            self.output_path
+        ]
+
+        # stderr descartado: um pipe cheio travaria o ffmpeg
+        self._process = subprocess.Popen(
+            cmd,
+            stdin=subprocess.PIPE,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+    def write(self, frame):
+        """Envia um frame BGR (height × width × 3, uint8)."""
+        if frame.shape[0] != self.height or frame.shape[1] != self.width:
+            raise ValueError(
+                f"Frame {frame.shape[1]}x{frame.shape[0]} != {self.width}x{self.height}"
+            )
+        try:
+            self._process.stdin.write(np.ascontiguousarray(frame).data)
+        except BrokenPipeError:
+            raise RuntimeError(f"ffmpeg encerrou antes do fim: {self.output_path}")
+        self.frames += 1
+
+    def close(self):
+        """
+        Fecha o pipe e espera o encode terminar.
+
+        Returns:
+            Código de saída do ffmpeg (0 = ok)
+        """
+        if self._process.stdin and not self._process.stdin.closed:
+            try:
+                self._process.stdin.close()
+            except BrokenPipeError:
+                pass
+        return self._process.wait()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        code = self.close()
+        if exc_type is None and code != 0:
+            raise RuntimeError(f"ffmpeg falhou ({code}): {self.output_path}")
+        return False
@@ -0,0 +1,234 @@
+# Render/FramePipeline.py
+"""
+=============================================================================
+PIPELINE DE FRAMES EM THREADS (DECODE → TRANSFORM → ENCODE)
+=============================================================================
+
+✨ FEATURES:
+- Três estágios em paralelo: decode (1 thread), transform (N threads),
+  encode (thread chamadora), ligados por filas com limite
+- OpenCV e o pipe do ffmpeg liberam o GIL: decode, crop/resize e encode
+  ocupam cores diferentes ao mesmo tempo
+- Buffers pré-alocados e reutilizados: cada "slot" (frame de entrada +
+  frame de saída) volta para o pool depois do encode; memória fixa, sem
+  alocação por frame
+- Slot reservado na ordem do decode: o frame mais antigo sempre tem
+  buffer de saída (sem deadlock na reordenação)
+- Saída na ordem original mesmo com vários workers
+- Instrumentação: frames/s e tempo ocupado de cada estágio
+- Erro em qualquer estágio para o pipeline e é relançado
+
+⚙️ USO:
+    pipeline = FramePipeline(
+        lambda i, frame, out: cv2.resize(frame, (1080, 1920), dst=out),
+        workers=2
+    )
+    stats = pipeline.run(
+        capture_reader(cap),
+        writer.write,
+        frame_shape=(1080, 1920, 3),
+        output_shape=(1920, 1080, 3)
+    )
+
+=============================================================================
+"""
+
+import time
+import queue
+import threading
+
+import numpy as np
+
+
+# Timeout das filas: threads conferem se o pipeline foi parado
+_POLL_SEC = 0.1
+
+_STOPPED = object()
+
+
+def capture_reader(cap):
+    """
+    Função de leitura para um cv2.VideoCapture (decodifica no buffer dado).
+
+    Returns:
+        read(buffer) -> frame ou None no fim
+    """
+    def read(buffer):
+        ret, frame = cap.read(buffer)
+        return frame if ret else None
+    return read
+
+
+class FramePipeline:
+    """Decode, transform e encode de frames em estágios paralelos."""
+
+    def __init__(self, transform, workers=2, queue_size=8, name='render'):
+        """
+        Args:
+            transform: Função (índice, frame, out) -> frame transformado;
+                       pode escrever em `out` (buffer pré-alocado) e
+                       devolvê-lo
+            workers: Threads do estágio de transform
+            queue_size: Frames esperando transform (limite de memória)
+            name: Nome nos logs
+        """
+        self.transform = transform
+        self.workers = max(1, int(workers))
+        self.queue_size = max(1, int(queue_size))
+        self.name = name
+        self.stats = {}
+
+        self._stop = threading.Event()
+        self._error = None
+        self._lock = threading.Lock()
+
+    def run(self, read, write, frame_shape, output_shape, progress=None):
+        """
+        Processa todos os frames.
+
+        Args:
+            read: Função (buffer) -> frame ou None no fim (decode)
+            write: Função (frame) chamada na ordem original (encode)
+            frame_shape: Shape dos frames decodificados
+            output_shape: Shape dos frames transformados
+            progress: Função (frames escritos) chamada após cada frame
+
+        Returns:
+            Estatísticas {'frames', 'seconds', 'fps', 'decode_s',
+                          'transform_s', 'encode_s'}
+        """
+        self._stop.clear()
+        self._error = None
+        busy = {'decode_s': 0.0, 'transform_s': 0.0, 'encode_s': 0.0}
+
+        # Pool de slots: limita frames em voo (e a memória)
+        n_slots = self.queue_size + 2 * self.workers
+        slots = queue.Queue()
+        for _ in range(n_slots):
+            slots.put((np.empty(frame_shape, dtype=np.uint8), np.empty(output_shape, dtype=np.uint8)))
+
+        todo = queue.Queue(maxsize=self.queue_size)
+        done = queue.Queue()
+
+        def decode():
+            try:
+                index = 0
+                while not self._stop.is_set():
+                    slot = self._get(slots)
+                    if slot is _STOPPED:
+                        break
+                    started = time.perf_counter()
+                    frame = read(slot[0])
+                    busy['decode_s'] += time.perf_counter() - started
+                    if frame is None:
+                        break
+                    if not self._put(todo, (index, frame, slot)):
+                        break
+                    index += 1
+            except Exception as e:
+                self._fail(e)
+            finally:
+                for _ in range(self.workers):
+                    self._put(todo, None)
+
+        def work():
+            elapsed = 0.0
+            try:
+                while True:
+                    job = self._get(todo)
+                    if job is None or job is _STOPPED:
+                        break
+                    index, frame, slot = job
+                    started = time.perf_counter()
+                    result = self.transform(index, frame, slot[1])
+                    elapsed += time.perf_counter() - started
+                    done.put((index, result, slot))
+            except Exception as e:
+                self._fail(e)
+            finally:
+                with self._lock:
+                    busy['transform_s'] += elapsed
+                done.put(None)
+
+        threads = [threading.Thread(target=decode, name=f'{self.name}-decode', daemon=True)]
+        threads += [
+            threading.Thread(target=work, name=f'{self.name}-transform-{n}', daemon=True)
+            for n in range(self.workers)
+        ]
+
+        started = time.perf_counter()
+        for thread in threads:
+            thread.start()
+
+        # Encode na thread chamadora, reordenando pelos índices
+        pending = {}
+        next_index = 0
+        finished = 0
+        try:
+            while finished < self.workers and not self._stop.is_set():
+                item = self._get(done)
+                if item is _STOPPED:
+                    break
+                if item is None:
+                    finished += 1
+                    continue
+
+                index, result, slot = item
+                pending[index] = (result, slot)
+                while next_index in pending:
+                    result, slot = pending.pop(next_index)
+                    encode_started = time.perf_counter()
+                    write(result)
+                    busy['encode_s'] += time.perf_counter() - encode_started
+                    slots.put(slot)
+                    next_index += 1
+                    if progress:
+                        progress(next_index)
+        except Exception as e:
+            self._fail(e)
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+
+        if self._error is not None:
+            raise self._error
+
+        seconds = time.perf_counter() - started
+        self.stats = {
+            'frames': next_index,
+            'seconds': round(seconds, 3),
+            'fps': round(next_index / seconds, 1) if seconds > 0 else 0.0,
+            **{key: round(value, 3) for key, value in busy.items()}
+        }
+
+        print(f"   ⚡ {self.stats['frames']} frames em {self.stats['seconds']:.1f}s "
+              f"({self.stats['fps']} fps, {self.workers} workers)")
+
+        return self.stats
+
+    def _fail(self, error):
+        """Guarda o primeiro erro e para todos os estágios."""
+        with self._lock:
+            if self._error is None:
+                self._error = error
+        self._stop.set()
+
+    def _get(self, q):
+        """get() que desiste quando o pipeline é parado."""
+        while True:
+            try:
+                return q.get(timeout=_POLL_SEC)
+            except queue.Empty:
+                if self._stop.is_set():
+                    return _STOPPED
+
+    def _put(self, q, item):
+        """put() que desiste quando o pipeline é parado."""
+        while True:
+            try:
+                q.put(item, timeout=_POLL_SEC)
+                return True
+            except queue.Full:
+                if self._stop.is_set():
+                    return False
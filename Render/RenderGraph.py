@@ -0,0 +1,315 @@
+# Render/RenderGraph.py
+"""
+=============================================================================
+RENDER EM PASSO ÚNICO (UM FILTER GRAPH, UM ENCODE)
+=============================================================================
+
+✨ FEATURES:
+- Um único processo ffmpeg por short, lendo direto do vídeo fonte
+- trim/concat (silêncios) → setpts/atempo (velocidade) → loudnorm
+  → crop/scale (9:16) → legendas queimadas
+- Encode ÚNICO (libx264 + aac): sem perda de qualidade entre gerações
+- Crop ANTES do scale (só a região útil é redimensionada)
+- Remapeia timestamps da fonte para a timeline final do short
+  (legendas e posições de câmera continuam sincronizadas)
+
+🔄 ANTES (até 5 encodes por short):
+    extract_segment → _remove_silences → _adjust_speed
+    → _normalize_audio → SmartCropper (mp4v + libx264)
+
+✅ AGORA:
+    RenderGraph.render(fonte, saída, start, duration, ...)
+
+=============================================================================
+"""
+
+import json
+import subprocess
+from pathlib import Path
+
+
+class RenderPlan:
+    """Trechos mantidos + velocidade: converte tempos fonte → short."""
+
+    def __init__(self, start_time, duration, keep_segments=None, speed_factor=1.0):
+        """
+        Args:
+            start_time: Início do clip no vídeo fonte (segundos)
+            duration: Duração do clip na fonte
+            keep_segments: [{'start', 'end'}] relativos ao clip (None = tudo)
+            speed_factor: Fator de aceleração
+        """
+        self.start_time = float(start_time)
+        self.duration = float(duration)
+        self.keep_segments = keep_segments or [{'start': 0.0, 'end': self.duration}]
+        self.speed_factor = speed_factor or 1.0
+
+    @property
+    def output_duration(self):
+        """Duração final do short."""
+        kept = sum(seg['end'] - seg['start'] for seg in self.keep_segments)
+        return kept / self.speed_factor
+
+    def remap_time(self, t):
+        """
+        Converte tempo relativo ao clip para tempo no short final.
+
+        Returns:
+            Tempo no short, ou None se `t` cai em trecho removido
+        """
+        elapsed = 0.0
+        for seg in self.keep_segments:
+            if seg['start'] <= t <= seg['end']:
+                return (elapsed + t - seg['start']) / self.speed_factor
+            elapsed += seg['end'] - seg['start']
+        return None
+
+    def remap_transcription(self, segments):
+        """
+        Copia segmentos Whisper (tempos ABSOLUTOS da fonte) para a
+        timeline do short. Palavras em trechos removidos são descartadas.
+        """
+        remapped = []
+
+        for segment in segments:
+            if not isinstance(segment, dict):
+                continue
+
+            words = []
+            for word in segment.get('words', []):
+                start = self.remap_time(word.get('start', 0) - self.start_time)
+                end = self.remap_time(word.get('end', 0) - self.start_time)
+                if start is None or end is None:
+                    continue
+                words.append({**word, 'start': start, 'end': end})
+
+            seg_start = self.remap_time(segment.get('start', 0) - self.start_time)
+            seg_end = self.remap_time(segment.get('end', 0) - self.start_time)
+
+            if words:
+                seg_start = words[0]['start'] if seg_start is None else seg_start
+                seg_end = words[-1]['end'] if seg_end is None else seg_end
+            elif seg_start is None or seg_end is None:
+                continue
+
+            remapped.append({**segment, 'start': seg_start, 'end': seg_end, 'words': words})
+
+        return remapped
+
+
+class RenderGraph:
+    """Monta e executa o filter graph de um short."""
+
+    def __init__(self,
+                 target_width=1080,
+                 target_height=1920,
+                 loudnorm='loudnorm=I=-16:LRA=11:TP=-1.5',
+                 preset='medium',
+                 crf=23,
+                 audio_bitrate='192k'):
+        """
+        Inicializa render.
+
+        Args:
+            target_width: Largura final (1080 para shorts)
+            target_height: Altura final (1920 para shorts)
+            loudnorm: Filtro de normalização (None = desligado)
+            preset: Preset do libx264
+            crf: Qualidade do libx264
+            audio_bitrate: Bitrate do aac
+        """
+        self.target_width = target_width
+        self.target_height = target_height
+        self.loudnorm = loudnorm
+        self.preset = preset
+        self.crf = crf
+        self.audio_bitrate = audio_bitrate
+
+    def render(self,
+               source_video,
+               output_video,
+               plan,
+               crop_intervals=None,
+               subtitles_file=None):
+        """
+        Renderiza o short com um único encode.
+
+        Args:
+            source_video: Vídeo fonte (a live inteira)
+            output_video: Short de saída
+            plan: RenderPlan (trecho, silêncios removidos, velocidade)
+            crop_intervals: [(start, end, 'left'|'right'|'center')] na
+                            timeline do SHORT (None = centro fixo)
+            subtitles_file: .srt/.ass na timeline do short para queimar
+
+        Returns:
+            Caminho do short
+        """
+        print(f"🎬 Render único: {Path(output_video).name}")
+
+        width, height, has_audio = self._probe(source_video)
+
+        filter_complex = self.build_filter(
+            plan, width, height, has_audio,
+            crop_intervals=crop_intervals,
+            subtitles_file=subtitles_file
+        )
+
+        cmd = [
+            'ffmpeg',
+            '-ss', str(plan.start_time),
+            '-t', str(plan.duration),
+            '-i', str(source_video),
+            '-filter_complex', filter_complex,
+            '-map', '[outv]'
+        ]
+        if has_audio:
+            cmd += ['-map', '[outa]', '-c:a', 'aac', '-b:a', self.audio_bitrate]
+        cmd += [
+            '-c:v', 'libx264',
+            '-preset', self.preset,
+            '-crf', str(self.crf),
+            '-pix_fmt', 'yuv420p',
+            '-movflags', '+faststart',
+            '-y',
+            str(output_video)
+        ]
+
+        print(f"   📊 {width}x{height} → {self.target_width}x{self.target_height}, "
+              f"{len(plan.keep_segments)} trechos, {plan.speed_factor}x")
+
+        result = subprocess.run(
+            cmd,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.PIPE,
+            text=True,
+            encoding='utf-8',
+            errors='ignore'
+        )
+
+        if result.returncode != 0:
+            raise RuntimeError(f"ffmpeg falhou: {result.stderr[-500:]}")
+
+        print(f"   ✅ Short renderizado ({plan.output_duration:.1f}s)")
+
+        return output_video
+
+    def build_filter(self, plan, width, height, has_audio=True,
+                     crop_intervals=None, subtitles_file=None):
+        """Monta a string do -filter_complex."""
+        parts = []
+        segments = plan.keep_segments
+
+        # 1. trim/concat (remoção de silêncios)
+        if len(segments) > 1:
+            concat_inputs = ''
+            for i, seg in enumerate(segments):
+                parts.append(f"[0:v]trim=start={seg['start']}:end={seg['end']},setpts=PTS-STARTPTS[v{i}]")
+                concat_inputs += f'[v{i}]'
+                if has_audio:
+                    parts.append(f"[0:a]atrim=start={seg['start']}:end={seg['end']},asetpts=PTS-STARTPTS[a{i}]")
+                    concat_inputs += f'[a{i}]'
+            outputs = '[cv][ca]' if has_audio else '[cv]'
+            parts.append(f"{concat_inputs}concat=n={len(segments)}:v=1:a={1 if has_audio else 0}{outputs}")
+            video, audio = '[cv]', '[ca]'
+        else:
+            video, audio = '[0:v]', '[0:a]'
+
+        # 2. Velocidade + 3. crop/scale + 4. legendas
+        video_chain = []
+        if plan.speed_factor != 1.0:
+            video_chain.append(f'setpts=PTS/{plan.speed_factor}')
+
+        crop_w, crop_h = self._crop_size(width, height)
+        crop_x = self._crop_x_expression(crop_intervals)
+        video_chain.append(f"crop={crop_w}:{crop_h}:{crop_x}:(ih-{crop_h})/2")
+        video_chain.append(f'scale={self.target_width}:{self.target_height}')
+        video_chain.append('setsar=1')
+
+        if subtitles_file:
+            video_chain.append(f"subtitles=filename={_escape_filter_path(subtitles_file)}")
+
+        parts.append(f"{video}{','.join(video_chain)}[outv]")
+
+        if has_audio:
+            audio_chain = []
+            if plan.speed_factor != 1.0:
+                audio_chain.extend(_atempo_chain(plan.speed_factor))
+            if self.loudnorm:
+                audio_chain.append(self.loudnorm)
+            if not audio_chain:
+                audio_chain.append('anull')
+            parts.append(f"{audio}{','.join(audio_chain)}[outa]")
+
+        return ';'.join(parts)
+
+    def _crop_size(self, width, height):
+        """
+        Região da FONTE que vira o frame final (crop antes do scale).
+
+        Mesmo enquadramento do SmartCropper (escala para cobrir e corta),
+        mas calculado no espaço da fonte.
+        """
+        scale = max(self.target_width / width, self.target_height / height)
+        crop_w = min(width, int(round(self.target_width / scale / 2)) * 2)
+        crop_h = min(height, int(round(self.target_height / scale / 2)) * 2)
+        return crop_w, crop_h
+
+    def _crop_x_expression(self, crop_intervals):
+        """Expressão x do crop: centro, esquerda ou direita ao longo do tempo."""
+        positions = {
+            'left': '0',
+            'right': '(iw-ow)',
+            'center': '(iw-ow)/2'
+        }
+
+        expression = positions['center']
+
+        # Intervalos posteriores têm prioridade (igual ao movement_map)
+        for start, end, position in crop_intervals or []:
+            value = positions.get(position, positions['center'])
+            expression = f"if(between(t\\,{start:.3f}\\,{end:.3f})\\,{value}\\,{expression})"
+
+        return expression
+
+    def _probe(self, video_path):
+        """Retorna (largura, altura, tem_áudio)."""
+        cmd = [
+            'ffprobe',
+            '-v', 'error',
+            '-show_entries', 'stream=codec_type,width,height',
+            '-of', 'json',
+            str(video_path)
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        try:
+            streams = json.loads(result.stdout).get('streams', [])
+        except ValueError:
+            streams = []
+
+        video = next((s for s in streams if s.get('codec_type') == 'video'), {})
+        has_audio = any(s.get('codec_type') == 'audio' for s in streams)
+
+        return int(video.get('width', 1920)), int(video.get('height', 1080)), has_audio
+
+
+def _atempo_chain(speed):
+    """atempo só aceita 0.5-2.0: divide fatores maiores em vários filtros."""
+    filters = []
+    while speed > 2.0:
+        filters.append('atempo=2.0')
+        speed /= 2.0
+    while speed < 0.5:
+        filters.append('atempo=0.5')
+        speed /= 0.5
+    filters.append(f'atempo={speed}')
+    return filters
+
+
+def _escape_filter_path(path):
+    """Escapa caminho para uso dentro de um filtro ffmpeg (Windows incluso)."""
+    escaped = str(Path(path).as_posix())
+    escaped = escaped.replace('\\', '\\\\').replace(':', '\\:').replace("'", "\\'")
+    return f"'{escaped}'"
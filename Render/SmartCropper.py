@@ -11,16 +11,26 @@ SMART CROPPER COM MOVIMENTO DE CÂMERA
 - Movimento suave quando detecta palavra-chave do meme
 - Retorna ao centro após mostrar meme
 - Preserva áudio perfeitamente
+- Recorta a janela no vídeo original ANTES do resize (só a região útil
+  é redimensionada)
+- Frames crus vão por pipe para um único ffmpeg libx264, que também
+  junta o áudio (sem mp4v temporário nem segundo encode)
+- Decode, crop/resize e encode em threads separadas (FramePipeline)
+- render_short_ffmpeg: movimento compilado para o filtro crop do ffmpeg
+  (CameraPathFFmpeg), sem Python por frame
 
 =============================================================================
 """
 
 import cv2
-import subprocess
 import json
 import numpy as np
 from pathlib import Path
 
+from Render.FFmpegPipeWriter import FFmpegPipeWriter
+from Render.FramePipeline import FramePipeline, capture_reader
+from Render.CameraPathFFmpeg import CameraPath, probe_video, render_camera_path
+
 
 class SmartCropper:
     """Crop vertical com movimento de câmera inteligente."""
@@ -30,7 +40,8 @@ class SmartCropper:
                  target_height=1920,
                  movement_duration=1.5,      # Duração do movimento (segundos)
                  hold_duration=2.0,          # Quanto tempo segura no meme
-                 transition_smoothness=30):   # Frames de transição
+                 transition_smoothness=30,    # Frames de transição
+                 render_workers=2):           # Threads de crop/resize
         """
         Inicializa SmartCropper.
         
@@ -40,12 +51,14 @@ class SmartCropper:
             movement_duration: Duração do movimento de câmera
             hold_duration: Tempo que fica focado no meme
             transition_smoothness: Suavidade da transição
+            render_workers: Threads do estágio de crop/resize (FramePipeline)
         """
         self.target_width = target_width
         self.target_height = target_height
         self.movement_duration = movement_duration
         self.hold_duration = hold_duration
         self.transition_smoothness = transition_smoothness
+        self.render_workers = render_workers
     
     def render_short(self, 
                      input_video, 
@@ -81,24 +94,10 @@ class SmartCropper:
         print(f"   📊 {orig_width}x{orig_height} → {self.target_width}x{self.target_height}")
         print(f"   🎞️  {total_frames} frames @ {fps} FPS")
         
-        # Calcular crop
+        # Região no vídeo ORIGINAL equivalente ao crop no vídeo escalado:
+        # recorta primeiro e só redimensiona a janela (não o frame inteiro)
         scale = max(self.target_width / orig_width, self.target_height / orig_height)
-        scaled_width = int(orig_width * scale)
-        scaled_height = int(orig_height * scale)
-        
-        # Criar vídeo temporário (sem áudio)
-        temp_video = str(Path(output_video).with_stem(Path(output_video).stem + '_no_audio'))
-        
-        fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-        out = cv2.VideoWriter(
-            temp_video,
-            fourcc,
-            fps,
-            (self.target_width, self.target_height)
-        )
-        
-        # Processar frames
-        frame_count = 0
+        rois = self._source_rois(orig_width, orig_height, scale)
         
         # Gerar mapa de movimento (qual posição usar em cada frame)
         movement_map = self._generate_movement_map(
@@ -109,77 +108,104 @@ class SmartCropper:
         
         print(f"   🎥 Processando frames...")
         
-        while True:
-            ret, frame = cap.read()
-            if not ret:
-                break
-            
-            # Redimensionar
-            resized = cv2.resize(frame, (scaled_width, scaled_height))
-            
-            # Obter posição de crop para este frame
-            crop_position = movement_map[frame_count]
-            
-            # Calcular offset X baseado na posição
-            if crop_position == 'left':
-                x_offset = 0
-            elif crop_position == 'right':
-                x_offset = scaled_width - self.target_width
-            else:  # center
-                x_offset = (scaled_width - self.target_width) // 2
-            
-            # Crop vertical
-            y_offset = (scaled_height - self.target_height) // 2
-            
-            cropped = resized[
-                y_offset:y_offset + self.target_height,
-                x_offset:x_offset + self.target_width
-            ]
-            
-            # Escrever frame
-            out.write(cropped)
-            
-            frame_count += 1
-            
-            # Progress
+        # Decode, crop/resize (workers) e encode em paralelo; frames crus
+        # direto para um único ffmpeg (libx264 + áudio)
+        output_size = (self.target_width, self.target_height)
+        
+        def transform(index, frame, out):
+            crop_position = movement_map[index] if index < len(movement_map) else 'center'
+            x, y, w, h = rois[crop_position]
+            return cv2.resize(frame[y:y + h, x:x + w], output_size, dst=out)
+        
+        def progress(frame_count):
             if frame_count % (fps * 5) == 0:  # A cada 5 segundos
-                progress = (frame_count / total_frames) * 100
-                print(f"   ⏳ {progress:.1f}%")
+                print(f"   ⏳ {(frame_count / total_frames) * 100:.1f}%")
+        
+        with FFmpegPipeWriter(
+            output_video,
+            self.target_width,
+            self.target_height,
+            cap.get(cv2.CAP_PROP_FPS) or fps,
+            audio_source=input_video
+        ) as writer:
+            FramePipeline(transform, workers=self.render_workers, name='smartcrop').run(
+                capture_reader(cap),
+                writer.write,
+                frame_shape=(orig_height, orig_width, 3),
+                output_shape=(self.target_height, self.target_width, 3),
+                progress=progress
+            )
         
         cap.release()
-        out.release()
-        
-        print(f"   ✅ Frames processados!")
-        
-        # Adicionar áudio com ffmpeg
-        print(f"   🔊 Adicionando áudio...")
-        
-        cmd = [
-            'ffmpeg',
-            '-i', temp_video,
-            '-i', input_video,
-            '-c:v', 'libx264',
-            '-preset', 'medium',
-            '-crf', '23',
-            '-c:a', 'aac',
-            '-b:a', '192k',
-            '-map', '0:v:0',
-            '-map', '1:a:0',
-            '-shortest',
-            '-y',
-            output_video
-        ]
-        
-        subprocess.run(cmd, capture_output=True)
-        
-        # Limpar temporário
-        if Path(temp_video).exists():
-            Path(temp_video).unlink()
         
         print(f"   ✅ Short renderizado!")
         
         return output_video
     
+    def render_short_ffmpeg(self, input_video, output_video, meme_timestamps=None, transition=0.0):
+        """
+        Mesmo enquadramento do render_short, sem loop por frame em Python:
+        o movimento vira expressão de tempo do crop e o ffmpeg faz
+        crop + scale + encode (multithread).
+        
+        Args:
+            input_video: Vídeo de entrada
+            output_video: Vídeo de saída
+            meme_timestamps: Lista de {'time': segundos, 'position': 'left'/'right'}
+            transition: Segundos de ease entre posições (0 = corte seco,
+                        igual ao render_short)
+        
+        Returns:
+            Caminho do vídeo renderizado
+        """
+        print(f"🎬 Renderizando (ffmpeg): {Path(output_video).name}")
+        
+        orig_width, orig_height, _ = probe_video(input_video)
+        scale = max(self.target_width / orig_width, self.target_height / orig_height)
+        _, _, w, h = self._source_rois(orig_width, orig_height, scale)['center']
+        
+        path = CameraPath.from_intervals(
+            self.movement_intervals(meme_timestamps),
+            orig_width,
+            w,
+            transition=transition
+        )
+        render_camera_path(
+            input_video,
+            output_video,
+            path,
+            crop_w=w,
+            crop_h=h,
+            target_width=self.target_width,
+            target_height=self.target_height
+        )
+        
+        print(f"   ✅ Short renderizado!")
+        
+        return output_video
+    
+    def _source_rois(self, orig_width, orig_height, scale):
+        """
+        Janela de crop de cada posição em coordenadas do vídeo original.
+        
+        Args:
+            orig_width: Largura do vídeo original
+            orig_height: Altura do vídeo original
+            scale: Escala que cobre o alvo (max das razões)
+        
+        Returns:
+            {'left' | 'center' | 'right': (x, y, w, h)}
+        """
+        w = min(orig_width, int(round(self.target_width / scale)))
+        h = min(orig_height, int(round(self.target_height / scale)))
+        y = (orig_height - h) // 2
+        
+        return {
+            'left': (0, y, w, h),
+            'center': ((orig_width - w) // 2, y, w, h),
+            'right': (orig_width - w, y, w, h)
+        }
+    
     def _generate_movement_map(self, total_frames, fps, meme_timestamps):
         """
         Gera mapa de movimento de câmera.
@@ -231,7 +257,35 @@ class SmartCropper:
                     movement_map[frame_idx] = 'center'
         
         return movement_map
-    
+
+    def movement_intervals(self, meme_timestamps):
+        """
+        Mesmo movimento do _generate_movement_map, em intervalos de tempo.
+
+        Usado pelo RenderGraph (crop com expressão de tempo no ffmpeg).
+
+        Args:
+            meme_timestamps: Lista de {'time': segundos, 'position': 'left'/'right'}
+
+        Returns:
+            Lista de (start, end, position); intervalos posteriores
+            têm prioridade sobre os anteriores
+        """
+        intervals = []
+
+        for meme in meme_timestamps or []:
+            time = meme.get('time', 0)
+            position = meme.get('position', 'center')
+
+            if position == 'center':
+                continue
+
+            focus_end = time + self.movement_duration + self.hold_duration
+            intervals.append((time, focus_end, position))
+            intervals.append((focus_end, focus_end + self.movement_duration, 'center'))
+
+        return intervals
+
     def detect_meme_positions_from_text(self, transcription, meme_config_path):
         """
         Detecta posições de memes baseado no TEXTO da transcrição.
@@ -6,31 +6,31 @@ VERTICAL CROPPER COM ÁUDIO - VERSÃO FINAL
 
 CORREÇÃO CRÍTICA:
 - cv2.VideoWriter NÃO suporta áudio!
-- Solução: Renderizar vídeo com OpenCV, depois adicionar áudio com ffmpeg
+- Solução: frames do OpenCV por pipe para um ffmpeg que também junta o
+  áudio (FFmpegPipeWriter), com decode/crop/encode em threads
+  (FramePipeline)
 
 =============================================================================
 """
 
 import cv2
-import numpy as np
-import subprocess
-import os
 from pathlib import Path
 
+from Render.FFmpegPipeWriter import FFmpegPipeWriter
+from Render.FramePipeline import FramePipeline, capture_reader
 
-def render_vertical_video(video_in, video_out, meme_events=None, session_id=None):
+
+def render_vertical_video(video_in, video_out, meme_events=None, session_id=None, workers=2):
     """
     Renderiza vídeo vertical PRESERVANDO ÁUDIO.
     
     FUNCIONAMENTO:
-    1. Renderiza vídeo vertical com OpenCV (sem áudio)
-    2. Adiciona áudio do vídeo original com ffmpeg
+    1. Decode, crop/resize e encode em threads (FramePipeline)
+    2. Frames crus por pipe para um único ffmpeg, que junta o áudio
+       do vídeo original
     """
     print(f"🎬 Renderizando: {Path(video_in).name} → {Path(video_out).name}")
     
-    # Arquivo temporário SEM áudio
-    temp_video = str(Path(video_out).with_suffix('')) + "_temp.mp4"
-    
     # Abrir vídeo
     cap = cv2.VideoCapture(video_in)
     
@@ -51,91 +51,37 @@ def render_vertical_video(video_in, video_out, meme_events=None, session_id=None
     print(f"   Input: {width}x{height} @ {fps:.1f} FPS")
     print(f"   Output: {output_width}x{output_height}")
     
-    # Criar writer (SEM áudio)
-    fourcc = cv2.VideoWriter_fourcc(*'mp4v')
-    out = cv2.VideoWriter(temp_video, fourcc, fps, (output_width, output_height))
-    
-    if not out.isOpened():
-        print(f"❌ Erro ao criar writer")
-        cap.release()
-        return False
+    # Comportamento: centro fixo
+    half_width = output_width // 2
+    center_x = width // 2
+    x1 = max(0, center_x - half_width)
+    x2 = min(width, center_x + half_width)
     
-    # Processar frames
-    frame_num = 0
+    def transform(frame_num, frame, out):
+        # Crop da faixa central e resize direto para vertical
+        return cv2.resize(frame[0:height, x1:x2], (output_width, output_height), dst=out)
     
-    while True:
-        ret, frame = cap.read()
-        if not ret:
-            break
-        
-        # Progresso
+    def progress(frame_num):
         if frame_num % (int(fps) * 10) == 0:
-            progress = (frame_num / total_frames) * 100
-            print(f"      [{progress:5.1f}%] Frame {frame_num}/{total_frames}")
-        
-        # Comportamento: centro fixo
-        half_width = output_width // 2
-        center_x = width // 2
-        x1 = max(0, center_x - half_width)
-        x2 = min(width, center_x + half_width)
-        y1 = 0
-        y2 = height
-        
-        # Crop e resize
-        cropped = frame[y1:y2, x1:x2]
-        
-        # Garantir dimensões corretas
-        if cropped.shape[1] != output_width or cropped.shape[0] != height:
-            cropped = cv2.resize(cropped, (output_width, height))
-        
-        # Resize para vertical
-        vertical = cv2.resize(cropped, (output_width, output_height))
-        
-        # Escrever frame
-        out.write(vertical)
-        
-        frame_num += 1
-    
-    # Liberar recursos
-    cap.release()
-    out.release()
-    
-    print(f"   ✅ Vídeo renderizado (sem áudio)")
-    
-    # ADICIONAR ÁUDIO COM FFMPEG
-    print(f"   🎵 Adicionando áudio...")
-    
-    cmd = [
-        'ffmpeg',
-        '-i', temp_video,      # Vídeo sem áudio
-        '-i', video_in,        # Vídeo original (com áudio)
-        '-map', '0:v:0',       # Vídeo do primeiro input
-        '-map', '1:a:0',       # Áudio do segundo input
-        '-c:v', 'copy',        # Copiar vídeo (não re-encode)
-        '-c:a', 'aac',         # Encode áudio para aac
-        '-b:a', '192k',        # Bitrate
-        '-shortest',           # Terminar quando o menor acabar
-        '-y',
-        video_out
-    ]
-    
-    result = subprocess.run(
-        cmd,
-        stdout=subprocess.DEVNULL,
-        stderr=subprocess.PIPE,
-        text=True
-    )
-    
-    # Limpar temp
-    if os.path.exists(temp_video):
-        os.remove(temp_video)
-    
-    if result.returncode == 0:
-        print(f"   ✅ Renderização completa COM ÁUDIO!")
-        return True
-    else:
-        print(f"   ❌ Erro ao adicionar áudio: {result.stderr[:200]}")
+            print(f"      [{(frame_num / total_frames) * 100:5.1f}%] Frame {frame_num}/{total_frames}")
+    
+    try:
+        with FFmpegPipeWriter(video_out, output_width, output_height, fps, audio_source=video_in) as writer:
+            FramePipeline(transform, workers=workers, name='vertical').run(
+                capture_reader(cap),
+                writer.write,
+                frame_shape=(height, width, 3),
+                output_shape=(output_height, output_width, 3),
+                progress=progress
+            )
+    except RuntimeError as e:
+        print(f"   ❌ Erro no encode: {e}")
         return False
+    finally:
+        cap.release()
+    
+    print(f"   ✅ Renderização completa COM ÁUDIO!")
+    return True
 
 
 # =============================================================================
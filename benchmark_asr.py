@@ -0,0 +1,291 @@
+# benchmark_asr.py
+"""
+Benchmark dos backends de transcrição (Components/ASRBackends.py).
+
+Roda cada backend instalado no MESMO áudio local e mostra:
+- RTF (tempo de transcrição / duração do áudio; < 1 = mais rápido que real)
+- Pico de memória (RSS) do processo
+- Concordância de palavras com o backend de referência
+
+Cada backend roda em um processo separado (pico de RSS isolado).
+
+Fixture (fixtures/amostra.wav, não versionado: é trecho de live):
+gerado uma vez, de forma determinística, a partir de um vídeo/áudio
+local (trecho fixo, 16 kHz mono, ffmpeg bitexact). O SHA-256 fica em
+fixtures/amostra.json e é conferido a cada benchmark, para que
+resultados de máquinas diferentes sejam comparáveis.
+
+Uso:
+    python benchmark_asr.py --make-fixture input/live.mp4 --fixture-start 600
+    python benchmark_asr.py
+    python benchmark_asr.py fixtures/amostra.wav --model small --min-agreement 95
+"""
+
+import argparse
+import difflib
+import hashlib
+import json
+import re
+import subprocess
+import sys
+import tempfile
+import time
+import unicodedata
+from pathlib import Path
+
+from Components.ASRBackends import BACKENDS, available_backends, get_backend
+from Components.AudioStream import WavReader
+
+
+FIXTURE_PATH = Path('fixtures') / 'amostra.wav'
+FIXTURE_SECONDS = 60
+
+
+def file_sha256(path):
+    """SHA-256 do arquivo."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def make_fixture(source, output=FIXTURE_PATH, start=0.0, duration=FIXTURE_SECONDS):
+    """
+    Recorta o fixture do benchmark de um vídeo/áudio local.
+
+    Mesmo source + start + duration = mesmo WAV (bitexact, sem metadados).
+    Grava <fixture>.json com a origem e o SHA-256.
+    """
+    output = Path(output)
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    cmd = [
+        'ffmpeg', '-y',
+        '-v', 'error',
+        '-ss', str(start),
+        '-t', str(duration),
+        '-i', str(source),
+        '-vn',
+        '-ac', '1',
+        '-ar', '16000',
+        '-c:a', 'pcm_s16le',
+        '-map_metadata', '-1',
+        '-fflags', '+bitexact',
+        '-flags:a', '+bitexact',
+        str(output)
+    ]
+    subprocess.run(cmd, check=True)
+
+    meta = {
+        'source': Path(source).name,
+        'start': start,
+        'duration': duration,
+        'sha256': file_sha256(output)
+    }
+    with open(output.with_suffix('.json'), 'w', encoding='utf-8') as f:
+        json.dump(meta, f, indent=2)
+
+    print(f"✅ Fixture: {output} ({meta['sha256'][:12]})")
+    return output
+
+
+def check_fixture(audio_path):
+    """Confere o SHA-256 registrado pelo make_fixture (se houver)."""
+    meta_path = Path(audio_path).with_suffix('.json')
+    if not meta_path.exists():
+        return
+    with open(meta_path, 'r', encoding='utf-8') as f:
+        meta = json.load(f)
+    if file_sha256(audio_path) == meta.get('sha256'):
+        print(f"🔒 Fixture conferido ({meta['source']} @ {meta['start']}s, {meta['duration']}s)")
+    else:
+        print(f"⚠️  Fixture diferente do registrado em {meta_path.name}: resultados não comparáveis")
+
+
+def peak_rss_mb():
+    """Pico de RSS deste processo em MB (None se indisponível)."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def normalize_words(segments):
+    """Palavras sem acento/pontuação, em minúsculas."""
+    words = []
+    for segment in segments:
+        for token in segment.get('text', '').split():
+            token = unicodedata.normalize('NFKD', token.lower())
+            token = ''.join(c for c in token if not unicodedata.combining(c))
+            token = re.sub(r'[^\w]', '', token)
+            if token:
+                words.append(token)
+    return words
+
+
+def word_agreement(reference, hypothesis):
+    """% das palavras da referência encontradas em ordem na hipótese."""
+    if not reference:
+        return 100.0 if not hypothesis else 0.0
+
+    matcher = difflib.SequenceMatcher(None, reference, hypothesis, autojunk=False)
+    matched = sum(block.size for block in matcher.get_matching_blocks())
+    return matched / len(reference) * 100
+
+
+def run_single(backend_name, audio_path, model, compute_type, output_file):
+    """Modo filho: transcreve com um backend e grava resultado em JSON."""
+    options = {'model': model, 'language': 'pt'}
+    if backend_name == 'faster_whisper':
+        options['compute_type'] = compute_type
+
+    backend = get_backend(backend_name, **options)
+
+    start = time.perf_counter()
+    backend.load()
+    load_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    segments = backend.transcribe(str(audio_path))
+    transcribe_time = time.perf_counter() - start
+
+    with open(output_file, 'w', encoding='utf-8') as f:
+        json.dump({
+            'backend': backend_name,
+            'params': backend.params(),
+            'load_time': load_time,
+            'transcribe_time': transcribe_time,
+            'peak_rss_mb': peak_rss_mb(),
+            'segments': segments
+        }, f, ensure_ascii=False)
+
+
+def run_isolated(backend_name, args):
+    """Roda um backend em subprocesso e devolve o JSON gerado."""
+    with tempfile.TemporaryDirectory() as tmp:
+        output_file = Path(tmp) / 'result.json'
+        cmd = [
+            sys.executable, __file__, args.audio,
+            '--single', backend_name,
+            '--model', args.model,
+            '--compute-type', args.compute_type,
+            '--output', str(output_file)
+        ]
+
+        result = subprocess.run(cmd, capture_output=True, text=True)
+
+        if result.returncode != 0 or not output_file.exists():
+            print(f"   ❌ {backend_name} falhou: {result.stderr.strip()[-300:]}")
+            return None
+
+        with open(output_file, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark dos backends de transcrição')
+    parser.add_argument('audio', type=str, nargs='?', default=str(FIXTURE_PATH),
+                        help='WAV de referência (16 kHz mono, padrão fixtures/amostra.wav)')
+    parser.add_argument('--make-fixture', type=str, default=None, metavar='SOURCE',
+                        help='Gerar o fixture a partir de um vídeo/áudio local e sair')
+    parser.add_argument('--fixture-start', type=float, default=0.0, help='Início do trecho do fixture (s)')
+    parser.add_argument('--fixture-duration', type=float, default=FIXTURE_SECONDS,
+                        help='Duração do fixture (s)')
+    parser.add_argument('--backends', nargs='+', choices=list(BACKENDS), default=None,
+                        help='Backends a testar (padrão: todos instalados)')
+    parser.add_argument('--reference', type=str, default='whisper', help='Backend de referência')
+    parser.add_argument('--model', type=str, default='base', help='Tamanho do modelo')
+    parser.add_argument('--compute-type', type=str, default='int8', help='Precisão do faster_whisper')
+    parser.add_argument('--min-agreement', type=float, default=95.0,
+                        help='Concordância mínima (%%) para recomendar um backend')
+    parser.add_argument('--save', type=str, default=None, help='Salvar resultados em JSON')
+    parser.add_argument('--single', type=str, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--output', type=str, default=None, help=argparse.SUPPRESS)
+
+    args = parser.parse_args()
+
+    if args.single:
+        run_single(args.single, args.audio, args.model, args.compute_type, args.output)
+        return
+
+    if args.make_fixture:
+        make_fixture(args.make_fixture, args.audio, args.fixture_start, args.fixture_duration)
+        return
+
+    audio_path = Path(args.audio)
+    if not audio_path.exists():
+        print(f"❌ Áudio não encontrado: {audio_path}")
+        print(f"   Gere o fixture: python benchmark_asr.py --make-fixture input/live.mp4 --fixture-start 600")
+        sys.exit(1)
+
+    check_fixture(audio_path)
+    duration = WavReader(audio_path).duration
+
+    backends = args.backends or available_backends()
+    if args.reference not in backends:
+        backends = [args.reference] + backends
+
+    print("=" * 70)
+    print("🎤 BENCHMARK ASR")
+    print("=" * 70)
+    print(f"🎵 Áudio: {audio_path.name} ({duration:.1f}s)")
+    print(f"📦 Modelo: {args.model}")
+    print(f"🔧 Backends: {', '.join(backends)} (referência: {args.reference})")
+
+    results = {}
+    for name in backends:
+        print(f"\n⏳ {name}...")
+        result = run_isolated(name, args)
+        if result:
+            results[name] = result
+            print(f"   ✅ {result['transcribe_time']:.1f}s")
+
+    if args.reference not in results:
+        print(f"\n❌ Referência '{args.reference}' não rodou: sem concordância")
+        sys.exit(1)
+
+    reference_words = normalize_words(results[args.reference]['segments'])
+
+    rows = []
+    for name, result in results.items():
+        words = normalize_words(result['segments'])
+        rows.append({
+            'backend': name,
+            'params': result['params'],
+            'rtf': result['transcribe_time'] / duration if duration else None,
+            'load_time': result['load_time'],
+            'peak_rss_mb': result['peak_rss_mb'],
+            'words': len(words),
+            'agreement': word_agreement(reference_words, words)
+        })
+
+    print("\n" + "=" * 70)
+    print(f"{'backend':<16}{'RTF':>8}{'load':>8}{'RSS MB':>10}{'palavras':>10}{'concord.':>10}")
+    print("-" * 70)
+    for row in rows:
+        rss = f"{row['peak_rss_mb']:.0f}" if row['peak_rss_mb'] is not None else 'n/a'
+        rtf = f"{row['rtf']:.3f}" if row['rtf'] is not None else 'n/a'
+        print(f"{row['backend']:<16}{rtf:>8}{row['load_time']:>7.1f}s{rss:>10}"
+              f"{row['words']:>10}{row['agreement']:>9.1f}%")
+    print("=" * 70)
+
+    # Sem duração (áudio vazio) não há RTF: fora da escolha do mais rápido
+    eligible = [r for r in rows if r['agreement'] >= args.min_agreement and r['rtf'] is not None]
+    if eligible:
+        best = min(eligible, key=lambda r: r['rtf'])
+        print(f"\n🏆 Mais rápido com concordância ≥ {args.min_agreement:.0f}%: {best['backend']}")
+        print(f"   Perfil: \"asr\": {json.dumps({'backend': best['backend'], **{k: v for k, v in best['params'].items() if k != 'backend'}})}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump({'audio': str(audio_path), 'duration': duration, 'results': rows}, f, indent=2)
+        print(f"\n💾 {args.save}")
+
+
+if __name__ == '__main__':
+    main()
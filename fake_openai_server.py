@@ -0,0 +1,155 @@
+# fake_openai_server.py
+"""
+Servidor local compatível com a API de chat da OpenAI (para testes offline).
+
+Responde POST /v1/chat/completions com momentos em JSON tirados da própria
+transcrição do prompt (linhas "[123.4s] texto"): primeiro linhas com
+risada/gritos, depois espalhados ao longo do trecho. Determinístico.
+
+Uso:
+    python fake_openai_server.py --port 8765 --delay 2
+
+    # em outro terminal
+    set OPENAI_BASE_URL=http://127.0.0.1:8765/v1      (Linux: export ...)
+    set OPENAI_API_KEY=fake
+    python run_pipeline.py input/live.mp4 10
+"""
+
+import argparse
+import json
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+TIMESTAMP_RE = re.compile(r'^\[(\d+(?:\.\d+)?)s\]\s*(.*)$')
+COUNT_RE = re.compile(r'EXATAMENTE (\d+) momentos')
+HOT_WORDS = ['[riso]', 'kkkk', 'hahaha', 'caralho', 'porra', 'mano', 'wtf', 'consegui']
+
+
+def pick_moments(prompt, default_count=10):
+    """Escolhe momentos da transcrição contida no prompt."""
+    match = COUNT_RE.search(prompt)
+    count = int(match.group(1)) if match else default_count
+
+    lines = []
+    for line in prompt.splitlines():
+        parsed = TIMESTAMP_RE.match(line.strip())
+        if parsed:
+            lines.append((float(parsed.group(1)), parsed.group(2)))
+
+    if not lines:
+        return []
+
+    hot = [(t, text) for t, text in lines if any(w in text.lower() for w in HOT_WORDS)]
+    chosen = hot[:count]
+
+    # Completa com linhas espalhadas uniformemente
+    remaining = count - len(chosen)
+    if remaining > 0:
+        step = max(1, len(lines) // remaining)
+        used = {t for t, _ in chosen}
+        for t, text in lines[::step]:
+            if len(chosen) >= count:
+                break
+            if t not in used:
+                chosen.append((t, text))
+
+    return [
+        {'climax': t, 'reason': f"fala '{text[:60].strip()}'"}
+        for t, text in sorted(chosen)
+    ]
+
+
+class FakeOpenAIHandler(BaseHTTPRequestHandler):
+    """Handler de /v1/chat/completions e /v1/models."""
+
+    delay = 0.0
+    counter = 0
+    lock = threading.Lock()
+
+    def do_GET(self):
+        if self.path.rstrip('/').endswith('/models'):
+            self._send(200, {'object': 'list', 'data': [{'id': 'gpt-4o-mini', 'object': 'model'}]})
+        else:
+            self._send(404, {'error': {'message': 'not found'}})
+
+    def do_POST(self):
+        if not self.path.rstrip('/').endswith('/chat/completions'):
+            self._send(404, {'error': {'message': 'not found'}})
+            return
+
+        length = int(self.headers.get('Content-Length', 0))
+        body = json.loads(self.rfile.read(length) or b'{}')
+
+        prompt = "\n".join(
+            m.get('content', '') if isinstance(m.get('content'), str) else json.dumps(m.get('content'))
+            for m in body.get('messages', [])
+        )
+
+        if self.delay:
+            time.sleep(self.delay)
+
+        moments = pick_moments(prompt)
+        content = json.dumps(moments, ensure_ascii=False)
+
+        with self.lock:
+            FakeOpenAIHandler.counter += 1
+            request_id = FakeOpenAIHandler.counter
+
+        self._send(200, {
+            'id': f'chatcmpl-fake-{request_id}',
+            'object': 'chat.completion',
+            'created': int(time.time()),
+            'model': body.get('model', 'gpt-4o-mini'),
+            'choices': [{
+                'index': 0,
+                'message': {'role': 'assistant', 'content': content},
+                'finish_reason': 'stop'
+            }],
+            'usage': {
+                'prompt_tokens': len(prompt) // 4,
+                'completion_tokens': len(content) // 4,
+                'total_tokens': (len(prompt) + len(content)) // 4
+            }
+        })
+
+        print(f"   📨 #{request_id}: {len(moments)} momentos ({len(prompt)} chars de prompt)")
+
+    def _send(self, status, payload):
+        data = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Servidor OpenAI falso para testes offline')
+    parser.add_argument('--host', type=str, default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--delay', type=float, default=0.0, help='Latência simulada por requisição (s)')
+
+    args = parser.parse_args()
+
+    FakeOpenAIHandler.delay = args.delay
+    server = ThreadingHTTPServer((args.host, args.port), FakeOpenAIHandler)
+
+    print(f"🧪 Fake OpenAI em http://{args.host}:{args.port}/v1 (latência {args.delay}s)")
+    print("   Ctrl+C para parar")
+
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main()
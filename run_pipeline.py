@@ -10,15 +10,36 @@ from datetime import datetime
 import subprocess
 import json
 
-from Components.Transcription import transcribe_audio
+from Components.Transcription import transcribe_audio, transcription_params
+from Components.ASRBackends import backend_from_profile
 from Components.AudioAnalyzer import AudioAnalyzer
 from Components.ContextAnalyzer import ContextAnalyzer
 from Components.ClipSelector import ClipSelector
+from Components.Clipper import select_best_segments
 from Components.TranscriptionValidator import TranscriptionValidator
 from Components.ProfileManager import ProfileManagerV3
 from Components.VideoOptimizer import VideoOptimizer
 from Components.SubtitleGenerator import SubtitleGenerator
+from Components.LanguageTasks import highlights_params
+from Components.KeywordIndex import KeywordIndex
+from Components.TranscriptIndex import TranscriptIndex
+from Components.FaceCrop import crop_to_vertical_with_audio
+from Components.StageCache import StageCache, STAGES
+from Components.LLMCache import configure_llm_cache
+from Components.VoiceActivity import SpeechMap
+from Components.AudioFeatureStore import AudioFeatureStore
+from Components.VisualFeatureIndex import VisualFeatureIndex
+from Components.KeyframeIndex import KeyframeIndex, smart_cut
+from Components.BatchExtractor import extract_segments
+from Components.ClipWorkers import (
+    StageTimer, encode_slot, resolve_workers, run_clips, write_timing_summary
+)
 from Render.SmartCropper import SmartCropper
+from Render.RenderGraph import RenderGraph, RenderPlan
+
+
+# Parâmetros da extração de áudio (chave do StageCache)
+AUDIO_PARAMS = {'codec': 'pcm_s16le', 'sample_rate': 16000, 'channels': 1}
 
 
 def extract_audio(video_path, audio_path):
@@ -62,21 +83,275 @@ def get_video_duration(video_path):
         return 0
 
 
-def extract_segment(video_path, start_time, duration, output_path):
-    """Extrai segmento do vídeo."""
-    cmd = [
-        'ffmpeg',
-        '-i', str(video_path),
-        '-ss', str(start_time),
-        '-t', str(duration),
-        '-c', 'copy',
-        '-y',
-        str(output_path)
-    ]
+def extract_segment(video_path, start_time, duration, output_path, keyframe_index=None):
+    """
+    Extrai segmento do vídeo com bordas exatas.
+
+    Seek no input (não decodifica a live desde o início); com o índice de
+    keyframes, só os GOPs das bordas são re-encodados e o meio é copiado.
+    """
+    if keyframe_index is None:
+        keyframe_index = KeyframeIndex([])
     
-    subprocess.run(cmd, capture_output=True)
+    return smart_cut(video_path, float(start_time), float(duration), output_path, keyframe_index)
+
+
+def open_feature_store(options):
+    """AudioFeatureStore da live (None se o pipeline não calculou)."""
+    if options.get('features_dir'):
+        return AudioFeatureStore.open(options['features_dir'])
+    return None
+
+
+def open_visual_index(options):
+    """VisualFeatureIndex da live (None se o pipeline não calculou)."""
+    if options.get('visual_dir'):
+        return VisualFeatureIndex.open(options['visual_dir'])
+    return None
+
+
+def process_clip(i, total, clip, video_path, output_dir, profile, options, timer):
+    """
+    Processa um clip (extração, otimização, render, legendas).
+    
+    Função de nível de módulo para poder rodar no pool de processos.
+    
+    Args:
+        i: Índice do clip (1-based)
+        total: Total de clips
+        clip: Dicionário do clip selecionado
+        video_path: Vídeo de entrada
+        output_dir: Diretório de saída
+        profile: Perfil carregado
+        options: {'no_optimize', 'no_subtitles', 'no_movement',
+                  'burn_subtitles', 'audio_path', 'speech_regions',
+                  'features_dir', 'keyframes', 'pre_extracted',
+                  'camera_engine', 'visual_dir'}
+        timer: StageTimer para medir cada etapa
+    
+    Returns:
+        Caminho do short gerado
+    """
+    video_path = Path(video_path)
+    output_dir = Path(output_dir)
+    
+    feature_store = open_feature_store(options)
+    
+    optimizer = VideoOptimizer(
+        speed_factor=profile['video']['speed_factor'],
+        feature_store=feature_store
+    ) if not options['no_optimize'] else None
+    
+    cropper = SmartCropper() if not options['no_movement'] else None
+    
+    # Diretor de câmera (FaceCrop): roda no segmento ainda alinhado à live,
+    # antes da otimização, para consultar os índices pelo início do clip
+    director = (
+        cropper is not None
+        and profile['video']['camera_movement_enabled']
+        and options.get('camera_engine') == 'director'
+    )
+    
+    subtitle_gen = SubtitleGenerator() if not options['no_subtitles'] else None
+    
+    print("\n" + "=" * 70)
+    print(f"PROCESSANDO CLIP {i}/{total}")
+    print("=" * 70)
+    
+    print(f"\n[4/7] Extraindo segmento...")
+    segment_path = output_dir / f'segment_{i:03d}.mp4'
+    if options.get('pre_extracted') and segment_path.exists():
+        print(f"   ✅ Já extraído no lote")
+    else:
+        keyframe_index = KeyframeIndex.from_dict(options['keyframes']) if options.get('keyframes') else None
+        # Smart cut re-encoda as bordas: conta no limite de encodes
+        with timer.stage('extract'), encode_slot():
+            extract_segment(
+                video_path,
+                clip['start_time'],
+                clip['duration'],
+                segment_path,
+                keyframe_index=keyframe_index
+            )
+    
+    current_video = segment_path
+    short_path = output_dir / f'short_{i:03d}.mp4'
+    
+    if director:
+        print(f"\n[5-6/7] Renderizando (diretor de câmera)...")
+        directed_path = output_dir / f'directed_{i:03d}.mp4'
+        with timer.stage('render'), encode_slot():
+            crop_to_vertical_with_audio(
+                str(segment_path),
+                str(directed_path),
+                reason=clip.get('reason', ''),
+                transcript_text=' '.join(TranscriptIndex.ensure(clip.get('transcription', [])).texts),
+                viral_score=clip.get('viral_score', 0),
+                feature_store=feature_store,
+                source_offset=clip['start_time'],
+                visual_index=open_visual_index(options)
+            )
+        current_video = directed_path
+    
+    if optimizer:
+        print(f"\n[5/7] Otimizando...")
+        optimized_path = output_dir / f'optimized_{i:03d}.mp4'
+        with timer.stage('optimize'), encode_slot():
+            # O short do diretor tem a mesma linha do tempo do segmento
+            optimizer.optimize_video(
+                str(current_video),
+                str(optimized_path),
+                source_offset=clip['start_time']
+            )
+        if current_video != segment_path:
+            current_video.unlink(missing_ok=True)
+        current_video = optimized_path
+    
+    if director:
+        # Já renderizado antes da otimização
+        current_video.replace(short_path)
+        current_video = short_path
+    else:
+        print(f"\n[6/7] Renderizando...")
+        
+        with timer.stage('render'), encode_slot():
+            if cropper and profile['video']['camera_movement_enabled']:
+                meme_config_path = 'meme_templates/meme_config.json'
+                render = cropper.render_short_ffmpeg if options.get('camera_engine') == 'ffmpeg' else cropper.render_short
+                render(
+                    str(current_video),
+                    str(short_path),
+                    meme_timestamps=cropper.detect_meme_positions_from_text(
+                        clip.get('transcription', []),
+                        meme_config_path
+                    )
+                )
+            else:
+                from Render.VerticalCropper import render_vertical_crop
+                render_vertical_crop(str(current_video), str(short_path))
+    
+    if subtitle_gen and profile['subtitles']['enabled']:
+        print(f"\n[7/7] Gerando legendas...")
+        
+        with timer.stage('subtitles'):
+            if profile['subtitles']['generate_srt']:
+                srt_path = short_path.with_suffix('.srt')
+                subtitle_gen.generate_srt(
+                    clip.get('transcription', []),
+                    str(srt_path)
+                )
+            
+            if profile['subtitles']['generate_ass']:
+                ass_path = short_path.with_suffix('.ass')
+                subtitle_gen.generate_ass(
+                    str(srt_path),
+                    str(ass_path),
+                    style=profile['subtitles']['style']
+                )
+    
+    if segment_path.exists() and segment_path != current_video:
+        segment_path.unlink()
+    if current_video != short_path and current_video.exists():
+        current_video.unlink()
+    
+    print(f"   ✅ Short {i} completo!")
+    
+    return str(short_path)
+
+
+def process_clip_graph(i, total, clip, video_path, output_dir, profile, options, timer):
+    """
+    Processa um clip com o RenderGraph: um único ffmpeg lê a fonte e
+    faz cortes, velocidade, loudnorm, crop/scale e legendas em um encode.
+    
+    Mesmos argumentos de process_clip.
+    
+    Returns:
+        Caminho do short gerado
+    """
+    output_dir = Path(output_dir)
+    short_path = output_dir / f'short_{i:03d}.mp4'
+    
+    print("\n" + "=" * 70)
+    print(f"PROCESSANDO CLIP {i}/{total}")
+    print("=" * 70)
+    
+    print(f"\n[4-5/7] Planejando cortes...")
+    with timer.stage('plan'):
+        keep_segments = None
+        speed_factor = 1.0
+        
+        if not options['no_optimize']:
+            optimizer = VideoOptimizer(
+                speed_factor=profile['video']['speed_factor'],
+                feature_store=open_feature_store(options)
+            )
+            speed_factor = optimizer.speed_factor
+            # Mapa de fala ou features já calculados: sem silencedetect por clip
+            if options.get('speech_regions'):
+                silences = SpeechMap(options['speech_regions']).silences(
+                    clip['start_time'],
+                    clip['start_time'] + clip['duration'],
+                    min_duration=optimizer.min_silence_duration
+                )
+            else:
+                silences = optimizer.silences_from_store(clip['start_time'], clip['duration'])
+            keep_segments = optimizer.detect_keep_segments(
+                options.get('audio_path') or str(video_path),
+                start=clip['start_time'],
+                duration=clip['duration'],
+                silences=silences
+            )
+        
+        plan = RenderPlan(clip['start_time'], clip['duration'], keep_segments, speed_factor)
+        transcription = plan.remap_transcription(clip.get('transcription', []))
+    
+    crop_intervals = None
+    if not options['no_movement'] and profile['video']['camera_movement_enabled']:
+        cropper = SmartCropper()
+        meme_timestamps = []
+        for meme in cropper.detect_meme_positions_from_text(
+            clip.get('transcription', []),
+            'meme_templates/meme_config.json'
+        ):
+            t = plan.remap_time(meme['time'] - plan.start_time)
+            if t is not None:
+                meme_timestamps.append({**meme, 'time': t})
+        crop_intervals = cropper.movement_intervals(meme_timestamps)
+    
+    subtitles_file = None
+    if not options['no_subtitles'] and profile['subtitles']['enabled']:
+        print(f"\n[7/7] Gerando legendas...")
+        subtitle_gen = SubtitleGenerator()
+        
+        with timer.stage('subtitles'):
+            srt_path = short_path.with_suffix('.srt')
+            subtitle_gen.generate_srt(transcription, str(srt_path))
+            subtitles_file = srt_path
+            
+            if profile['subtitles']['generate_ass']:
+                subtitles_file = Path(subtitle_gen.generate_ass(
+                    str(srt_path),
+                    str(short_path.with_suffix('.ass')),
+                    style=profile['subtitles']['style']
+                ))
+    
+    print(f"\n[6/7] Renderizando...")
+    with timer.stage('render'), encode_slot():
+        RenderGraph().render(
+            str(video_path),
+            str(short_path),
+            plan,
+            crop_intervals=crop_intervals,
+            subtitles_file=str(subtitles_file) if subtitles_file and options.get('burn_subtitles') else None
+        )
+    
+    if subtitles_file and not profile['subtitles']['generate_srt']:
+        short_path.with_suffix('.srt').unlink(missing_ok=True)
     
-    return output_path
+    print(f"   ✅ Short {i} completo!")
+    
+    return str(short_path)
 
 
 def main():
@@ -87,6 +362,31 @@ def main():
     parser.add_argument('--no-optimize', action='store_true', help='Desabilitar otimização')
     parser.add_argument('--no-subtitles', action='store_true', help='Desabilitar legendas')
     parser.add_argument('--no-movement', action='store_true', help='Desabilitar movimento de câmera')
+    parser.add_argument('--selection', choices=['greedy', 'optimal'], default='greedy',
+                        help='greedy = maior score primeiro (padrão); optimal = clips sem sobreposição com maior score total')
+    parser.add_argument('--workers', type=int, default=1, help='Clips processados em paralelo (0 = automático)')
+    parser.add_argument('--max-encodes', type=int, default=None, help='Máximo de encodes ffmpeg simultâneos')
+    parser.add_argument('--max-memory-mb', type=int, default=None, help='Orçamento de memória para os workers')
+    parser.add_argument('--asr-workers', type=int, default=1,
+                        help='Réplicas do Whisper em paralelo (1 = sequencial, 0 = automático)')
+    parser.add_argument('--vad', action='store_true',
+                        help='Transcrever só as regiões com fala (mapa salvo em vad_map.json)')
+    parser.add_argument('--render-engine', choices=['legacy', 'graph'], default='legacy',
+                        help='graph = um único ffmpeg/encode por short')
+    parser.add_argument('--batch-extract', action='store_true',
+                        help='Extrair todos os segmentos com uma leitura da live (render-engine legacy)')
+    parser.add_argument('--camera-engine', choices=['opencv', 'ffmpeg', 'director'], default='opencv',
+                        help='Movimento de câmera: frames em Python (opencv), crop com expressão no ffmpeg '
+                             'ou diretor de câmera do FaceCrop (director, usa os índices da live)')
+    parser.add_argument('--burn-subtitles', action='store_true', help='Queimar legendas no vídeo (render-engine graph)')
+    parser.add_argument('--no-cache', action='store_true', help='Não ler nem gravar o cache de etapas')
+    parser.add_argument('--invalidate', action='append', default=[], choices=STAGES + ['all'],
+                        help='Recalcular etapa mesmo com cache (pode repetir)')
+    parser.add_argument('--cache-dir', type=str, default='cache', help='Diretório do cache de etapas')
+    parser.add_argument('--cache-max-mb', type=int, default=10240, help='Tamanho máximo do cache (MB)')
+    parser.add_argument('--no-llm-cache', action='store_true', help='Sempre chamar a API do LLM')
+    parser.add_argument('--llm-cache-ttl-days', type=float, default=30, help='Validade das respostas do LLM (dias)')
+    parser.add_argument('--llm-cache-max-mb', type=int, default=200, help='Tamanho máximo do cache do LLM (MB)')
     
     args = parser.parse_args()
     
@@ -116,6 +416,23 @@ def main():
     
     video_duration_min = get_video_duration(video_path)
     
+    pipeline_timer = StageTimer()
+    
+    cache = StageCache(
+        args.cache_dir,
+        max_size_mb=args.cache_max_mb,
+        enabled=not args.no_cache,
+        invalidate=args.invalidate
+    )
+    source_hash = cache.source_hash(video_path)
+    
+    llm_cache = configure_llm_cache(
+        Path(args.cache_dir) / 'llm_cache.sqlite',
+        ttl_days=args.llm_cache_ttl_days,
+        max_size_mb=args.llm_cache_max_mb,
+        enabled=not (args.no_cache or args.no_llm_cache)
+    )
+    
     # =========================================================================
     # PASSO 1: TRANSCRIÇÃO
     # =========================================================================
@@ -124,9 +441,51 @@ def main():
     print("=" * 70)
     
     audio_path = output_dir / 'audio.wav'
-    extract_audio(video_path, audio_path)
+    with pipeline_timer.stage('audio'):
+        if not cache.get_file('audio', source_hash, AUDIO_PARAMS, audio_path):
+            extract_audio(video_path, audio_path)
+            cache.put_file('audio', source_hash, AUDIO_PARAMS, audio_path)
+    
+    # Uma passada de features (RMS, flux, bandas, silêncio) para todas as etapas
+    features_dir = output_dir / 'features'
+    feature_params = {**AudioFeatureStore.params(), 'audio': AUDIO_PARAMS}
+    with pipeline_timer.stage('features'):
+        feature_files = [features_dir / AudioFeatureStore.DATA_FILE, features_dir / AudioFeatureStore.META_FILE]
+        features_dir.mkdir(exist_ok=True)
+        if all(cache.get_file('features', source_hash, feature_params, f) for f in feature_files):
+            feature_store = AudioFeatureStore.open(features_dir)
+        else:
+            feature_store = AudioFeatureStore.build(str(audio_path), features_dir)
+            for f in feature_files:
+                cache.put_file('features', source_hash, feature_params, f)
+    
+    speech_map = None
+    if args.vad:
+        with pipeline_timer.stage('vad'):
+            speech_map = SpeechMap.from_dict(cache.cached_json(
+                'vad', source_hash, SpeechMap.params(),
+                lambda: SpeechMap.build(str(audio_path)).to_dict()
+            ))
+            speech_map.save(output_dir / 'vad_map.json')
+    
+    asr_backend = backend_from_profile(profile)
+    asr_params = transcription_params(
+        parallel=args.asr_workers != 1,
+        vad=args.vad,
+        backend=asr_backend
+    )
     
-    transcription = transcribe_audio(str(audio_path))
+    with pipeline_timer.stage('transcription'):
+        transcription = cache.cached_json(
+            'transcription', source_hash, asr_params,
+            lambda: transcribe_audio(
+                str(audio_path),
+                workers=args.asr_workers,
+                max_memory_mb=args.max_memory_mb,
+                speech_map=speech_map,
+                backend=asr_backend
+            )
+        )
     
     validator = TranscriptionValidator()
     validation_result = validator.validate(transcription)
@@ -143,11 +502,22 @@ def main():
     print("PASSO 2/7: ANÁLISE")
     print("=" * 70)
     
-    audio_analyzer = AudioAnalyzer(str(audio_path))
-    audio_features = audio_analyzer.analyze()
+    with pipeline_timer.stage('audio_analysis'):
+        audio_features = cache.cached_json(
+            'audio_analysis', source_hash, AudioAnalyzer.params(),
+            lambda: AudioAnalyzer(str(audio_path), feature_store=feature_store).analyze()
+        )
     
-    context_analyzer = ContextAnalyzer(transcription, video_duration_min)
-    context_analysis = context_analyzer.analyze()
+    with pipeline_timer.stage('highlights'):
+        context_params = {
+            **highlights_params(),
+            'transcription': asr_params,
+            'video_duration_min': round(video_duration_min, 2)
+        }
+        context_analysis = cache.cached_json(
+            'highlights', source_hash, context_params,
+            lambda: ContextAnalyzer(transcription, video_duration_min).analyze()
+        )
     
     # Criar lista de meme_events
     meme_events = []
@@ -173,16 +543,31 @@ def main():
     print("PASSO 3/7: SELEÇÃO DE CLIPS")
     print("=" * 70)
     
-    selector = ClipSelector(profile)
-    selected_clips = selector.select_clips(
-        audio_features,
-        context_analysis,
-        meme_events,
-        num_clips=args.num_shorts
-    )
+    with pipeline_timer.stage('selection'):
+        selector = ClipSelector(profile, selection=args.selection)
+        selected_clips = selector.select_clips(
+            audio_features,
+            context_analysis,
+            meme_events,
+            num_clips=args.num_shorts,
+            keyword_index=KeywordIndex.ensure(transcription),
+            fallback_segments=lambda: select_best_segments(
+                TranscriptIndex.from_transcription(transcription, level='segments'),
+                str(audio_path),
+                feature_store=feature_store
+            )
+        )
     
     print(f"   ✅ {len(selected_clips)} clips selecionados")
     
+    if speech_map is not None:
+        # Bordas dos clips fora do meio de uma fala
+        for clip in selected_clips:
+            start = speech_map.snap_to_silence(clip['start_time'])
+            end = speech_map.snap_to_silence(clip['start_time'] + clip['duration'])
+            if end - start > 1.0:
+                clip['start_time'], clip['duration'] = start, end - start
+    
     if not selected_clips:
         print("\n❌ Nenhum clip selecionado!")
         sys.exit(1)
@@ -191,77 +576,87 @@ def main():
     # PASSOS 4-7: PROCESSAMENTO DE CADA CLIP
     # =========================================================================
     
-    optimizer = VideoOptimizer(
-        speed_factor=profile['video']['speed_factor']
-    ) if not args.no_optimize else None
+    keyframes = None
+    if args.render_engine == 'legacy':
+        # Índice de keyframes da live (uma vez): corte rápido e exato por
+        # clip, e fallback dos clips cujo lote falhar no --batch-extract
+        with pipeline_timer.stage('keyframes'):
+            keyframes = cache.cached_json(
+                'keyframes', source_hash, KeyframeIndex.params(),
+                lambda: KeyframeIndex.build(str(video_path)).to_dict(),
+                should_store=lambda data: bool(data['times'])
+            )
+
+    visual_dir = None
+    if (args.render_engine == 'legacy' and args.camera_engine == 'director'
+            and not args.no_movement and profile['video']['camera_movement_enabled']):
+        # Features visuais da live (uma passada): o diretor de cada clip
+        # consulta o trecho [início, fim] sem decodificar o segmento
+        visual_dir = output_dir / 'visual'
+        with pipeline_timer.stage('visual'):
+            visual_files = [visual_dir / VisualFeatureIndex.DATA_FILE, visual_dir / VisualFeatureIndex.META_FILE]
+            visual_dir.mkdir(exist_ok=True)
+            visual_params = VisualFeatureIndex.params()
+            if not all(cache.get_file('visual', source_hash, visual_params, f) for f in visual_files):
+                VisualFeatureIndex.build(str(video_path), visual_dir)
+                for f in visual_files:
+                    cache.put_file('visual', source_hash, visual_params, f)
+
+    if args.render_engine == 'legacy' and args.batch_extract:
+        # Uma leitura sequencial da live por grupo de segmentos próximos
+        with pipeline_timer.stage('batch_extract'):
+            extract_segments(
+                str(video_path),
+                [(clip['start_time'], clip['duration']) for clip in selected_clips],
+                [output_dir / f'segment_{i:03d}.mp4' for i in range(1, len(selected_clips) + 1)]
+            )
     
-    cropper = SmartCropper() if not args.no_movement else None
+    options = {
+        'no_optimize': args.no_optimize,
+        'no_subtitles': args.no_subtitles,
+        'no_movement': args.no_movement,
+        'burn_subtitles': args.burn_subtitles,
+        'audio_path': str(audio_path),
+        'speech_regions': speech_map.regions if speech_map is not None else None,
+        'features_dir': str(features_dir),
+        'keyframes': keyframes,
+        'pre_extracted': args.batch_extract,
+        'camera_engine': args.camera_engine,
+        'visual_dir': str(visual_dir) if visual_dir is not None else None
+    }
+    
+    clip_fn = process_clip_graph if args.render_engine == 'graph' else process_clip
+    
+    jobs = [
+        (i, (i, len(selected_clips), clip, str(video_path), str(output_dir), profile, options))
+        for i, clip in enumerate(selected_clips, 1)
+    ]
     
-    subtitle_gen = SubtitleGenerator() if not args.no_subtitles else None
+    workers = resolve_workers(args.workers, max_memory_mb=args.max_memory_mb) if args.workers != 1 else 1
+    workers = min(workers, len(jobs))
     
-    for i, clip in enumerate(selected_clips, 1):
-        print("\n" + "=" * 70)
-        print(f"PROCESSANDO CLIP {i}/{len(selected_clips)}")
-        print("=" * 70)
-        
-        print(f"\n[4/7] Extraindo segmento...")
-        segment_path = output_dir / f'segment_{i:03d}.mp4'
-        extract_segment(
-            video_path,
-            clip['start_time'],
-            clip['duration'],
-            segment_path
+    with pipeline_timer.stage('clips'):
+        reports = run_clips(
+            clip_fn,
+            jobs,
+            workers=workers,
+            max_encodes=args.max_encodes
         )
-        
-        if optimizer:
-            print(f"\n[5/7] Otimizando...")
-            optimized_path = output_dir / f'optimized_{i:03d}.mp4'
-            optimizer.optimize_video(str(segment_path), str(optimized_path))
-            current_video = optimized_path
-        else:
-            current_video = segment_path
-        
-        print(f"\n[6/7] Renderizando...")
-        short_path = output_dir / f'short_{i:03d}.mp4'
-        
-        if cropper and profile['video']['camera_movement_enabled']:
-            meme_config_path = 'meme_templates/meme_config.json'
-            cropper.render_short(
-                str(current_video),
-                str(short_path),
-                meme_timestamps=cropper.detect_meme_positions_from_text(
-                    clip.get('transcription', []),
-                    meme_config_path
-                )
-            )
-        else:
-            from Render.VerticalCropper import render_vertical_crop
-            render_vertical_crop(str(current_video), str(short_path))
-        
-        if subtitle_gen and profile['subtitles']['enabled']:
-            print(f"\n[7/7] Gerando legendas...")
-            
-            if profile['subtitles']['generate_srt']:
-                srt_path = short_path.with_suffix('.srt')
-                subtitle_gen.generate_srt(
-                    clip.get('transcription', []),
-                    str(srt_path)
-                )
-            
-            if profile['subtitles']['generate_ass']:
-                ass_path = short_path.with_suffix('.ass')
-                subtitle_gen.generate_ass(
-                    str(srt_path),
-                    str(ass_path),
-                    style=profile['subtitles']['style']
-                )
-        
-        if segment_path.exists() and segment_path != current_video:
-            segment_path.unlink()
-        if current_video != short_path and current_video.exists():
-            current_video.unlink()
-        
-        print(f"   ✅ Short {i} completo!")
+    
+    write_timing_summary(
+        reports,
+        output_dir / 'timings.json',
+        pipeline_stages=pipeline_timer.stages,
+        extra={
+            'workers': workers,
+            'render_engine': args.render_engine,
+            'stage_cache': cache.stats(),
+            'llm_cache': llm_cache.stats()
+        }
+    )
+    
+    llm_stats = llm_cache.stats()
+    print(f"🧠 Cache do LLM: {llm_stats['hits']} hits, {llm_stats['misses']} misses")
     
     # =========================================================================
     # FINALIZAÇÃO
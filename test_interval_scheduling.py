@@ -0,0 +1,58 @@
+from itertools import combinations
+
+import numpy as np
+
+from Components.IntervalScheduling import select_intervals
+
+
+def brute_force(items, min_gap, max_count):
+    """Maior soma de pesos entre todos os subconjuntos compatíveis."""
+    best = 0.0
+    for k in range(1, min(max_count, len(items)) + 1):
+        for subset in combinations(sorted(items), k):
+            if all(b[0] - a[1] >= min_gap for a, b in zip(subset, subset[1:])):
+                best = max(best, sum(item[2] for item in subset))
+    return best
+
+
+def chosen_total(items, min_gap, max_count):
+    chosen = select_intervals(
+        items,
+        start=lambda c: c[0],
+        end=lambda c: c[1],
+        weight=lambda c: c[2],
+        min_gap=min_gap,
+        max_count=max_count
+    )
+    ordered = sorted(chosen)
+    assert len(chosen) <= max_count
+    assert all(b[0] - a[1] >= min_gap for a, b in zip(ordered, ordered[1:]))
+    return sum(item[2] for item in chosen)
+
+
+def run_test():
+    # Total não cresce de forma côncava: 1 item (10) > 2 itens (8) < 3 itens (12)
+    items = [(0, 10, 10), (0, 3, 4), (3, 6, 4), (6, 10, 4)]
+    assert chosen_total(items, 0, 3) == 12
+
+    rng = np.random.default_rng(0)
+    for _ in range(500):
+        n = int(rng.integers(1, 9))
+        starts = rng.integers(0, 30, n)
+        items = [
+            (int(s), int(s + rng.integers(1, 10)), int(rng.integers(1, 10)))
+            for s in starts
+        ]
+        min_gap = int(rng.integers(0, 3))
+        max_count = int(rng.integers(1, n + 1))
+        assert chosen_total(items, min_gap, max_count) == brute_force(items, min_gap, max_count), items
+
+    print("✅ SELEÇÃO ÓTIMA = FORÇA BRUTA")
+
+
+def test_select_intervals_matches_brute_force():
+    run_test()
+
+
+if __name__ == "__main__":
+    run_test()
@@ -0,0 +1,73 @@
+import argparse
+import hashlib
+
+import cv2
+
+from Components.MemeCornerDetector import detect_meme_corners
+from Components.ShardedDetector import _open_at, _resolve
+
+
+def frame_hash(frame):
+    return hashlib.sha1(frame.tobytes()).hexdigest()
+
+
+def check_shard_starts(video_path, workers):
+    """Frame do início de cada trecho (seek) = mesmo frame da leitura sequencial."""
+    fps, frame_count, workers, shards = _resolve(video_path, workers, None)
+    firsts = [first for first, _ in shards]
+
+    expected = {}
+    cap = cv2.VideoCapture(video_path)
+    frame_idx = 0
+    while frame_idx <= firsts[-1]:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        if frame_idx in firsts:
+            expected[frame_idx] = frame_hash(frame)
+        frame_idx += 1
+    cap.release()
+
+    for first in firsts:
+        cap = _open_at(video_path, first)
+        ret, frame = cap.read()
+        cap.release()
+        assert ret and frame_hash(frame) == expected[first], f"frame {first} difere"
+
+    print(f"✅ {len(firsts)} inícios de trecho = leitura sequencial")
+
+
+def check_speakers(video_path, workers):
+    """Caixas do orador: serial = paralelo."""
+    from Components import Speaker
+
+    results = []
+    for n in (1, workers):
+        Speaker.Frames = []
+        Speaker.detect_faces_and_speakers(video_path, f"SPEAKER_TEST_{n}.mp4", workers=n)
+        results.append([None if box is None else [int(v) for v in box] for box in Speaker.Frames])
+
+    assert results[0] == results[1], "caixas do orador diferem"
+    print(f"✅ ORADOR: {len(results[0])} frames idênticos")
+
+
+def run_test(video_path="input.mp4", workers=4, speaker=False):
+    check_shard_starts(video_path, workers)
+
+    serial = detect_meme_corners(video_path)
+    sharded = detect_meme_corners(video_path, workers=workers)
+    assert serial == sharded, f"{serial} != {sharded}"
+    print(f"✅ CANTOS: {len(serial)} eventos idênticos")
+
+    if speaker:
+        check_speakers(video_path, workers)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compara detecção serial x por trechos")
+    parser.add_argument("video", nargs="?", default="input.mp4")
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--speaker", action="store_true", help="Também compara o Speaker.py (precisa de models/)")
+    args = parser.parse_args()
+
+    run_test(args.video, args.workers, args.speaker)